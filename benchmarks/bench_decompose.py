@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+
+"""Benchmark the decomposition against the monolithic solve on growing VRP instances.
+
+Random instances of uniformly spread stops, one vehicle per 40 stops, are
+solved once with the monolithic VRP model and once cluster by cluster, both
+under the same search time limit. The report shows the wall time and the
+objective of each run; the monolithic solve is skipped above --max-monolithic
+stops. Usage::
+
+    python benchmarks/bench_decompose.py [--sizes 500 1000 3000] [--time-limit 10] [--workers 4]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from ort_optimization.decompose import solve_decomposed
+from ort_optimization.search import SearchOptions
+from ort_optimization.vrp import VRP
+
+
+def random_instance(size, seed):
+    """Return a random VRP instance with planar locations.
+
+    Args:
+        size: Number of nodes, the depot included.
+        seed: Seed of the random generator.
+
+    Returns:
+        The instance data.
+    """
+    rng = np.random.default_rng(seed)
+    return {
+        'locations': rng.uniform(0, 10000, (size, 2)).round().tolist(),
+        'num_vehicles': max(4, size // 40),
+        'depot': 0,
+        'travel distance': 10 ** 9,
+    }
+
+
+def timed(solve):
+    """Run a solve with the console output discarded.
+
+    Args:
+        solve: Function without arguments returning a result.
+
+    Returns:
+        The result and the wall time in seconds.
+    """
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = solve()
+    return result, time.perf_counter() - start
+
+
+def main():
+    """Run the benchmark and print a report."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[500, 1000, 3000])
+    parser.add_argument('--time-limit', type=float, default=10)
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--improve-time', type=float)
+    parser.add_argument('--max-monolithic', type=int, default=2000)
+    args = parser.parse_args()
+    options = SearchOptions(time_limit=args.time_limit)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for seed, size in enumerate(args.sizes):
+            path = str(Path(tmp_dir) / 'vrp{0}.json'.format(size))
+            with open(path, 'w') as json_file:
+                json.dump(random_instance(size, seed), json_file)
+            print('{0} nodes'.format(size))
+            if size <= args.max_monolithic:
+                monolithic, elapsed = timed(lambda: VRP.solve(path, options))  # noqa: B023
+                print('  monolithic: {0:7.2f}s, objective {1}'.format(elapsed, monolithic.objective))
+            decomposed, elapsed = timed(
+                lambda: solve_decomposed('vrp', path, workers=args.workers, options=options, improve_time=args.improve_time),  # noqa: B023
+            )
+            print('  decomposed: {0:7.2f}s, objective {1}'.format(elapsed, decomposed.objective))
+
+
+if __name__ == '__main__':
+    main()
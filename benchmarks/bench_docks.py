@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+
+"""Benchmark the dock scheduling of TWDCP across fleet sizes and dock capacities.
+
+Generated TWDCP instances of growing size (hence fleet) are solved with the
+dock capacity of the generator and with fewer docks, shared by the loads and
+the unloads or split into a load and an unload pool, once with the joint
+dock constraint and once with the two stage scheduling. Usage::
+
+    python benchmarks/bench_docks.py [--sizes 50 100 200] [--docks 0 4 8] [--time-limit 30]
+
+A dock count of 0 keeps the shared pool of the generator.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from ort_optimization.generator import generate, write_instance
+from ort_optimization.metrics import Metrics
+from ort_optimization.search import SearchOptions
+from ort_optimization.twdcp import DOCK_SCHEDULING, TWDCP
+
+
+def dock_variants(input_data, docks):
+    """Return the instances of a generated instance with a given number of docks.
+
+    Args:
+        input_data: Generated instance data.
+        docks: Number of docks, 0 for the shared pool of the generator.
+
+    Returns:
+        Pairs of the name of the docks and of the instance data.
+    """
+    if not docks:
+        return [('shared {0}'.format(input_data['depot_capacity']), input_data)]
+    return [
+        ('shared {0}'.format(docks), dict(input_data, depot_capacity=docks)),
+        ('load {0} unload {0}'.format(docks), dict(input_data, load_docks=docks, unload_docks=docks)),
+    ]
+
+
+def main():
+    """Run the benchmark and print a report."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[50, 100, 200])
+    parser.add_argument('--docks', type=int, nargs='+', default=[0, 4, 8])
+    parser.add_argument('--time-limit', type=float, default=30)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = str(Path(tmp_dir) / 'twdcp.json')
+        for size in args.sizes:
+            generated = generate('twdcp', size)
+            print('{0} nodes, {1} vehicles'.format(size, generated['num_vehicles']))
+            for docks in args.docks:
+                for name, input_data in dock_variants(generated, docks):
+                    write_instance(input_data, path)
+                    for dock_scheduling in DOCK_SCHEDULING:
+                        metrics = Metrics()
+                        options = SearchOptions(time_limit=args.time_limit, dock_scheduling=dock_scheduling, metrics=metrics)
+                        start = time.perf_counter()
+                        with contextlib.redirect_stdout(io.StringIO()):
+                            result = TWDCP.solve(path, options)
+                        print('  {0:>20} {1:>9}: {2:8.3f}s  branches {3:>8}  objective {4}'.format(
+                            name,
+                            dock_scheduling,
+                            time.perf_counter() - start,
+                            metrics.search.get('branches'),
+                            json.dumps(result.objective if result else None),
+                        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+
+"""Latency and optimality of the exact small TSP engine against the routing model.
+
+The sample tsp.json and generated instances of 10 to 20 nodes are solved by
+TSP.solve with the routing engine, the path every TSP took before, and with
+the auto engine, which solves them with the Held-Karp dynamic program up to
+EXACT_MAX_NODES nodes. The median solve times of both, and the mean and
+worst excess of the routing tours over the optimal ones are reported per
+size. Usage::
+
+    python benchmarks/bench_exact.py [--sizes 10 13 16 17 20] [--seeds 5]
+"""
+
+import argparse
+import contextlib
+import io
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from ort_optimization.exact import held_karp_tour
+from ort_optimization.generator import generate, write_instance
+from ort_optimization.instance import load_instance
+from ort_optimization.search import SearchOptions
+from ort_optimization.tsp import TSP
+
+DATA_FOLDER = Path(__file__).parent.parent / 'data_input_files'
+
+
+def timed_solve(path, engine):
+    """Solve a TSP quietly.
+
+    Args:
+        path: Path of the instance.
+        engine: TSP engine.
+
+    Returns:
+        The result and the solve time in seconds.
+    """
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = TSP.solve(str(path), SearchOptions(engine=engine))
+    return result, time.perf_counter() - start
+
+
+def compare(label, paths):
+    """Solve instances with both engines and print a report line.
+
+    Args:
+        label: Label of the instances.
+        paths: Paths of the instances.
+    """
+    routing_times, auto_times, excesses = [], [], []
+    for path in paths:
+        routing, routing_time = timed_solve(path, 'routing')
+        auto, auto_time = timed_solve(path, 'auto')
+        input_data = load_instance(path)
+        optimum, _ = held_karp_tour(input_data['distance_matrix'], input_data['depot'])
+        routing_times.append(routing_time)
+        auto_times.append(auto_time)
+        excesses.append(routing.objective / optimum - 1)
+        if auto.objective > routing.objective:
+            print('  {0}: auto {1} worse than routing {2}'.format(path, auto.objective, routing.objective))
+    print('{0}: routing {1:.1f}ms, auto {2:.1f}ms | routing excess mean {3:.2%} worst {4:.2%}, optimal {5}/{6}'.format(
+        label, statistics.median(routing_times) * 1000, statistics.median(auto_times) * 1000,
+        statistics.mean(excesses), max(excesses), sum(excess == 0 for excess in excesses), len(excesses),
+    ))
+
+
+def main():
+    """Run the benchmark and print a report."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 13, 16, 17, 20])
+    parser.add_argument('--seeds', type=int, default=5)
+    args = parser.parse_args()
+    compare('tsp.json', [DATA_FOLDER / 'tsp.json'])
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size in args.sizes:
+            paths = []
+            for seed in range(args.seeds):
+                path = Path(tmp_dir) / 'tsp_{0}_{1}.json'.format(size, seed)
+                write_instance(generate('tsp', size, seed=seed), path)
+                paths.append(path)
+            compare('{0} nodes'.format(size), paths)
+
+
+if __name__ == '__main__':
+    main()
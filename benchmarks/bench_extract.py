@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+
+"""Benchmark the extraction of a solution into a result.
+
+The VRP of an instance is solved once, then the solution is read back many
+times, once with the former node by node walk (a NextVar read and an arc cost
+evaluation per node, the plan built with string concatenation) and once with
+extract_solution. Usage::
+
+    python benchmarks/bench_extract.py [--repeat 200] [data_input_files/vrp.json]
+"""
+
+import argparse
+import timeit
+
+from ortools.constraint_solver import pywrapcp
+
+from ort_optimization.instance import load_instance
+from ort_optimization.result import extract_solution
+from ort_optimization.search import build_search_parameters
+from ort_optimization.transit import register_transit_matrix
+
+
+def solve_vrp(input_data):
+    """Solve the VRP of an instance with the first solution heuristic only.
+
+    Args:
+        input_data: Instance data.
+
+    Returns:
+        The manager, the routing model and the solution.
+    """
+    manager = pywrapcp.RoutingIndexManager(
+        len(input_data['distance_matrix']), input_data['num_vehicles'], input_data['depot'],
+    )
+    routing = pywrapcp.RoutingModel(manager)
+    transit_callback_index = register_transit_matrix(routing, input_data['distance_matrix'])
+    routing.SetArcCostEvaluatorOfAllVehicles(transit_callback_index)
+    routing.AddDimension(transit_callback_index, 0, input_data['travel distance'], True, 'Distance')  # noqa: WPS425
+    routing.GetDimensionOrDie('Distance').SetGlobalSpanCostCoefficient(100)
+    solution = routing.SolveWithParameters(build_search_parameters(first_solution_strategy='PATH_CHEAPEST_ARC'))
+    return manager, routing, solution
+
+
+def node_by_node(manager, routing, solution):
+    """Read the routes and their distances as print_solution used to.
+
+    Args:
+        manager: Manager for any NodeIndex <-> variable index conversion.
+        routing: Routing Model
+        solution: Solution assignment of the routing model.
+
+    Returns:
+        The plan text and the distance of every route.
+    """
+    plan_output = ''
+    distances = []
+    for vehicle_id in range(routing.vehicles()):
+        index = routing.Start(vehicle_id)
+        route_distance = 0
+        while not routing.IsEnd(index):
+            plan_output += ' {0} -> '.format(manager.IndexToNode(index))
+            previous_index = index
+            index = solution.Value(routing.NextVar(index))
+            route_distance += routing.GetArcCostForVehicle(previous_index, index, vehicle_id)
+        plan_output += '{0}\n'.format(manager.IndexToNode(index))
+        distances.append(route_distance)
+    return plan_output, distances
+
+
+def main():
+    """Run the benchmark and print a report."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('path', nargs='?', default='data_input_files/vrp.json')
+    args = parser.parse_args()
+    input_data = load_instance(args.path)
+    manager, routing, solution = solve_vrp(input_data)
+    result = extract_solution('vrp', manager, routing, solution, input_data['distance_matrix'])
+    assert result.costs == node_by_node(manager, routing, solution)[1]  # noqa: S101
+    print('{0}: {1} vehicles, {2} nodes'.format(args.path, routing.vehicles(), len(input_data['distance_matrix'])))
+    for name, extract in (
+        ('node by node', lambda: node_by_node(manager, routing, solution)),
+        ('extract_solution', lambda: extract_solution('vrp', manager, routing, solution, input_data['distance_matrix'])),
+    ):
+        elapsed = timeit.timeit(extract, number=args.repeat) / args.repeat
+        print('  {0:>16}: {1:8.1f}us per extraction'.format(name, elapsed * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+
+"""Solve time saved by stopping at a target optimality gap.
+
+Generated instances are solved with a metaheuristic and a fixed time limit,
+as they had to be without any notion of distance to the optimum, then with
+the same limit and a target gap, which stops the search at the first
+solution close enough to the lower bound. The time of the bound, the solve
+times, the objectives and the gaps are reported. Usage::
+
+    python benchmarks/bench_gap.py [--sizes 50 100 200] [--problems tsp cvrp] [--time-limit 10] [--target-gap 0.05]
+"""
+
+import argparse
+import contextlib
+import io
+import tempfile
+import time
+from pathlib import Path
+
+from ort_optimization.bounds import lower_bound
+from ort_optimization.generator import generate, write_instance
+from ort_optimization.instance import load_instance
+from ort_optimization.pdp import SPAN_COST_COEFFICIENT as PDP_SPAN_COST_COEFFICIENT
+from ort_optimization.search import SearchOptions
+from ort_optimization.solvers import get_solver
+from ort_optimization.vrp import SPAN_COST_COEFFICIENT
+
+SPAN_COST_COEFFICIENTS = {'pdp': PDP_SPAN_COST_COEFFICIENT, 'vrp': SPAN_COST_COEFFICIENT}
+
+
+def timed_solve(problem, path, options):
+    """Solve an instance quietly.
+
+    Args:
+        problem: Problem name.
+        path: Path of the instance.
+        options: Search options.
+
+    Returns:
+        The result and the solve time in seconds.
+    """
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = get_solver(problem).solve(str(path), options)
+    return result, time.perf_counter() - start
+
+
+def main():
+    """Run the benchmark and print a report."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[50, 100, 200])
+    parser.add_argument('--problems', nargs='+', default=['tsp', 'cvrp', 'vrp', 'twcp'])
+    parser.add_argument('--time-limit', type=float, default=10)
+    parser.add_argument('--target-gap', type=float, default=0.05)
+    parser.add_argument('--metaheuristic', default='GUIDED_LOCAL_SEARCH')
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for problem in args.problems:
+            for size in args.sizes:
+                path = Path(tmp_dir) / '{0}_{1}.json'.format(problem, size)
+                write_instance(generate(problem, size, seed=1), path)
+                input_data = load_instance(path)
+                input_data.setdefault('maximum_time', input_data.get('waiting_time'))
+                start = time.perf_counter()
+                lower_bound(problem, input_data, SPAN_COST_COEFFICIENTS.get(problem, 0))
+                bound_time = time.perf_counter() - start
+                options = {'time_limit': args.time_limit, 'local_search_metaheuristic': args.metaheuristic}
+                fixed, fixed_time = timed_solve(problem, path, SearchOptions(**options))
+                targeted, targeted_time = timed_solve(problem, path, SearchOptions(target_gap=args.target_gap, **options))
+                print('{0} {1}: bound {2:.3f}s | fixed {3:.1f}s objective {4} gap {5:.1%} | target {6:.1f}s objective {7} gap {8:.1%}'.format(
+                    problem, size, bound_time, fixed_time, fixed.objective, fixed.gap,
+                    targeted_time, targeted.objective, targeted.gap,
+                ))
+
+
+if __name__ == '__main__':
+    main()
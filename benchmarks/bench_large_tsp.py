@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+
+"""Quality and time of the local search TSP engine against the routing model.
+
+Generated locations only instances are solved by TSP.solve with the routing
+engine, the path every TSP took before, on the sizes where it runs in
+reasonable time, and with the local engine on those and on larger sizes.
+The solve times, which include loading the instance and building its matrix,
+the objectives, and the excess of the routing tours over the local ones are
+reported. Usage::
+
+    python benchmarks/bench_large_tsp.py [--sizes 200 500 1000] [--local-sizes 5000 10000 20000] [--time-limit 60]
+"""
+
+import argparse
+import contextlib
+import io
+import tempfile
+import time
+from pathlib import Path
+
+from ort_optimization.generator import generate, write_instance
+from ort_optimization.search import SearchOptions
+from ort_optimization.tsp import TSP
+
+
+def timed_solve(path, engine, time_limit):
+    """Solve a TSP quietly.
+
+    Args:
+        path: Path of the instance.
+        engine: TSP engine.
+        time_limit: Time limit of the search in seconds.
+
+    Returns:
+        The result and the solve time in seconds.
+    """
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = TSP.solve(str(path), SearchOptions(engine=engine, time_limit=time_limit))
+    return result, time.perf_counter() - start
+
+
+def main():
+    """Run the benchmark and print a report."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[200, 500, 1000])
+    parser.add_argument('--local-sizes', type=int, nargs='+', default=[5000, 10000, 20000])
+    parser.add_argument('--time-limit', type=float, default=None)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size in args.sizes + args.local_sizes:
+            path = Path(tmp_dir) / 'tsp_{0}.json'.format(size)
+            write_instance(generate('tsp', size, seed=1), path, 'locations')
+            local, local_time = timed_solve(path, 'local', args.time_limit)
+            report = '{0} nodes: local {1:.2f}s objective {2}'.format(size, local_time, local.objective)
+            if size in args.sizes:
+                routing, routing_time = timed_solve(path, 'routing', args.time_limit)
+                report = '{0} | routing {1:.2f}s objective {2} ({3:+.2%})'.format(
+                    report, routing_time, routing.objective, routing.objective / local.objective - 1,
+                )
+            print(report)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+
+"""Memory of a loaded instance, as nested lists and packed.
+
+Generated JSON instances of growing size are loaded once as decoded JSON, the
+nested lists of Python integers the solvers used to hold, and once with
+load_instance, which packs the matrix. The memory kept by the instance, the
+peak memory of the load (both traced by tracemalloc) and the load time are
+reported. Usage::
+
+    python benchmarks/bench_memory.py [--sizes 250 500 1000 2000] [--problems tsp twcp]
+"""
+
+import argparse
+import gc
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from ort_optimization.generator import generate, write_instance
+from ort_optimization.instance import MATRIX_KEYS, load_instance, read_json
+
+
+def measure(load, path):
+    """Load an instance and trace its memory.
+
+    Args:
+        load: Function loading the instance from its path.
+        path: Path of the instance.
+
+    Returns:
+        The instance data, the memory it keeps and the peak memory of the load
+        in bytes, and the load time in seconds.
+    """
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    input_data = load(path)
+    elapsed = time.perf_counter() - start
+    kept, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return input_data, kept, peak, elapsed
+
+
+def main():
+    """Run the benchmark and print a report."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[250, 500, 1000, 2000])
+    parser.add_argument('--problems', nargs='+', default=['tsp', 'twcp'])
+    args = parser.parse_args()
+    mega = 1024 * 1024
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for problem in args.problems:
+            for size in args.sizes:
+                path = Path(tmp_dir) / '{0}{1}.json'.format(problem, size)
+                write_instance(generate(problem, size), path)
+                _, list_kept, list_peak, list_time = measure(read_json, path)
+                input_data, packed_kept, packed_peak, packed_time = measure(load_instance, path)
+                matrix = next(input_data[key] for key in MATRIX_KEYS if key in input_data)
+                print('{0} {1:>5} nodes: lists {2:8.1f}MB  packed {3:7.2f}MB ({4}, {5})  ratio {6:5.1f}x  peak {7:8.1f}MB -> {8:8.1f}MB  load {9:6.2f}s -> {10:6.2f}s'.format(
+                    problem,
+                    size,
+                    list_kept / mega,
+                    packed_kept / mega,
+                    type(matrix).__name__,
+                    matrix.dtype,
+                    list_kept / packed_kept,
+                    list_peak / mega,
+                    packed_peak / mega,
+                    list_time,
+                    packed_time,
+                ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python
+
+"""Benchmark the quality and time tradeoff of nearest-neighbor arc pruning.
+
+Every instance is solved once per number of neighbors, None being the complete
+model. The report shows the share of arcs removed, the wall time and the
+objective of each run. Usage::
+
+    python benchmarks/bench_pruning.py [--neighbors 5 10 20 40] data_input_files/vrp.json ...
+"""
+
+import argparse
+import contextlib
+import io
+import time
+
+from ort_optimization.instance import load_instance
+from ort_optimization.pruning import pruned_arc_ratio
+from ort_optimization.search import SearchOptions
+from ort_optimization.vrp import VRP
+
+
+def main():
+    """Run the benchmark and print a report."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--neighbors', type=int, nargs='+', default=[5, 10, 20, 40])
+    parser.add_argument('paths', nargs='*', default=['data_input_files/vrp.json'])
+    args = parser.parse_args()
+    for path in args.paths:
+        matrix = load_instance(path)['distance_matrix']
+        print(path)
+        for neighbors in args.neighbors + [None]:
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = VRP.solve(path, SearchOptions(neighbors=neighbors))
+            elapsed = time.perf_counter() - start
+            print('  k={0:>4}: {1:5.1%} arcs removed, {2:6.2f}s, objective {3}'.format(
+                str(neighbors), pruned_arc_ratio(matrix, neighbors), elapsed, result.objective,
+            ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+
+"""Load test of the HTTP solve service against one process per solve.
+
+The same instance is solved ``--requests`` times, first by running the
+command line once per request, then by posting it to a local service with
+``--concurrency`` clients at once. Throughput, latency percentiles and the
+requests refused by back-pressure are reported. Usage::
+
+    python benchmarks/bench_server.py [--requests 200] [--concurrency 4] [--workers 2] [data_input_files/tsp.json]
+"""
+
+import argparse
+import json
+import subprocess  # noqa: S404
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from ort_optimization.instance import detect_problem, load_instance, read_json
+from ort_optimization.server import BINARY_CONTENT_TYPE, SolveService, make_server, pack_binary
+
+
+def post(url, body, content_type):
+    """Post a body and time the answer.
+
+    Args:
+        url: URL of the solve route.
+        body: Bytes of the instance.
+        content_type: Content type of the body.
+
+    Returns:
+        The HTTP status and the latency in seconds.
+    """
+    request = urllib.request.Request(url, data=body, headers={'Content-Type': content_type})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request) as response:  # noqa: S310
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as er:
+        status = er.code
+    return status, time.perf_counter() - start
+
+
+def report(name, latencies, elapsed, refused=0):
+    """Print the throughput and the latency percentiles of a run.
+
+    Args:
+        name: Name of the run.
+        latencies: Latency of every answered request in seconds.
+        elapsed: Wall time of the run in seconds.
+        refused: Number of requests refused by back-pressure.
+    """
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000
+    print('  {0:>22}: {1:8.1f} solves/s  p50 {2:8.1f}ms  p95 {3:8.1f}ms  p99 {4:8.1f}ms  refused {5}'.format(
+        name, len(latencies) / elapsed, p50, p95, p99, refused,
+    ))
+
+
+def main():
+    """Run the load test and print a report."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--cli-requests', type=int, default=10, help='Requests of the one process per solve run.')
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--queue-size', type=int, default=8)
+    parser.add_argument('path', nargs='?', default='data_input_files/tsp.json')
+    args = parser.parse_args()
+    problem = detect_problem(read_json(args.path))
+    print('{0}: {1}, {2} requests'.format(args.path, problem, args.requests))
+
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(args.cli_requests):
+        command = [sys.executable, '-m', 'ort_optimization', problem, args.path, '--json']
+        request_start = time.perf_counter()
+        subprocess.run(command, capture_output=True, check=True)  # noqa: S603
+        latencies.append(time.perf_counter() - request_start)
+    report('process per solve', latencies, time.perf_counter() - start)
+
+    service = SolveService(args.workers, args.queue_size)
+    server = make_server(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = 'http://127.0.0.1:{0}/solve/{1}'.format(server.server_address[1], problem)
+    with open(args.path, 'rb') as json_file:
+        bodies = {
+            'service, JSON body': (json_file.read(), 'application/json'),
+            'service, binary body': (pack_binary(load_instance(args.path)), BINARY_CONTENT_TYPE),
+        }
+    try:
+        for name, (body, content_type) in bodies.items():
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=args.concurrency) as clients:
+                answers = list(clients.map(lambda _: post(url, body, content_type), range(args.requests)))
+            elapsed = time.perf_counter() - start
+            latencies = [latency for status, latency in answers if status == 200]
+            report(name, latencies, elapsed, sum(status == 503 for status, _ in answers))
+    finally:
+        server.shutdown()
+        server.server_close()
+        service.shutdown()
+    print(json.dumps(service.health()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+
+"""Latency of the order events of a routing session against a full re-solve.
+
+A generated instance is planned with most of its orders, then the remaining
+orders are inserted one by one and a few planned ones are cancelled, after
+the first stops of every route have been visited. The latency of every event
+and the objective of the plan are reported, and compared with a solve of the
+final orders from scratch by the solver of the problem, which is what each
+event used to cost. Usage::
+
+    python benchmarks/bench_session.py [--size 200] [--problems cvrp pdp] [--new-share 0.1]
+"""
+
+import argparse
+import contextlib
+import io
+import random
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from ort_optimization.generator import generate, write_instance
+from ort_optimization.instance import load_instance, save_binary
+from ort_optimization.session import RoutingSession
+from ort_optimization.solvers import get_solver
+
+VISITED_STOPS = 2
+CANCELLED_ORDERS = 5
+
+
+def order_instance(problem, input_data, orders):
+    """Return the instance restricted to some orders.
+
+    Args:
+        problem: cvrp or pdp.
+        input_data: Instance data.
+        orders: Stops (CVRP) or (pickup, delivery) pairs (PDP) kept.
+
+    Returns:
+        The instance data of the orders, with the depot as node 0.
+    """
+    stops = sorted(orders) if problem == 'cvrp' else sorted(node for order in orders for node in order)
+    nodes = [input_data['depot']] + stops
+    order_data = dict(input_data, distance_matrix=np.asarray(input_data['distance_matrix'])[np.ix_(nodes, nodes)], depot=0)
+    order_data.pop('locations', None)
+    if problem == 'cvrp':
+        order_data['demands'] = [int(input_data['demands'][node]) for node in nodes]
+    else:
+        order_data['pickups_deliveries'] = [[nodes.index(pickup), nodes.index(delivery)] for pickup, delivery in orders]
+    return order_data
+
+
+def report(name, latencies):
+    """Print the latency percentiles of some events.
+
+    Args:
+        name: Name of the events.
+        latencies: Latency of every event in seconds.
+    """
+    p50, p95 = np.percentile(latencies, [50, 95]) * 1000
+    print('  {0:>7} x{1:<3} p50 {2:7.1f}ms  p95 {3:7.1f}ms  max {4:7.1f}ms'.format(
+        name, len(latencies), p50, p95, max(latencies) * 1000,
+    ))
+
+
+def main():
+    """Run the benchmark and print a report."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', type=int, default=200)
+    parser.add_argument('--problems', nargs='+', default=['cvrp', 'pdp'])
+    parser.add_argument('--new-share', type=float, default=0.1, help='Share of the orders inserted one by one.')
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for problem in args.problems:
+            path = str(Path(tmp_dir) / '{0}.json'.format(problem))
+            write_instance(generate(problem, args.size, seed=1), path)
+            input_data = load_instance(path)
+            if problem == 'cvrp':
+                orders = [node for node in range(args.size) if node != input_data['depot']]
+            else:
+                orders = [tuple(order) for order in input_data['pickups_deliveries']]
+            random.Random(1).shuffle(orders)
+            new_count = int(len(orders) * args.new_share)
+            planned, new_orders = orders[new_count:], orders[:new_count]
+            start = time.perf_counter()
+            session = RoutingSession(problem, path, planned)
+            print('{0}, {1} nodes, {2} vehicles: initial plan {3:.3f}s, objective {4}'.format(
+                problem, args.size, input_data['num_vehicles'], time.perf_counter() - start, session.result().objective,
+            ))
+            for route in session.routes:
+                if len(route) > VISITED_STOPS:
+                    session.lock(route[VISITED_STOPS - 1])
+            latencies = {'insert': [], 'cancel': []}
+            for order in new_orders:
+                start = time.perf_counter()
+                session.insert(order)
+                latencies['insert'].append(time.perf_counter() - start)
+            visited = {node for route, count in zip(session.routes, session.visited) for node in route[:count]}
+            cancelled = [order for order in planned if visited.isdisjoint(session.order_nodes(order)[1])][:CANCELLED_ORDERS]
+            for order in cancelled:
+                start = time.perf_counter()
+                session.cancel(order)
+                latencies['cancel'].append(time.perf_counter() - start)
+            for name, event_latencies in latencies.items():
+                report(name, event_latencies)
+            print('  session objective {0}'.format(session.result().objective))
+            full_path = Path(tmp_dir) / '{0}_orders.json'.format(problem)
+            save_binary(order_instance(problem, input_data, sorted(session.orders)), full_path)
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = get_solver(problem).solve(str(full_path))
+            print('  full re-solve {0:.3f}s, objective {1}'.format(time.perf_counter() - start, result.objective if result else None))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+
+"""Cycle latency and memory of the rolling horizon planner over a day of orders.
+
+Orders with random locations and time windows arrive evenly over a day (and
+a few of them are cancelled), and are fed to the rolling planner. The latency
+of its re-plans, the peak memory of the run and the events processed per
+hour of wall time are reported, and compared with a single solve of every
+order of the day at once, which is what planning a stream used to require.
+Usage::
+
+    python benchmarks/bench_stream.py [--orders 2000] [--vehicles 40] [--interval 5]
+"""
+
+import argparse
+import json
+import random
+import time
+import tracemalloc
+
+import numpy as np
+from ortools.constraint_solver import pywrapcp
+
+from ort_optimization.matrix import build_matrix
+from ort_optimization.rolling import RollingPlanner, run_stream
+from ort_optimization.search import SearchOptions, build_search_parameters, run_search
+from ort_optimization.transit import register_transit_matrix, register_unary_transit_vector
+
+HORIZON = 1440
+SERVICE_TIME = 5
+CAPACITY = 20
+AREA = 60
+CANCEL_SHARE = 0.05
+
+
+def day_events(count, seed=1):
+    """Return the events of a day of orders.
+
+    Args:
+        count: Number of orders.
+        seed: Seed of the random orders.
+
+    Returns:
+        The events, in the order of their times.
+    """
+    rand = random.Random(seed)
+    events = []
+    for order in range(count):
+        event_time = order * (HORIZON - 180) // count
+        open_time = event_time + rand.randint(10, 60)
+        events.append({
+            'type': 'order',
+            'id': order,
+            'time': event_time,
+            'location': [rand.uniform(-AREA, AREA), rand.uniform(-AREA, AREA)],
+            'demand': rand.randint(1, 3),
+            'time_window': [open_time, open_time + rand.randint(30, 120)],
+        })
+        if rand.random() < CANCEL_SHARE:
+            events.append({'type': 'cancel', 'id': order, 'time': event_time})
+    return events
+
+
+def full_day_solve(config, events, time_limit):
+    """Solve every order of the day in one model, as a static TWCP.
+
+    Args:
+        config: Fleet configuration.
+        events: Events of the day.
+        time_limit: Time limit of the search in seconds.
+
+    Returns:
+        The number of orders served, or None without a solution.
+    """
+    cancelled = {event['id'] for event in events if event['type'] == 'cancel'}
+    orders = [event for event in events if event['type'] == 'order' and event['id'] not in cancelled]
+    matrix = build_matrix([config['depot']] + [order['location'] for order in orders], 'euclidean', 1)
+    manager = pywrapcp.RoutingIndexManager(len(matrix), config['num_vehicles'], 0)
+    routing = pywrapcp.RoutingModel(manager)
+    routing.SetArcCostEvaluatorOfAllVehicles(register_transit_matrix(routing, matrix))
+    time_matrix = matrix + np.array([0] + [SERVICE_TIME] * len(orders))[:, None]
+    routing.AddDimension(register_transit_matrix(routing, time_matrix), HORIZON, HORIZON, False, 'Time')  # noqa: WPS425
+    time_dimension = routing.GetDimensionOrDie('Time')
+    for node, order in enumerate(orders, 1):
+        index = manager.NodeToIndex(node)
+        time_dimension.CumulVar(index).SetRange(*order['time_window'])
+        routing.AddDisjunction([index], 10 * int(matrix.max()))
+    routing.AddDimensionWithVehicleCapacity(
+        register_unary_transit_vector(routing, [0] + [order['demand'] for order in orders]),
+        0, config['vehicle_capacities'], True, 'Capacity',  # noqa: WPS425
+    )
+    options = SearchOptions(time_limit=time_limit)
+    solution = run_search(routing, build_search_parameters(options, first_solution_strategy='PATH_CHEAPEST_ARC'), options)
+    if not solution:
+        return None
+    return sum(1 for index in range(routing.Size()) if not routing.IsStart(index) and solution.Value(routing.NextVar(index)) != index)
+
+
+def main():
+    """Run the benchmark and print a report."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--orders', type=int, default=2000)
+    parser.add_argument('--vehicles', type=int, default=40)
+    parser.add_argument('--interval', type=int, default=5)
+    parser.add_argument('--cycle-time-limit', type=float, default=1)
+    parser.add_argument('--full-time-limit', type=float, default=60)
+    args = parser.parse_args()
+    config = {
+        'depot': [0, 0],
+        'num_vehicles': args.vehicles,
+        'vehicle_capacities': [CAPACITY] * args.vehicles,
+        'horizon': HORIZON,
+        'service_time': SERVICE_TIME,
+    }
+    events = day_events(args.orders)
+    records = []
+    planner = RollingPlanner(config, args.interval, options=SearchOptions(time_limit=args.cycle_time_limit), emit=records.append)
+    tracemalloc.start()
+    start = time.perf_counter()
+    run_stream(planner, (json.dumps(event) for event in events))
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    latencies = [record['elapsed'] for record in records if record['event'] == 'plan']
+    p50, p95 = np.percentile(latencies, [50, 95]) * 1000
+    summary = records[-1]
+    print('stream: {0} events, {1} cycles in {2:.1f}s, {3:.0f} events per hour'.format(
+        summary['events'], summary['cycles'], elapsed, summary['events'] * 3600 / elapsed,
+    ))
+    print('  cycle p50 {0:.1f}ms  p95 {1:.1f}ms  max {2:.1f}ms, peak memory {3:.1f}MB'.format(
+        p50, p95, max(latencies) * 1000, peak / 1e6,
+    ))
+    print('  committed {0}, rejected {1}, cancelled {2}'.format(summary['committed'], summary['rejected'], summary['cancelled']))
+    tracemalloc.start()
+    start = time.perf_counter()
+    served = full_day_solve(config, events, args.full_time_limit)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print('full day solve: {0:.1f}s, served {1}, peak memory {2:.1f}MB'.format(elapsed, served, peak / 1e6))
+
+
+if __name__ == '__main__':
+    main()
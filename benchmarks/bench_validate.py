@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+
+"""Throughput of the plan validator against checking plans with an OR-Tools model.
+
+A generated instance of every problem is solved once, then perturbed copies
+of its solution (two stops of a route swapped) are evaluated all at once by
+evaluate_plans, and one by one by evaluate. For the CVRP they are also
+checked the way it takes with OR-Tools: the routes read into a routing model
+with the capacity dimension, which fails on an infeasible plan and otherwise
+gives the objective. Usage::
+
+    python benchmarks/bench_validate.py [--size 100] [--plans 10000] [--problems cvrp pdp twdcp]
+"""
+
+import argparse
+import contextlib
+import io
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from ortools.constraint_solver import pywrapcp
+
+from ort_optimization.generator import generate, write_instance
+from ort_optimization.instance import load_instance
+from ort_optimization.search import SearchOptions
+from ort_optimization.solvers import get_solver
+from ort_optimization.transit import register_transit_matrix, register_unary_transit_vector
+from ort_optimization.validate import evaluate, evaluate_plans
+
+ORTOOLS_PLANS = 200
+
+
+def perturbed_plans(routes, count, seed=1):
+    """Return copies of a plan with two consecutive stops of a route swapped.
+
+    Args:
+        routes: Routes of the plan.
+        count: Number of copies.
+        seed: Seed of the random swaps.
+
+    Returns:
+        The routes of every copy.
+    """
+    rand = random.Random(seed)
+    long_routes = [vehicle for vehicle, route in enumerate(routes) if len(route) > 3]
+    plans = []
+    for _ in range(count):
+        plan = [list(route) for route in routes]
+        route = plan[rand.choice(long_routes)]
+        position = rand.randrange(1, len(route) - 2)
+        route[position], route[position + 1] = route[position + 1], route[position]
+        plans.append(plan)
+    return plans
+
+
+def ortools_check(input_data, plans):
+    """Check CVRP plans by reading them into a routing model.
+
+    Args:
+        input_data: CVRP instance data.
+        plans: Routes of every plan.
+
+    Returns:
+        The objective of every plan, None when infeasible.
+    """
+    manager = pywrapcp.RoutingIndexManager(len(input_data['distance_matrix']), input_data['num_vehicles'], input_data['depot'])
+    routing = pywrapcp.RoutingModel(manager)
+    routing.SetArcCostEvaluatorOfAllVehicles(register_transit_matrix(routing, input_data['distance_matrix']))
+    routing.AddDimensionWithVehicleCapacity(
+        register_unary_transit_vector(routing, input_data['demands']), 0, input_data['vehicle_capacities'], True, 'Capacity',  # noqa: WPS425
+    )
+    routing.CloseModel()
+    objectives = []
+    for routes in plans:
+        assignment = routing.ReadAssignmentFromRoutes([route[1:-1] for route in routes], True)
+        objectives.append(assignment.ObjectiveValue() if assignment else None)
+    return objectives
+
+
+def main():
+    """Run the benchmark and print a report."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', type=int, default=100)
+    parser.add_argument('--plans', type=int, default=10000)
+    parser.add_argument('--problems', nargs='+', default=['cvrp', 'pdp', 'twdcp'])
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for problem in args.problems:
+            path = Path(tmp_dir) / '{0}.json'.format(problem)
+            write_instance(generate(problem, args.size, seed=1), path)
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = get_solver(problem).solve(str(path), SearchOptions(time_limit=5))
+            input_data = load_instance(path)
+            plans = perturbed_plans(result.routes, args.plans)
+            # The swapped stops keep the arrival times of the solution.
+            plan_times = [result.times] * len(plans) if result.times is not None else None
+            start = time.perf_counter()
+            evaluations = evaluate_plans(problem, input_data, plans, plan_times)
+            batch_time = time.perf_counter() - start
+            start = time.perf_counter()
+            for routes in plans[:ORTOOLS_PLANS]:
+                evaluate(problem, input_data, routes, result.times)
+            single_time = (time.perf_counter() - start) / ORTOOLS_PLANS
+            print('{0}, {1} nodes, {2} plans: batch {3:.2f}s ({4:.1f}us per plan), one by one {5:.0f}us per plan, {6} feasible'.format(
+                problem, args.size, len(plans), batch_time, batch_time / len(plans) * 1e6, single_time * 1e6,
+                sum(evaluation.feasible for evaluation in evaluations),
+            ))
+            if problem == 'cvrp':
+                start = time.perf_counter()
+                objectives = ortools_check(input_data, plans[:ORTOOLS_PLANS])
+                ortools_time = (time.perf_counter() - start) / ORTOOLS_PLANS
+                agree = all(
+                    objective == (evaluation.objective if evaluation.feasible else None)
+                    for objective, evaluation in zip(objectives, evaluations)
+                )
+                print('  OR-Tools model {0:.0f}us per plan, same verdicts and objectives: {1}'.format(ortools_time * 1e6, agree))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+
+"""Benchmark warm-start re-optimization on perturbed copies of VRP instances.
+
+For every instance a reference plan is solved first. The instance is then
+perturbed (a few percent of the arcs change by up to 10% and two new stops are
+added) and solved again, once from scratch and once seeded with the reference
+plan, with the same time limit. The report shows how long each run takes to
+get within 1% of the final cold objective. Usage::
+
+    python benchmarks/bench_warmstart.py [--time-limit 10] data_input_files/vrp.json ...
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import random
+import tempfile
+from pathlib import Path
+
+from ort_optimization.search import SearchOptions
+from ort_optimization.vrp import VRP
+
+
+def perturb(input_data, seed, arc_ratio=0.05, new_stops=2):
+    """Return a perturbed copy of a VRP instance.
+
+    Args:
+        input_data: Instance data.
+        seed: Seed of the random generator.
+        arc_ratio: Fraction of the arcs whose length changes.
+        new_stops: Number of stops appended, each one close to an existing stop.
+
+    Returns:
+        The perturbed instance data.
+    """
+    rng = random.Random(seed)
+    matrix = [list(row) for row in input_data['distance_matrix']]
+    size = len(matrix)
+    for _ in range(int(arc_ratio * size * size / 2)):
+        from_node, to_node = rng.randrange(1, size), rng.randrange(1, size)
+        if from_node != to_node:
+            length = int(matrix[from_node][to_node] * rng.uniform(0.9, 1.1))
+            matrix[from_node][to_node] = matrix[to_node][from_node] = length
+    for _ in range(new_stops):
+        twin = rng.randrange(1, len(matrix))
+        row = [length + 5 for length in matrix[twin]]
+        row[twin] = 5
+        for node, length in enumerate(row):
+            matrix[node].append(length)
+        row.append(0)
+        matrix.append(row)
+    return dict(input_data, distance_matrix=matrix)
+
+
+def timed_solve(path, time_limit, initial_routes=None):
+    """Solve with guided local search and record every improving objective.
+
+    Args:
+        path: Path of the instance.
+        time_limit: Time limit in seconds.
+        initial_routes: Route plan seeding the search.
+
+    Returns:
+        The result and the list of (elapsed, objective) improvements.
+    """
+    trajectory = []
+    options = SearchOptions(
+        local_search_metaheuristic='GUIDED_LOCAL_SEARCH',
+        time_limit=time_limit,
+        initial_routes=initial_routes,
+        on_solution=lambda objective, elapsed: trajectory.append((elapsed, objective)),
+    )
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = VRP.solve(str(path), options)
+    return result, trajectory
+
+
+def time_to_reach(trajectory, target):
+    """Return the first time an objective at or below the target was found.
+
+    Args:
+        trajectory: List of (elapsed, objective) improvements.
+        target: Objective to reach.
+
+    Returns:
+        The elapsed seconds formatted for the report, or never.
+    """
+    elapsed = next((elapsed for elapsed, objective in trajectory if objective <= target), None)
+    return 'never' if elapsed is None else '{0:.2f}s'.format(elapsed)
+
+
+def main():
+    """Run the benchmark and print a report."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--time-limit', type=float, default=10)
+    parser.add_argument('paths', nargs='*', default=['data_input_files/vrp.json', 'data_input_files/my_vrp.json'])
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for seed, path in enumerate(args.paths):
+            reference, _ = timed_solve(path, args.time_limit)
+            with open(path) as json_file:
+                perturbed = perturb(json.load(json_file), seed)
+            perturbed_path = Path(tmp_dir) / Path(path).name
+            with open(perturbed_path, 'w') as json_file:
+                json.dump(perturbed, json_file)
+            cold, cold_trajectory = timed_solve(perturbed_path, args.time_limit)
+            warm, warm_trajectory = timed_solve(perturbed_path, args.time_limit, reference.routes)
+            target = cold.objective * 1.01
+            print(path)
+            print('  reference objective: {0}'.format(reference.objective))
+            print('  cold: first {0} at {1:.2f}s, final {2}, within 1% at {3}'.format(
+                cold_trajectory[0][1], cold_trajectory[0][0], cold.objective, time_to_reach(cold_trajectory, target),
+            ))
+            print('  warm: first {0} at {1:.2f}s, final {2}, within 1% at {3}'.format(
+                warm_trajectory[0][1], warm_trajectory[0][0], warm.objective, time_to_reach(warm_trajectory, target),
+            ))
+
+
+if __name__ == '__main__':
+    main()
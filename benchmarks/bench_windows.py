@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+
+"""Benchmark the time window preprocessing on generated tight window instances.
+
+Every instance is solved with and without the preprocessing; the arcs
+removed, the time of the constraint posting (the preprocessing included) and
+of the search, the branches of the search and the objective are reported.
+Usage::
+
+    python benchmarks/bench_windows.py [--sizes 100 200 400] [--window-share 0.05] [--time-limit 5]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import tempfile
+from pathlib import Path
+
+from ort_optimization.generator import generate, write_instance
+from ort_optimization.metrics import Metrics
+from ort_optimization.search import SearchOptions
+from ort_optimization.solvers import get_solver
+
+
+def solve(problem, path, window_pruning, time_limit):
+    """Solve an instance and collect its metrics.
+
+    Args:
+        problem: twcp or twdcp.
+        path: Path of the instance.
+        window_pruning: Whether to preprocess the time windows.
+        time_limit: Time limit of the search in seconds.
+
+    Returns:
+        The metrics and the objective, or None.
+    """
+    metrics = Metrics()
+    options = SearchOptions(time_limit=time_limit, window_pruning=window_pruning, metrics=metrics)
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = get_solver(problem).solve(path, options)
+    return metrics, result.objective if result else None
+
+
+def main():
+    """Run the benchmark and print a report."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 200, 400])
+    parser.add_argument('--problems', nargs='+', default=['twcp', 'twdcp'])
+    parser.add_argument('--window-share', type=float, default=0.05)
+    parser.add_argument('--time-limit', type=float, default=5)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for problem in args.problems:
+            for size in args.sizes:
+                path = str(Path(tmp_dir) / '{0}{1}.json'.format(problem, size))
+                write_instance(generate(problem, size, window_share=args.window_share), path)
+                print('{0}, {1} nodes, window share {2}'.format(problem, size, args.window_share))
+                for window_pruning in (False, True):
+                    metrics, objective = solve(problem, path, window_pruning, args.time_limit)
+                    phases = {lap['phase']: lap['elapsed'] for lap in metrics.phases}
+                    print('  {0:>13}: arcs removed {1:>6}  constraints {2:7.3f}s  solve {3:7.3f}s  branches {4:>9}  objective {5}'.format(
+                        'preprocessed' if window_pruning else 'plain',
+                        metrics.counters.get('pruned_arcs', 0),
+                        phases.get('constraints', 0),
+                        phases.get('solve', 0),
+                        metrics.search.get('branches'),
+                        json.dumps(objective),
+                    ))
+
+
+if __name__ == '__main__':
+    main()
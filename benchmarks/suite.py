@@ -0,0 +1,221 @@
+#!/usr/bin/env python
+
+"""Benchmark suite covering every problem type, with scaling curves.
+
+``run`` solves the instances of data_input_files and generated instances of
+increasing size for TSP, VRP, CVRP, PDP, TWCP and TWDCP. Every case runs in a
+fresh process, so that the peak resident set size recorded at the end of each
+phase (load, model, constraints, build, solve, extract) belongs to that case
+alone, and the search statistics are recorded with the phases. The results
+are written to a JSON file together with the commit and the environment.
+
+``compare`` matches the cases of two result files and reports the ones that
+got slower or worse beyond the tolerances, exiting with status 1 if any did.
+Usage::
+
+    python benchmarks/suite.py run [--sizes 50 100 200 400] [--time-limit 5] [--output results.json]
+    python benchmarks/suite.py compare baseline.json results.json [--time-tolerance 0.2]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import subprocess  # noqa: S404
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import ortools
+
+from ort_optimization.generator import generate
+from ort_optimization.instance import detect_problem, load_instance, read_json
+from ort_optimization.metrics import Metrics
+from ort_optimization.search import SearchOptions
+from ort_optimization.solvers import SOLVERS, get_solver
+
+DATA_FOLDER = Path(__file__).parent.parent / 'data_input_files'
+BUILD_PHASES = ('model', 'constraints', 'build')
+
+
+def run_case(problem, path, time_limit):
+    """Solve one case with metrics, in a worker process.
+
+    Args:
+        problem: Problem name.
+        path: Path of the instance.
+        time_limit: Time limit of the search in seconds.
+
+    Returns:
+        The metrics recorded and the objective, or the error.
+    """
+    metrics = Metrics()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = get_solver(problem).solve(path, SearchOptions(time_limit=time_limit, metrics=metrics))
+    except (Exception, SystemExit) as er:  # noqa: B902
+        return dict(metrics.to_dict(), error=repr(er))
+    return dict(metrics.to_dict(), objective=result.objective if result else None)
+
+
+def measure(name, problem, path, time_limit):
+    """Run a case in a fresh process and build its record.
+
+    Args:
+        name: Name of the case, unique in a run.
+        problem: Problem name.
+        path: Path of the instance.
+        time_limit: Time limit of the search in seconds.
+
+    Returns:
+        The record of the case.
+    """
+    input_data = load_instance(path)
+    size = len(input_data['distance_matrix' if 'distance_matrix' in input_data else 'time_matrix'])
+    context = multiprocessing.get_context('spawn')
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        outcome = executor.submit(run_case, problem, str(path), time_limit).result()
+    phases = {}
+    for lap in outcome.pop('phases'):
+        phase = phases.setdefault(lap['phase'], {'elapsed': 0, 'peak_rss': lap['peak_rss']})
+        phase['elapsed'] += lap['elapsed']
+        phase['peak_rss'] = max(phase['peak_rss'] or 0, lap['peak_rss'] or 0) or None
+    record = {'name': name, 'problem': problem, 'size': size, 'phases': phases}
+    record['total'] = sum(phase['elapsed'] for phase in phases.values())
+    record['wall'] = time.perf_counter() - start
+    record.update(outcome)
+    return record
+
+
+def environment():
+    """Describe the commit and the machine of a run.
+
+    Returns:
+        The environment fields.
+    """
+    try:
+        commit = subprocess.run(  # noqa: S603, S607
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'ortools': ortools.__version__,
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def run(args):
+    """Run the suite, print one line per case and write the results file.
+
+    Args:
+        args: Parsed command line arguments.
+
+    Returns:
+        The exit status.
+    """
+    cases = [
+        (str(path.relative_to(DATA_FOLDER.parent)), detect_problem(read_json(path)), path)
+        for path in sorted(DATA_FOLDER.glob('*.json'))
+    ]
+    records = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for problem in args.problems:
+            for seed, size in enumerate(args.sizes):
+                path = Path(tmp_dir) / '{0}{1}.json'.format(problem, size)
+                with open(path, 'w') as json_file:
+                    json.dump(generate(problem, size, seed), json_file)
+                cases.append(('{0}/generated-{1}'.format(problem, size), problem, path))
+        for name, problem, path in cases:
+            if problem not in args.problems:
+                continue
+            record = measure(name, problem, path, args.time_limit)
+            records.append(record)
+            print('{0:34} {1:>6} nodes  load {2:7.3f}s  build {3:7.3f}s  solve {4:7.3f}s  peak {5:>8} kB  objective {6}'.format(
+                name,
+                record['size'],
+                record['phases'].get('load', {}).get('elapsed', 0),
+                sum(record['phases'].get(phase, {}).get('elapsed', 0) for phase in BUILD_PHASES),
+                record['phases'].get('solve', {}).get('elapsed', 0),
+                max((phase['peak_rss'] or 0 for phase in record['phases'].values()), default=0),
+                record.get('objective', record.get('error')),
+            ))
+    with open(args.output, 'w') as json_file:
+        json.dump({'environment': environment(), 'time_limit': args.time_limit, 'cases': records}, json_file, indent=2)
+    print('Results written to {0}'.format(args.output))
+    return 0
+
+
+def compare(args):
+    """Compare two result files and report the regressions.
+
+    A case regresses when its total time grows by more than the time tolerance
+    (and by more than the noise floor), or when its objective grows by more
+    than the objective tolerance or is lost.
+
+    Args:
+        args: Parsed command line arguments.
+
+    Returns:
+        The exit status, 1 if a case regressed.
+    """
+    with open(args.baseline) as json_file:
+        baseline = {record['name']: record for record in json.load(json_file)['cases']}
+    with open(args.results) as json_file:
+        results = json.load(json_file)['cases']
+    regressions = 0
+    for record in results:
+        reference = baseline.get(record['name'])
+        if reference is None:
+            print('{0:34} new case'.format(record['name']))
+            continue
+        slower = (
+            record['total'] > reference['total'] * (1 + args.time_tolerance)
+            and record['total'] - reference['total'] > args.noise_floor
+        )
+        objective, reference_objective = record.get('objective'), reference.get('objective')
+        worse = reference_objective is not None and (
+            objective is None or objective > reference_objective * (1 + args.objective_tolerance)
+        )
+        flags = ' '.join(flag for flag, raised in (('SLOWER', slower), ('WORSE', worse)) if raised)
+        regressions += bool(flags)
+        print('{0:34} time {1:7.3f}s -> {2:7.3f}s  objective {3} -> {4}  {5}'.format(
+            record['name'], reference['total'], record['total'], reference_objective, objective, flags,
+        ))
+    print('{0} regression(s)'.format(regressions))
+    return 1 if regressions else 0
+
+
+def main():
+    """Parse the command line and run the requested command."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+    run_parser = commands.add_parser('run', help='Run the suite and write the results.')
+    run_parser.add_argument('--sizes', type=int, nargs='+', default=[50, 100, 200, 400])
+    run_parser.add_argument('--problems', nargs='+', choices=sorted(SOLVERS), default=sorted(SOLVERS))
+    run_parser.add_argument('--time-limit', type=float, default=5)
+    run_parser.add_argument('--output', default='benchmark_results.json')
+    run_parser.set_defaults(handler=run)
+    compare_parser = commands.add_parser('compare', help='Compare two result files.')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('results')
+    compare_parser.add_argument('--time-tolerance', type=float, default=0.2)
+    compare_parser.add_argument('--objective-tolerance', type=float, default=0)
+    compare_parser.add_argument('--noise-floor', type=float, default=0.05, help='Slowdowns in seconds always ignored.')
+    compare_parser.set_defaults(handler=compare)
+    args = parser.parse_args()
+    sys.exit(args.handler(args))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""Batch solve of many instances across a pool of worker processes."""
+
+import contextlib
+import glob
+import io
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from ort_optimization.instance import detect_problem, read_json
+from ort_optimization.solvers import get_solver
+
+
+def find_instances(source):
+    """List the instance files of a directory or matching a glob pattern.
+
+    Args:
+        source: Directory containing JSON instances, or a glob pattern.
+
+    Returns:
+        The sorted list of instance paths.
+    """
+    if Path(source).is_dir():
+        return sorted(str(path) for path in Path(source).glob('*.json'))
+    return sorted(glob.glob(source))
+
+
+def solve_instance(path, problem=None, options=None):
+    """Solve a single instance and describe the outcome as a record.
+
+    Any error, including the exit requested on invalid JSON, is reported in the
+    record instead of being raised, so one instance never stops the batch.
+
+    Args:
+        path: Path of the instance.
+        problem: Problem name, detected from the instance keys when None.
+        options: Search options overriding the defaults of the solver.
+
+    Returns:
+        A JSON serializable record of the outcome, with the result of a successful solve.
+    """
+    record = {'path': path, 'problem': problem}
+    start = time.perf_counter()
+    output = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(output):
+            if record['problem'] is None:
+                record['problem'] = detect_problem(read_json(path))
+            result = get_solver(record['problem']).solve(path, options)
+    except (Exception, SystemExit) as er:  # noqa: B902
+        record['status'] = 'error'
+        record['error'] = ''.join(traceback.format_exception_only(type(er), er)).strip()
+    else:
+        record['status'] = 'ok'
+        record['result'] = result.to_dict() if result else None
+    record['elapsed'] = time.perf_counter() - start
+    record['output'] = output.getvalue()
+    return record
+
+
+def run_batch(paths, problem=None, workers=None):
+    """Solve instances in parallel, yielding each record as soon as it is ready.
+
+    Args:
+        paths: Paths of the instances.
+        problem: Problem name, detected per instance when None.
+        workers: Number of worker processes, defaults to the number of CPUs.
+
+    Yields:
+        One record per instance, in completion order.
+    """
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(solve_instance, path, problem): path for path in paths}
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as er:  # a worker process died
+                yield {
+                    'path': futures[future],
+                    'problem': problem,
+                    'status': 'error',
+                    'error': repr(er),
+                }
@@ -0,0 +1,248 @@
+"""Lower bounds of the objective of an instance.
+
+Every solver bounds its instance while building its model. The bound is
+reported with the result, with the optimality gap of the solution, and the
+search stops once the gap of its best solution reaches the target gap of the
+search options, see ort_optimization.search.
+
+* TSP: Held-Karp bound, the weight of the best 1-tree (a spanning tree of
+  the stops, plus the two cheapest edges of the depot) under node penalties
+  found by subgradient ascent. It is usually within a few percent of the
+  optimal tour.
+* VRP families: assignment bound, every stop having one successor and one
+  predecessor, with one copy of the depot per vehicle, a copy left alone
+  being an unused vehicle; subtours are allowed. The arcs the time windows
+  make impossible are excluded (twcp, twdcp), and the CVRP uses at least the
+  vehicles needed to hold the total demand. The span cost of the VRP and the
+  PDP is bounded with the longest shortest round trip to a stop, the
+  matrices not always obeying the triangle inequality, and with the average
+  route of the assignment bound. The assignment bound ignores the capacities
+  beyond the number of vehicles, the pickup and delivery pairs and the docks,
+  so it is much looser than the Held-Karp one.
+
+The bounds hold for the asymmetric matrices too, the Held-Karp one using the
+cheaper direction of every edge. Instances of more than BOUND_MAX_NODES nodes
+get no bound, their dense working matrices growing with the square of the
+size. scipy.optimize is imported when a first assignment bound is computed.
+"""
+
+import math
+import time
+
+import numpy as np
+
+from ort_optimization.timewindows import tighten_windows
+
+BOUND_MAX_NODES = 1000
+# Subgradient steps of the Held-Karp bound, and their time limit in seconds.
+HELD_KARP_ITERATIONS = 200
+HELD_KARP_TIME_LIMIT = 0.5
+# Steps without improvement before the subgradient step is halved.
+HELD_KARP_PATIENCE = 5
+# Tolerance of the rounding of the fractional bounds up to integers.
+ROUNDING_TOLERANCE = 1e-6
+
+
+def one_tree(weights, depot):
+    """Return the cheapest 1-tree of a symmetric weight matrix.
+
+    Args:
+        weights: Symmetric weight matrix.
+        depot: Node joined to the spanning tree of the others by its two cheapest edges.
+
+    Returns:
+        The weight of the 1-tree and the degree of every node in it.
+    """
+    others = np.delete(np.arange(len(weights)), depot)
+    tree_weights = weights[np.ix_(others, others)]
+    degrees = np.zeros(len(weights), dtype=np.int64)
+    in_tree = np.zeros(len(others), dtype=bool)
+    in_tree[0] = True
+    closest = tree_weights[0].copy()
+    parents = np.zeros(len(others), dtype=np.int64)
+    total = 0.0
+    # Prim's algorithm, one vectorized update of the closest tree node per added node.
+    for _ in range(len(others) - 1):
+        closest[in_tree] = np.inf
+        node = int(np.argmin(closest))
+        total += closest[node]
+        degrees[others[node]] += 1
+        degrees[others[parents[node]]] += 1
+        in_tree[node] = True
+        closer = tree_weights[node] < closest
+        closest[closer] = tree_weights[node][closer]
+        parents[closer] = node
+    depot_weights = weights[depot, others]
+    cheapest = np.argpartition(depot_weights, 1)[:2]
+    total += depot_weights[cheapest].sum()
+    degrees[depot] = 2
+    degrees[others[cheapest]] += 1
+    return total, degrees
+
+
+def nearest_neighbor_tour(weights, depot):
+    """Return the weight of the nearest neighbor tour from the depot.
+
+    Args:
+        weights: Weight matrix.
+        depot: Start of the tour.
+
+    Returns:
+        The weight of the tour.
+    """
+    unvisited = np.ones(len(weights), dtype=bool)
+    unvisited[depot] = False
+    node = depot
+    total = 0.0
+    for _ in range(len(weights) - 1):
+        candidates = np.where(unvisited, weights[node], np.inf)
+        next_node = int(np.argmin(candidates))
+        total += candidates[next_node]
+        unvisited[next_node] = False
+        node = next_node
+    return total + weights[node, depot]
+
+
+def held_karp_bound(matrix, depot, iterations=HELD_KARP_ITERATIONS, time_limit=HELD_KARP_TIME_LIMIT):
+    """Return the Held-Karp lower bound of the tour of a TSP.
+
+    Args:
+        matrix: Square cost matrix indexed by node.
+        depot: Depot node.
+        iterations: Maximum number of subgradient steps.
+        time_limit: Time limit of the subgradient steps in seconds.
+
+    Returns:
+        The lower bound.
+    """
+    costs = np.asarray(matrix, dtype=np.float64)
+    costs = np.minimum(costs, costs.T)
+    upper = nearest_neighbor_tour(costs, depot)
+    penalties = np.zeros(len(costs))
+    best = -np.inf
+    step_factor = 2.0
+    stalled = 0
+    deadline = time.perf_counter() + time_limit
+    for _ in range(iterations):
+        weight, degrees = one_tree(costs + penalties[:, None] + penalties[None, :], depot)
+        bound = weight - 2 * penalties.sum()
+        if bound > best:
+            best = bound
+            stalled = 0
+        else:
+            stalled += 1
+            if stalled >= HELD_KARP_PATIENCE:
+                step_factor /= 2
+                stalled = 0
+        subgradient = degrees - 2
+        norm = int((subgradient * subgradient).sum())
+        if not norm or best >= upper or time.perf_counter() > deadline:
+            break  # a tour, optimal, or out of time
+        penalties += step_factor * (upper - bound) / norm * subgradient
+    return min(math.ceil(best - ROUNDING_TOLERANCE), math.floor(upper))
+
+
+def assignment_bound(matrix, depot, num_vehicles, possible=None, min_vehicles=0):
+    """Return the assignment lower bound of the arc costs of the routes.
+
+    Args:
+        matrix: Square cost matrix indexed by node.
+        depot: Depot node.
+        num_vehicles: Number of vehicles.
+        possible: Boolean matrix of the arcs that may be used, all when None.
+        min_vehicles: Number of vehicles that must leave the depot.
+
+    Returns:
+        The lower bound, or None when no assignment uses only possible arcs.
+    """
+    from scipy.optimize import linear_sum_assignment  # noqa: WPS433
+
+    costs = np.asarray(matrix, dtype=np.float64)
+    if possible is not None:
+        costs = np.where(possible, costs, np.inf)
+    stops = np.delete(np.arange(len(costs)), depot)
+    stop_count = len(stops)
+    # The stops, then one copy of the depot per vehicle.
+    assignment = np.full((stop_count + num_vehicles, stop_count + num_vehicles), np.inf)
+    assignment[:stop_count, :stop_count] = costs[np.ix_(stops, stops)]
+    np.fill_diagonal(assignment[:stop_count, :stop_count], np.inf)
+    assignment[:stop_count, stop_count:] = costs[stops, depot][:, None]
+    assignment[stop_count:, :stop_count] = costs[depot, stops][None, :]
+    unused = np.arange(min_vehicles, num_vehicles) + stop_count
+    assignment[unused, unused] = 0
+    try:
+        rows, columns = linear_sum_assignment(assignment)
+    except ValueError:  # every assignment uses an impossible arc
+        return None
+    return math.ceil(assignment[rows, columns].sum() - ROUNDING_TOLERANCE)
+
+
+def shortest_paths(costs, source):
+    """Return the length of the shortest path from a node to every node.
+
+    The paths are relaxed with every arc at once, Bellman-Ford style, until
+    they no longer shorten.
+
+    Args:
+        costs: Square cost matrix as a NumPy array, without negative cycles.
+        source: Start node of the paths.
+
+    Returns:
+        The length of the shortest path to every node.
+    """
+    lengths = costs[source].copy()
+    lengths[source] = 0
+    for _ in range(len(costs) - 1):
+        relaxed = np.minimum(lengths, (lengths[:, None] + costs).min(axis=0))
+        if np.array_equal(relaxed, lengths):
+            break
+        lengths = relaxed
+    return lengths
+
+
+def vehicles_needed(demands, capacities):
+    """Return the fewest vehicles whose capacities hold the total demand.
+
+    Args:
+        demands: Demand of every node.
+        capacities: Capacity of every vehicle.
+
+    Returns:
+        The number of vehicles, all of them when even they cannot hold the demand.
+    """
+    largest_first = np.cumsum(np.sort(np.asarray(capacities, dtype=np.int64))[::-1])
+    return min(int(np.searchsorted(largest_first, int(np.sum(demands)))) + 1, len(largest_first))
+
+
+def lower_bound(problem, input_data, span_cost_coefficient=0):
+    """Return a lower bound of the objective of an instance.
+
+    Args:
+        problem: Problem name, e.g. vrp.
+        input_data: Instance data, with its ``maximum_time`` for the time window problems.
+        span_cost_coefficient: Global span cost coefficient of the route lengths.
+
+    Returns:
+        The lower bound, or None when the instance is too large or has no
+        solution using only the possible arcs.
+    """
+    matrix = input_data['time_matrix' if problem in {'twcp', 'twdcp'} else 'distance_matrix']
+    depot = input_data['depot']
+    num_vehicles = input_data['num_vehicles']
+    if len(matrix) > BOUND_MAX_NODES or len(matrix) < 2:
+        return None
+    if problem == 'tsp' and num_vehicles == 1 and len(matrix) > 2:
+        return held_karp_bound(matrix, depot)
+    possible = None
+    if problem in {'twcp', 'twdcp'}:
+        _, _, possible = tighten_windows(matrix, input_data['time_windows'], depot, input_data['maximum_time'])
+    min_vehicles = 0
+    if problem == 'cvrp':
+        min_vehicles = vehicles_needed(input_data['demands'], input_data['vehicle_capacities'])
+    bound = assignment_bound(matrix, depot, num_vehicles, possible, min_vehicles)
+    if bound is None or not span_cost_coefficient:
+        return bound
+    # A route may reach a stop and return through other stops, more cheaply than directly.
+    costs = np.asarray(matrix, dtype=np.int64)
+    longest_round_trip = int((shortest_paths(costs, depot) + shortest_paths(costs.T, depot)).max())
+    return bound + span_cost_coefficient * max(longest_round_trip, math.ceil(bound / num_vehicles))
@@ -0,0 +1,152 @@
+"""Content-addressed cache of solve results.
+
+Results are stored on disk under a canonical hash of the problem type, the
+instance data and the search options, so resubmitting the same instance (with
+its keys reordered, or converted to the binary format) skips the search. The
+store is bounded in size and evicts the least recently used results first.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from ort_optimization.instance import MATRIX_KEYS, load_instance
+from ort_optimization.result import SolveResult
+from ort_optimization.solvers import get_solver
+
+# Search options that do not change the solution and stay out of the key.
+UNHASHED_OPTIONS = ('on_solution', 'metrics')
+
+
+def instance_hash(problem, input_data, options=None):
+    """Return the canonical hash of a solve request.
+
+    Args:
+        problem: Problem name.
+        input_data: Instance data, from a JSON or a binary instance.
+        options: Search options of the request.
+
+    Returns:
+        The hexadecimal SHA-256 digest.
+    """
+    digest = hashlib.sha256(problem.encode())
+    for key in sorted(input_data):
+        digest.update(json.dumps(key).encode())
+        if key in MATRIX_KEYS:
+            matrix = np.ascontiguousarray(input_data[key], dtype=np.int64)
+            digest.update(json.dumps(matrix.shape).encode())
+            digest.update(matrix.tobytes())
+        else:
+            digest.update(json.dumps(input_data[key], sort_keys=True).encode())
+    if options is not None:
+        option_values = {
+            name: option_value
+            for name, option_value in vars(options).items()
+            if name not in UNHASHED_OPTIONS and option_value is not None
+        }
+        digest.update(json.dumps(option_values, sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+def touch(path):
+    """Mark a stored result as used now, with a finer clock than the file system one.
+
+    Args:
+        path: Path of the stored result.
+    """
+    now = time.time_ns()
+    os.utime(path, ns=(now, now))
+
+
+class SolutionCache(object):
+    """On-disk store of solve results with size-bounded LRU eviction."""
+
+    def __init__(self, folder, max_bytes=100 * 1024 * 1024, bypass=False):
+        """Init the cache.
+
+        Args:
+            folder: Folder of the store, created if missing.
+            max_bytes: Maximum total size of the stored results.
+            bypass: Always solve and never read or write the store.
+        """
+        self.folder = Path(folder)
+        self.folder.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.bypass = bypass
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Return the stored result of a key and mark it as recently used.
+
+        Args:
+            key: Hash of the solve request.
+
+        Returns:
+            The stored result, or None.
+        """
+        path = self.folder / '{0}.json'.format(key)
+        try:
+            with open(path) as json_file:
+                result = SolveResult.from_dict(json.load(json_file))
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        touch(path)
+        self.hits += 1
+        return result
+
+    def put(self, key, result):
+        """Store a result, then evict the least recently used ones over the size bound.
+
+        Args:
+            key: Hash of the solve request.
+            result: Result to store.
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=self.folder, suffix='.tmp')
+        with os.fdopen(fd, 'w') as json_file:
+            json.dump(result.to_dict(), json_file)
+        path = self.folder / '{0}.json'.format(key)
+        os.replace(tmp_path, path)
+        touch(path)
+        self.evict()
+
+    def evict(self):
+        """Delete the least recently used results until the store fits its bound."""
+        entries = sorted(
+            (entry.stat().st_mtime_ns, entry.stat().st_size, entry)
+            for entry in self.folder.glob('*.json')
+        )
+        total_bytes = sum(size for _, size, _ in entries)
+        for _, size, entry in entries:
+            if total_bytes <= self.max_bytes:
+                break
+            entry.unlink()
+            total_bytes -= size
+
+    def solve(self, problem, path, options=None):
+        """Return the cached result of a request, solving and storing it on a miss.
+
+        Args:
+            problem: Problem name.
+            path: Path of the instance.
+            options: Search options of the request.
+
+        Returns:
+            The result, or None when no solution was found.
+        """
+        if self.bypass:
+            return get_solver(problem).solve(path, options)
+        key = instance_hash(problem, load_instance(path), options)
+        result = self.get(key)
+        if result is not None:
+            return result
+        result = get_solver(problem).solve(path, options)
+        if result is not None:
+            self.put(key, result)
+        return result
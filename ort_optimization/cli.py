@@ -1,12 +1,198 @@
-"""Console script for ort_optimization."""
+"""Console script for ort_optimization.
+
+Only click and the light registries are imported here: the modules of a
+command, and through them OR-Tools, NumPy and SciPy, are imported when the
+command runs, so --help, --version and usage errors return at once. The
+choices below are those of modules imported lazily; the tests keep them in
+sync.
+"""
+import contextlib
+import io
+import json
+import sys
+
 import click
 
-from ort_optimization.cvrp import CVRP
-from ort_optimization.pdp import PDP
-from ort_optimization.tsp import TSP
-from ort_optimization.twcp import TWCP
-from ort_optimization.twdcp import TWDCP
-from ort_optimization.vrp import VRP
+from ort_optimization.metrics import Metrics, profiled
+from ort_optimization.solvers import SOLVERS, get_solver
+
+DECOMPOSED_PROBLEMS = ('vrp', 'cvrp')  # ort_optimization.decompose.PROBLEMS
+OUTPUT_FORMATS = ('json', 'binary', 'locations')  # ort_optimization.generator.OUTPUT_FORMATS
+MAX_TIME_LIMIT = 60  # ort_optimization.server.MAX_TIME_LIMIT
+SERVER_TIME_LIMIT = 10  # ort_optimization.server.DEFAULT_TIME_LIMIT
+DOCK_SCHEDULING = ('joint', 'two_stage')  # ort_optimization.twdcp.DOCK_SCHEDULING
+STREAM_INTERVAL = 5  # ort_optimization.rolling.DEFAULT_INTERVAL
+TSP_ENGINES = ('auto', 'local', 'routing')  # ort_optimization.tsp.ENGINES
+
+
+def search_options(command):
+    """Add the search options shared by the solver commands.
+
+    Args:
+        command: Click command callback.
+
+    Returns:
+        The callback decorated with the search options.
+    """
+    decorators = (
+        click.option('--first-solution-strategy', help='FirstSolutionStrategy name, e.g. SAVINGS.'),
+        click.option('--metaheuristic', help='LocalSearchMetaheuristic name, e.g. GUIDED_LOCAL_SEARCH.'),
+        click.option('--time-limit', type=float, help='Time limit of the search in seconds.'),
+        click.option('--solution-limit', type=int, help='Maximum number of solutions explored.'),
+        click.option('--lns-time-limit', type=float, help='Time limit of each LNS sub-problem in seconds.'),
+        click.option(
+            '--target-gap', type=click.FloatRange(min=0),
+            help='Stop once the solution is within this fraction of its objective from the lower bound, e.g. 0.05.',
+        ),
+        click.option('--stream', is_flag=True, help='Print every improving objective on stderr as it is found.'),
+    )
+    for decorator in reversed(decorators):
+        command = decorator(command)
+    return command
+
+
+def stream_solution(objective, elapsed):
+    """Print an improving solution on stderr as a JSON record.
+
+    Args:
+        objective: Objective value of the solution.
+        elapsed: Seconds since the start of the search.
+    """
+    click.echo(json.dumps({'objective': objective, 'elapsed': round(elapsed, 6)}), err=True)
+
+
+def make_search_options(
+    first_solution_strategy,
+    metaheuristic,
+    time_limit,
+    solution_limit,
+    lns_time_limit,
+    target_gap,
+    stream,
+    initial_routes=None,
+    neighbors=None,
+    window_pruning=None,
+    dock_scheduling=None,
+    engine=None,
+):
+    """Build the search options from the command line values.
+
+    Args:
+        first_solution_strategy: FirstSolutionStrategy name.
+        metaheuristic: LocalSearchMetaheuristic name.
+        time_limit: Time limit of the search in seconds.
+        solution_limit: Maximum number of solutions explored.
+        lns_time_limit: Time limit of each LNS sub-problem in seconds.
+        target_gap: Optimality gap stopping the search.
+        stream: Whether to print every improving objective.
+        initial_routes: Path of a JSON route plan seeding the search.
+        neighbors: Number of nearest neighbors kept per stop.
+        window_pruning: False to skip the time window preprocessing.
+        dock_scheduling: joint or two_stage dock scheduling of TWDCP.
+        engine: auto, local or routing engine of TSP.
+
+    Returns:
+        The search options.
+    """
+    from ort_optimization.search import SearchOptions  # noqa: WPS433
+    from ort_optimization.warmstart import load_routes  # noqa: WPS433
+
+    return SearchOptions(
+        first_solution_strategy=first_solution_strategy,
+        local_search_metaheuristic=metaheuristic,
+        time_limit=time_limit,
+        solution_limit=solution_limit,
+        lns_time_limit=lns_time_limit,
+        target_gap=target_gap,
+        on_solution=stream_solution if stream else None,
+        initial_routes=load_routes(initial_routes) if initial_routes else None,
+        neighbors=neighbors,
+        window_pruning=window_pruning,
+        dock_scheduling=dock_scheduling,
+        engine=engine,
+    )
+
+
+def cache_options(command):
+    """Add the solution cache options shared by the solver commands.
+
+    Args:
+        command: Click command callback.
+
+    Returns:
+        The callback decorated with the cache options.
+    """
+    command = click.option('--no-cache', is_flag=True, help='Always solve, without reading or writing the cache.')(command)
+    return click.option('--cache-dir', type=click.Path(file_okay=False), help='Folder of the solution cache.')(command)
+
+
+def json_option(command):
+    """Add the JSON output option shared by the solver commands.
+
+    Args:
+        command: Click command callback.
+
+    Returns:
+        The callback decorated with the JSON output option.
+    """
+    return click.option('--json', 'json_output', is_flag=True, help='Print the result as JSON instead of the solution.')(command)
+
+
+def profile_options(command):
+    """Add the instrumentation options shared by the solver commands.
+
+    Args:
+        command: Click command callback.
+
+    Returns:
+        The callback decorated with the instrumentation options.
+    """
+    command = click.option('--profile', type=click.Path(dir_okay=False), help='Write a cProfile pstats dump of the solve.')(command)
+    return click.option(
+        '--metrics', 'metrics_output', is_flag=True,
+        help='Print the phase timings, counters and search statistics on stderr as JSON.',
+    )(command)
+
+
+def solve_command(problem, file_path, cache_dir, no_cache, json_output, search, metrics_output=False, profile=None):
+    """Solve an instance for a solver command, going through the cache if any.
+
+    Cached results cannot be printed by print_solution, so a cache hit is
+    printed as a JSON record, as is every result with json_output.
+
+    Args:
+        problem: Problem name.
+        file_path: Path to the data input.
+        cache_dir: Folder of the solution cache, no cache when None.
+        no_cache: Bypass the solution cache.
+        json_output: Print the result as JSON instead of the solution.
+        search: Command line values of the search options.
+        metrics_output: Print the metrics of the solve on stderr.
+        profile: Path of the pstats file to write, no profiling when None.
+
+    Returns:
+        The result, or None when no solution was found.
+    """
+    from ort_optimization.cache import SolutionCache  # noqa: WPS433
+
+    options = make_search_options(**search)
+    if metrics_output:
+        options.metrics = Metrics()
+    cache = SolutionCache(cache_dir, bypass=no_cache) if cache_dir is not None else None
+    with contextlib.redirect_stdout(io.StringIO()) if json_output else contextlib.nullcontext(), profiled(profile):
+        if cache is None:
+            result = get_solver(problem).solve(file_path, options)
+        else:
+            result = cache.solve(problem, file_path, options)
+    if json_output or (cache is not None and cache.hits):
+        click.echo(result.to_json() if result else json.dumps({'problem': problem, 'objective': None}))
+    elif result is not None and result.lower_bound is not None:
+        click.echo('Lower bound: {0}, gap: {1:.2%}'.format(result.lower_bound, result.gap))
+    if cache is not None:
+        click.echo('cache hits: {0}, misses: {1}'.format(cache.hits, cache.misses), err=True)
+    if metrics_output:
+        click.echo(json.dumps(options.metrics.to_dict()), err=True)
+    return result
 
 
 @click.group()
@@ -16,86 +202,410 @@ def main():
     pass  # noqa: WPS420
 
 
+@main.command()
+@click.argument('source')
+@click.option('--problem', type=click.Choice(sorted(SOLVERS)), help='Problem type, detected from the JSON keys if omitted.')
+@click.option('--workers', type=int, help='Number of worker processes, defaults to the number of CPUs.')
+def batch(source, problem, workers):
+    """Solve every instance of a directory or glob pattern in parallel.
+
+    One JSON record per instance is printed as soon as it is solved.
+
+    Args:
+        source: Directory of JSON instances, or a glob pattern.
+        problem: Problem type of all the instances.
+        workers: Number of worker processes.
+    """
+    from ort_optimization.batch import find_instances, run_batch  # noqa: WPS433
+
+    for record in run_batch(find_instances(source), problem, workers):
+        click.echo(json.dumps(record))
+
+
 @main.command()
 @click.argument('file_path')
-def cvrp(file_path):
+@search_options
+@cache_options
+@click.option('--initial-routes', type=click.Path(exists=True), help='JSON route plan seeding the search.')
+@json_option
+@profile_options
+def cvrp(file_path, cache_dir, no_cache, json_output, metrics_output, profile, **search):
     """Solve the Vehicles Routing Problem (VRP).
 
     Args:
         file_path: Path to the data input.
+        cache_dir: Folder of the solution cache, no cache when None.
+        no_cache: Bypass the solution cache.
+        json_output: Print the result as JSON instead of the solution.
+        metrics_output: Print the metrics of the solve on stderr.
+        profile: Path of the pstats file to write.
+        search: Search options, see search_options.
 
     Returns:
         Routes for the vehicles.
     """
-    return CVRP.solve(file_path)
+    return solve_command('cvrp', file_path, cache_dir, no_cache, json_output, search, metrics_output, profile)
 
 
 @main.command()
 @click.argument('file_path')
-def pdp(file_path):
+@click.option('--problem', type=click.Choice(DECOMPOSED_PROBLEMS), help='Problem type, detected from the JSON keys if omitted.')
+@click.option('--clusters', type=int, help='Number of clusters, defaults to one per 250 stops.')
+@click.option('--workers', type=int, help='Number of worker processes, defaults to the number of CPUs.')
+@click.option('--time-limit', type=float, help='Time limit of the search of each cluster in seconds.')
+@click.option('--improve-time', type=float, help='Time limit of the re-solve of each pair of neighboring clusters.')
+def decompose(file_path, problem, clusters, workers, time_limit, improve_time):
+    """Solve a large VRP or CVRP cluster by cluster on worker processes.
+
+    Args:
+        file_path: Path to the data input.
+        problem: Problem type of the instance.
+        clusters: Number of clusters.
+        workers: Number of worker processes.
+        time_limit: Time limit of the search of each cluster.
+        improve_time: Time limit of the improvement pass of each pair of clusters.
+    """
+    from ort_optimization.decompose import solve_decomposed  # noqa: WPS433
+    from ort_optimization.instance import detect_problem, read_json  # noqa: WPS433
+    from ort_optimization.search import SearchOptions  # noqa: WPS433
+
+    problem = problem or detect_problem(read_json(file_path))
+    try:
+        result = solve_decomposed(
+            problem, file_path, clusters, workers, SearchOptions(time_limit=time_limit), improve_time,
+        )
+    except ValueError as er:
+        raise click.ClickException(str(er))
+    click.echo(json.dumps(result.to_dict() if result else {'problem': problem, 'objective': None}))
+
+
+@main.command('generate')
+@click.argument('problem', type=click.Choice(sorted(SOLVERS)))
+@click.argument('size', type=click.IntRange(min=2))
+@click.argument('output_path')
+@click.option('--seed', type=int, default=0, show_default=True, help='Seed of the random generator.')
+@click.option(
+    '--format', 'output_format', type=click.Choice(OUTPUT_FORMATS), default='json', show_default=True,
+    help='JSON with the matrix, JSON header plus .npy matrix, or locations only.',
+)
+def generate_instance(problem, size, output_path, seed, output_format):
+    """Generate a feasible synthetic instance of a problem.
+
+    Args:
+        problem: Problem type of the instance.
+        size: Number of nodes, the depot included.
+        output_path: Path of the JSON instance or header to write.
+        seed: Seed of the random generator.
+        output_format: json, binary or locations.
+    """
+    from ort_optimization.generator import generate, write_instance  # noqa: WPS433
+
+    write_instance(generate(problem, size, seed), output_path, output_format)
+
+
+@main.command()
+@click.argument('file_path')
+@search_options
+@cache_options
+@json_option
+@profile_options
+def pdp(file_path, cache_dir, no_cache, json_output, metrics_output, profile, **search):
     """Solve the Vehicles Routing Problem (VRP).
 
     Args:
         file_path: Path to the data input.
+        cache_dir: Folder of the solution cache, no cache when None.
+        no_cache: Bypass the solution cache.
+        json_output: Print the result as JSON instead of the solution.
+        metrics_output: Print the metrics of the solve on stderr.
+        profile: Path of the pstats file to write.
+        search: Search options, see search_options.
 
     Returns:
         Routes for the vehicles.
     """
-    return PDP.solve(file_path)
+    return solve_command('pdp', file_path, cache_dir, no_cache, json_output, search, metrics_output, profile)
 
 
 @main.command()
-# @click.option('--count', default=1, help='number of greetings')
 @click.argument('file_path')
-def tsp(file_path):
+@click.option('--problem', type=click.Choice(sorted(SOLVERS)), help='Problem type, detected from the JSON keys if omitted.')
+@click.option('--time-limit', type=float, default=10, show_default=True, help='Shared time limit in seconds.')
+@click.option('--workers', type=int, help='Number of configurations raced, defaults to the number of CPUs.')
+@click.option('--target-objective', type=int, help='Stop as soon as a configuration reaches this objective.')
+def portfolio(file_path, problem, time_limit, workers, target_objective):
+    """Race several search strategies on worker processes and keep the best.
+
+    Args:
+        file_path: Path to the data input.
+        problem: Problem type of the instance.
+        time_limit: Shared time limit in seconds.
+        workers: Number of configurations raced.
+        target_objective: Objective at which the race stops.
+    """
+    from ort_optimization.instance import detect_problem, read_json  # noqa: WPS433
+    from ort_optimization.portfolio import solve_portfolio  # noqa: WPS433
+
+    problem = problem or detect_problem(read_json(file_path))
+    best, outcomes = solve_portfolio(problem, file_path, time_limit, workers=workers, target_objective=target_objective)
+    record = best.to_dict() if best else {'problem': problem, 'objective': None}
+    record['configurations'] = outcomes
+    click.echo(json.dumps(record))
+
+
+@main.command()
+@click.option('--host', default='127.0.0.1', show_default=True, help='Interface to listen on.')
+@click.option('--port', type=int, default=8000, show_default=True, help='Port to listen on.')
+@click.option('--workers', type=int, help='Number of worker processes, defaults to the number of CPUs.')
+@click.option('--queue-size', type=int, default=8, show_default=True, help='Jobs waiting for a worker before refusing new ones.')
+@click.option('--time-limit', type=float, default=SERVER_TIME_LIMIT, show_default=True, help='Time limit of the jobs not giving one.')
+@click.option('--max-time-limit', type=float, default=MAX_TIME_LIMIT, show_default=True, help='Largest time limit of a job.')
+def serve(host, port, workers, queue_size, time_limit, max_time_limit):
+    """Serve solves over HTTP from a pool of warm worker processes.
+
+    Args:
+        host: Interface to listen on.
+        port: Port to listen on.
+        workers: Number of worker processes.
+        queue_size: Number of jobs waiting for a worker before refusing new ones.
+        time_limit: Time limit of the jobs not giving one.
+        max_time_limit: Largest time limit of a job.
+    """
+    from ort_optimization.server import SolveService, make_server  # noqa: WPS433
+
+    service = SolveService(workers, queue_size, time_limit, max_time_limit)
+    server = make_server(service, host, port)
+    click.echo('Serving on http://{0}:{1} with {2} workers'.format(host, server.server_address[1], service.workers), err=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        click.echo('Stopping', err=True)
+    finally:
+        server.server_close()
+        service.shutdown()
+
+
+@main.command()
+@click.argument('config_path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--socket', 'address', help='Read the events from a local TCP socket, HOST:PORT, instead of stdin.')
+@click.option('--interval', type=click.IntRange(min=1), default=STREAM_INTERVAL, show_default=True, help='Clock time between two re-plans.')
+@click.option('--lookahead', type=int, help='Only plan the orders whose window opens within this clock time.')
+@click.option('--time-limit', type=float, help='Time limit of the search of every re-plan in seconds, 1 by default.')
+@click.option('--metaheuristic', help='LocalSearchMetaheuristic name of every re-plan, e.g. GUIDED_LOCAL_SEARCH.')
+def stream(config_path, address, interval, lookahead, time_limit, metaheuristic):
+    """Plan a stream of JSON order events on a rolling horizon, printing the plan changes as JSON lines.
+
+    Args:
+        config_path: Path of the JSON fleet configuration.
+        address: HOST:PORT of the socket to read the events from, stdin when None.
+        interval: Clock time between two re-plans.
+        lookahead: Clock time within which the planned orders open, every open order when None.
+        time_limit: Time limit of the search of every re-plan in seconds.
+        metaheuristic: LocalSearchMetaheuristic name of every re-plan.
+    """
+    import threading  # noqa: WPS433
+
+    from ort_optimization.rolling import RollingPlanner, make_event_server, run_stream  # noqa: WPS433
+    from ort_optimization.search import SearchOptions  # noqa: WPS433
+
+    with open(config_path) as config_file:
+        config = json.load(config_file)
+    options = SearchOptions(local_search_metaheuristic=metaheuristic, time_limit=time_limit)
+    planner = RollingPlanner(config, interval, lookahead, options)
+    if address is None:
+        run_stream(planner, click.get_text_stream('stdin'))
+        return
+    host, _, port = address.rpartition(':')
+    server = make_event_server(host or '127.0.0.1', int(port))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    click.echo('Reading events on {0}:{1}'.format(*server.server_address), err=True)
+    try:
+        run_stream(planner, iter(server.lines.get, None))
+    except KeyboardInterrupt:
+        planner.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@main.command()
+@click.argument('file_path')
+@search_options
+@cache_options
+@click.option(
+    '--neighbors', type=click.IntRange(min=1),
+    help='Keep only the arcs towards the k nearest neighbors of every stop, in the routing model (not the exact or local engines).',
+)
+@click.option(
+    '--engine', type=click.Choice(TSP_ENGINES),
+    help='Exact up to 16 nodes then routing model (auto, default), 2-opt and Or-opt local search for large tours (local), or routing model.',
+)
+@json_option
+@profile_options
+def tsp(file_path, cache_dir, no_cache, json_output, metrics_output, profile, **search):
     """Solve the Traveling Salesperson Problem (TSP).
 
     Args:
         file_path: Path to the data input.
+        cache_dir: Folder of the solution cache, no cache when None.
+        no_cache: Bypass the solution cache.
+        json_output: Print the result as JSON instead of the solution.
+        metrics_output: Print the metrics of the solve on stderr.
+        profile: Path of the pstats file to write.
+        search: Search options, see search_options.
 
     Returns:
         A Route for the vehicle.
     """
-    return TSP.solve(file_path)
+    return solve_command('tsp', file_path, cache_dir, no_cache, json_output, search, metrics_output, profile)
 
 
 @main.command()
 @click.argument('file_path')
-def twcp(file_path):
+@search_options
+@cache_options
+@click.option(
+    '--window-pruning/--no-window-pruning', default=None,
+    help='Tighten the time windows and remove the arcs they make impossible (default).',
+)
+@json_option
+@profile_options
+def twcp(file_path, cache_dir, no_cache, json_output, metrics_output, profile, **search):
     """Solve the Vehicles Routing Problem (VRP).
 
     Args:
         file_path: Path to the data input.
+        cache_dir: Folder of the solution cache, no cache when None.
+        no_cache: Bypass the solution cache.
+        json_output: Print the result as JSON instead of the solution.
+        metrics_output: Print the metrics of the solve on stderr.
+        profile: Path of the pstats file to write.
+        search: Search options, see search_options.
 
     Returns:
         Routes for the vehicles.
     """
-    return TWCP.solve(file_path)
+    return solve_command('twcp', file_path, cache_dir, no_cache, json_output, search, metrics_output, profile)
 
 
 @main.command()
 @click.argument('file_path')
-def twdcp(file_path):
+@search_options
+@cache_options
+@click.option(
+    '--window-pruning/--no-window-pruning', default=None,
+    help='Tighten the time windows and remove the arcs they make impossible (default).',
+)
+@click.option(
+    '--dock-scheduling', type=click.Choice(DOCK_SCHEDULING),
+    help='Schedule the docks with the routes (joint, default), or route first then fit the docks (two_stage).',
+)
+@json_option
+@profile_options
+def twdcp(file_path, cache_dir, no_cache, json_output, metrics_output, profile, **search):
     """Solve the Vehicles Routing Problem (VRP).
 
     Args:
         file_path: Path to the data input.
+        cache_dir: Folder of the solution cache, no cache when None.
+        no_cache: Bypass the solution cache.
+        json_output: Print the result as JSON instead of the solution.
+        metrics_output: Print the metrics of the solve on stderr.
+        profile: Path of the pstats file to write.
+        search: Search options, see search_options.
 
     Returns:
         Routes for the vehicles.
     """
-    return TWDCP.solve(file_path)
+    return solve_command('twdcp', file_path, cache_dir, no_cache, json_output, search, metrics_output, profile)
+
+
+@main.command()
+@click.argument('file_path')
+@click.argument('plans_path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--problem', type=click.Choice(sorted(SOLVERS)), help='Problem type, detected from the JSON keys if omitted.')
+def validate(file_path, plans_path, problem):
+    """Check and score route plans without solving, one JSON evaluation per plan.
+
+    The plans are results printed with --json, batch records, or lists of
+    routes, one per line; the command fails when a plan is infeasible.
+
+    Args:
+        file_path: Path to the data input.
+        plans_path: Path of the JSON or newline delimited JSON plans.
+        problem: Problem type of the instance.
+    """
+    from ort_optimization.instance import detect_problem, load_instance, read_json  # noqa: WPS433
+    from ort_optimization.validate import evaluate_plans, read_plans  # noqa: WPS433
+
+    problem = problem or detect_problem(read_json(file_path))
+    try:
+        plans = read_plans(plans_path)
+        evaluations = evaluate_plans(
+            problem,
+            load_instance(file_path),
+            [routes for routes, _ in plans],
+            [times for _, times in plans] if all(times is not None for _, times in plans) else None,
+        )
+    except ValueError as er:
+        raise click.ClickException(str(er))
+    for evaluation in evaluations:
+        click.echo(evaluation.to_json())
+    if not all(evaluation.feasible for evaluation in evaluations):
+        sys.exit(1)
 
 
 @main.command()
 @click.argument('file_path')
-def vrp(file_path):
+@search_options
+@cache_options
+@click.option('--initial-routes', type=click.Path(exists=True), help='JSON route plan seeding the search.')
+@click.option('--neighbors', type=click.IntRange(min=1), help='Keep only the arcs towards the k nearest neighbors of every stop.')
+@json_option
+@profile_options
+def vrp(file_path, cache_dir, no_cache, json_output, metrics_output, profile, **search):
     """Solve the Vehicles Routing Problem (VRP).
 
     Args:
         file_path: Path to the data input.
+        cache_dir: Folder of the solution cache, no cache when None.
+        no_cache: Bypass the solution cache.
+        json_output: Print the result as JSON instead of the solution.
+        metrics_output: Print the metrics of the solve on stderr.
+        profile: Path of the pstats file to write.
+        search: Search options, see search_options.
 
     Returns:
         Routes for the vehicles.
     """
-    return VRP.solve(file_path)
+    return solve_command('vrp', file_path, cache_dir, no_cache, json_output, search, metrics_output, profile)
+
+
+@main.command('to-binary')
+@click.argument('json_path')
+@click.argument('header_path')
+def to_binary(json_path, header_path):
+    """Convert a JSON instance into a JSON header plus memory mappable matrices.
+
+    Args:
+        json_path: Path to the JSON instance.
+        header_path: Path to the JSON header to write.
+    """
+    from ort_optimization.instance import json_to_binary  # noqa: WPS433
+
+    json_to_binary(json_path, header_path)
+
+
+@main.command('to-json')
+@click.argument('header_path')
+@click.argument('json_path')
+def to_json(header_path, json_path):
+    """Convert a binary instance back into a JSON instance.
+
+    Args:
+        header_path: Path to the JSON header.
+        json_path: Path to the JSON instance to write.
+    """
+    from ort_optimization.instance import binary_to_json  # noqa: WPS433
+
+    binary_to_json(header_path, json_path)
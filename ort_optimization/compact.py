@@ -0,0 +1,242 @@
+"""Compact in-memory storage of the instance matrices.
+
+A matrix decoded from JSON is a list of lists of Python integers, about 36
+bytes per entry once the list slots and the integer objects are counted.
+pack_matrix stores it in the narrowest of int8, int16, int32 and int64 holding
+all its values, and a symmetric matrix only keeps its upper triangle, diagonal
+included, in a SymmetricMatrix: 1 byte per entry for int16 values.
+
+A SymmetricMatrix answers the indexing the solvers use on the other matrix
+types in constant time per entry: ``matrix[i][j]``, ``matrix[i, j]`` and
+vectorized ``matrix[rows, cols]`` with broadcast integer arrays, e.g. from
+``np.ix_``. Single entries come back as Python integers, so sums of entries
+cannot overflow the narrow dtype. ``tolist`` gives the full rows expected by
+OR-Tools and ``np.asarray`` the dense matrix.
+"""
+
+import numpy as np
+
+PACKED_DTYPES = (np.int8, np.int16, np.int32, np.int64)
+
+
+def packed_dtype(matrix, dtypes=PACKED_DTYPES):
+    """Return the narrowest of the dtypes able to hold the matrix.
+
+    Args:
+        matrix: Integer matrix as a NumPy array.
+        dtypes: Candidate integer dtypes, narrowest first.
+
+    Returns:
+        The NumPy dtype to store the matrix with, the widest candidate when none holds it.
+    """
+    if not matrix.size:
+        return dtypes[0]
+    low, high = matrix.min(), matrix.max()
+    for dtype in dtypes:
+        dtype_info = np.iinfo(dtype)
+        if dtype_info.min <= low and high <= dtype_info.max:
+            return dtype
+    return dtypes[-1]
+
+
+class MatrixRow(object):
+    """Row of a SymmetricMatrix, read one entry at a time without copying the row."""
+
+    def __init__(self, matrix, row):
+        """Init the row.
+
+        Args:
+            matrix: SymmetricMatrix of the row.
+            row: Index of the row.
+        """
+        self.matrix = matrix
+        self.row = row
+
+    def __getitem__(self, col):
+        """Return an entry of the row.
+
+        Args:
+            col: Column of the entry, or an array of columns.
+
+        Returns:
+            The entry as a Python integer, or the array of the entries.
+        """
+        return self.matrix[self.row, col]
+
+    def __len__(self):
+        """Return the number of entries of the row.
+
+        Returns:
+            The size of the matrix.
+        """
+        return len(self.matrix)
+
+    def __iter__(self):
+        """Iterate over the entries of the row.
+
+        Returns:
+            An iterator of Python integers.
+        """
+        return iter(self.matrix.row_values(self.row).tolist())
+
+    def __array__(self, dtype=None, copy=None):  # noqa: WPS125
+        """Return the entries of the row as an array.
+
+        Args:
+            dtype: dtype of the array, the packed dtype when None.
+            copy: Unused, a new array is always built.
+
+        Returns:
+            The row as a NumPy array.
+        """
+        row_values = self.matrix.row_values(self.row)
+        return row_values if dtype is None else row_values.astype(dtype)
+
+
+class SymmetricMatrix(object):
+    """Symmetric square matrix storing only its upper triangle."""
+
+    def __init__(self, upper, size):
+        """Init the matrix from its packed upper triangle.
+
+        Args:
+            upper: Upper triangle, diagonal included, row after row.
+            size: Number of rows of the matrix.
+        """
+        self.upper = upper
+        self.size = size
+        rows = np.arange(size, dtype=np.int64)
+        # Entry (i, j) with i <= j is upper[offsets[i] + j].
+        self.offsets = rows * size - rows * (rows + 1) // 2
+
+    @classmethod
+    def from_dense(cls, matrix, dtype=None):
+        """Pack the upper triangle of a dense symmetric matrix.
+
+        Args:
+            matrix: Square symmetric matrix as a NumPy array.
+            dtype: dtype of the packed entries, the narrowest one when None.
+
+        Returns:
+            The packed matrix.
+        """
+        dtype = dtype or packed_dtype(matrix)
+        size = len(matrix)
+        upper = np.empty(size * (size + 1) // 2, dtype=dtype)
+        start = 0
+        for row in range(size):
+            upper[start:start + size - row] = matrix[row, row:]
+            start += size - row
+        return cls(upper, size)
+
+    @property
+    def shape(self):
+        """Return the shape of the dense matrix.
+
+        Returns:
+            The pair (size, size).
+        """
+        return (self.size, self.size)
+
+    @property
+    def dtype(self):
+        """Return the dtype of the packed entries.
+
+        Returns:
+            The NumPy dtype.
+        """
+        return self.upper.dtype
+
+    @property
+    def nbytes(self):
+        """Return the memory used by the packed entries.
+
+        Returns:
+            The number of bytes.
+        """
+        return self.upper.nbytes
+
+    def __len__(self):
+        """Return the number of rows.
+
+        Returns:
+            The size of the matrix.
+        """
+        return self.size
+
+    def __getitem__(self, key):
+        """Return entries of the matrix.
+
+        Args:
+            key: Row index, giving a MatrixRow, or a (rows, cols) pair of
+                integers or broadcast integer arrays.
+
+        Returns:
+            The entry as a Python integer, the array of the entries, or the row.
+        """
+        if not isinstance(key, tuple):
+            return MatrixRow(self, key)
+        rows, cols = key
+        if np.ndim(rows) == 0 and np.ndim(cols) == 0:
+            low, high = (rows, cols) if rows <= cols else (cols, rows)
+            return int(self.upper[self.offsets[low] + high])
+        rows = np.asarray(rows)
+        cols = np.asarray(cols)
+        return self.upper[self.offsets[np.minimum(rows, cols)] + np.maximum(rows, cols)]
+
+    def row_values(self, row):
+        """Return a row of the matrix.
+
+        Args:
+            row: Index of the row.
+
+        Returns:
+            The row as an array of the packed dtype.
+        """
+        return self[row, np.arange(self.size)]
+
+    def tolist(self):
+        """Return the matrix as nested lists of Python integers, row after row.
+
+        Returns:
+            The list of the rows.
+        """
+        return [self.row_values(row).tolist() for row in range(self.size)]
+
+    def __array__(self, dtype=None, copy=None):  # noqa: WPS125
+        """Return the dense matrix.
+
+        Args:
+            dtype: dtype of the array, the packed dtype when None.
+            copy: Unused, a new array is always built.
+
+        Returns:
+            The dense matrix as a NumPy array.
+        """
+        dense = np.empty(self.shape, dtype=dtype or self.dtype)
+        start = 0
+        for row in range(self.size):
+            dense[row, row:] = self.upper[start:start + self.size - row]
+            dense[row:, row] = dense[row, row:]
+            start += self.size - row
+        return dense
+
+
+def pack_matrix(matrix):
+    """Store a matrix compactly.
+
+    Args:
+        matrix: Matrix as nested lists or as a NumPy array.
+
+    Returns:
+        A SymmetricMatrix for a symmetric square integer matrix, the matrix as
+        an array of the narrowest dtype for other integer matrices, and the
+        matrix unchanged when it holds other values.
+    """
+    dense = np.asarray(matrix)
+    if dense.ndim != 2 or not np.issubdtype(dense.dtype, np.integer):
+        return matrix
+    dtype = packed_dtype(dense)
+    if dense.shape[0] == dense.shape[1] and np.array_equal(dense, dense.T):
+        return SymmetricMatrix.from_dense(dense, dtype)
+    return dense.astype(dtype)
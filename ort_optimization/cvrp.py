@@ -1,9 +1,16 @@
 """Capacited Vehicles Routing Problem (CVRP)."""
 
-import json
-import sys
+from itertools import accumulate
 
-from ortools.constraint_solver import pywrapcp, routing_enums_pb2
+from ortools.constraint_solver import pywrapcp
+
+from ort_optimization.bounds import lower_bound
+from ort_optimization.instance import load_instance
+from ort_optimization.metrics import record_phase
+from ort_optimization.result import extract_solution
+from ort_optimization.search import build_search_parameters, run_search
+from ort_optimization.transit import register_transit_matrix, register_unary_transit_vector
+from ort_optimization.warmstart import hint_routes
 
 
 class CVRP(object):
@@ -21,59 +28,41 @@ class CVRP(object):
 
     def create_data_model(self):
         """Store the data for the problem."""
-        try:
-            with open(self.path_input) as json_file:
-                self.input_data = json.load(json_file)
-        except json.decoder.JSONDecodeError as er:
-            print('JSON VALIDATION FAILED')
-            print(er)
-            sys.exit(1)
-
-    def print_solution(self, manager, routing, solution):
+        self.input_data = load_instance(self.path_input)
+
+    def print_solution(self, result):
         """Print solution on console.
 
         Args:
-            manager: Manager for any NodeIndex <-> variable index conversion.
-            routing: Routing Model
-            solution: Solves the current routing model with the given parameters
+            result: Result extracted from the solution.
         """
-        print(f'Objective: {solution.ObjectiveValue()}')
-        total_distance = 0
-        total_load = 0
-        for vehicle_id in range(self.input_data['num_vehicles']):
-            index = routing.Start(vehicle_id)
-            plan_output = 'Route for vehicle {0}:\n'.format(vehicle_id)
-            route_distance = 0
-            route_load = 0
-            while not routing.IsEnd(index):
-                node_index = manager.IndexToNode(index)
-                route_load += self.input_data['demands'][node_index]
-                plan_output += ' {0} Load({1}) -> '.format(node_index, route_load)
-                previous_index = index
-                index = solution.Value(routing.NextVar(index))
-                route_distance += routing.GetArcCostForVehicle(
-                    previous_index, index, vehicle_id,
-                )
-            plan_output += ' {0} Load({1})\n'.format(
-                manager.IndexToNode(index), route_load,
-            )
-            plan_output += 'Distance of the route: {0}m\n'.format(route_distance)
-            plan_output += 'Load of the route: {0}\n'.format(route_load)
+        print(f'Objective: {result.objective}')
+        for vehicle_id, route in enumerate(result.routes):
+            route_loads = accumulate(self.input_data['demands'][node] for node in route[:-1])
+            plan_output = ''.join((
+                'Route for vehicle {0}:\n'.format(vehicle_id),
+                ''.join(' {0} Load({1}) -> '.format(node, load) for node, load in zip(route, route_loads)),
+                ' {0} Load({1})\n'.format(route[-1], result.loads[vehicle_id]),
+                'Distance of the route: {0}m\n'.format(result.costs[vehicle_id]),
+                'Load of the route: {0}\n'.format(result.loads[vehicle_id]),
+            ))
             print(plan_output)
-            total_distance += route_distance
-            total_load += route_load
-        print('Total distance of all routes: {0}m'.format(total_distance))
-        print('Total load of all routes: {0}'.format(total_load))
+        print('Total distance of all routes: {0}m'.format(sum(result.costs)))
+        print('Total load of all routes: {0}'.format(sum(result.loads)))
 
     @classmethod
-    def solve(cls, path):
+    def solve(cls, path, options=None):
         """Solve the problem.
 
         Args:
             path: Path for the input files.
+            options: Search options overriding the defaults of the solver.
 
+        Returns:
+            The solution found, or None.
         """
         cvrp_object = cls(path)
+        record_phase(options, 'load')
 
         # Create the routing index manager.
         manager = pywrapcp.RoutingIndexManager(
@@ -85,37 +74,12 @@ class CVRP(object):
         # Create Routing Model.
         routing = pywrapcp.RoutingModel(manager)
 
-        # Create and register a transit callback.
-        def distance_callback(from_index, to_index):
-            """Convert from routing variable Index to distance matrix NodeIndex.
-
-            Args:
-                from_index: start node
-                to_index: destination node
-
-            Returns:
-                Returns the distance between the two nodes.
-            """
-            from_node = manager.IndexToNode(from_index)
-            to_node = manager.IndexToNode(to_index)
-            return cvrp_object.input_data['distance_matrix'][from_node][to_node]
-
-        transit_callback_index = routing.RegisterTransitCallback(distance_callback)
+        # Register the distance matrix as a native transit callback.
+        transit_callback_index = register_transit_matrix(routing, cvrp_object.input_data['distance_matrix'])
         routing.SetArcCostEvaluatorOfAllVehicles(transit_callback_index)
 
-        def demand_callback(from_index):
-            """Convert from routing variable Index to demands NodeIndex.
-
-            Args:
-                from_index: start node
-
-            Returns:
-                Returns the demand of the node.
-            """
-            from_node = manager.IndexToNode(from_index)
-            return cvrp_object.input_data['demands'][from_node]
-
-        demand_callback_index = routing.RegisterUnaryTransitCallback(demand_callback)
+        # Register the demands as a native unary transit callback.
+        demand_callback_index = register_unary_transit_vector(routing, cvrp_object.input_data['demands'])
 
         # Add Distance constraint.
         dimension_name = 'Capacity'
@@ -128,20 +92,36 @@ class CVRP(object):
         )
 
         # Setting first solution heuristic.
-        search_parameters = pywrapcp.DefaultRoutingSearchParameters()
-        search_parameters.first_solution_strategy = (
-            routing_enums_pb2.FirstSolutionStrategy.PATH_CHEAPEST_ARC
+        search_parameters = build_search_parameters(
+            options,
+            first_solution_strategy='PATH_CHEAPEST_ARC',
+            local_search_metaheuristic='GUIDED_LOCAL_SEARCH',
+            time_limit=1,
         )
 
-        search_parameters.local_search_metaheuristic = (
-            routing_enums_pb2.LocalSearchMetaheuristic.GUIDED_LOCAL_SEARCH
+        # Seed the search with the initial routes, if any.
+        initial_routes = hint_routes(
+            manager, options, cvrp_object.input_data['distance_matrix'], cvrp_object.input_data['depot'],
         )
-        search_parameters.time_limit.FromSeconds(1)
+
+        # Bound the objective, for the optimality gap.
+        bound = lower_bound('cvrp', cvrp_object.input_data)
+
+        record_phase(options, 'build')
 
         # Solve the problem.
-        solution = routing.SolveWithParameters(search_parameters)
+        solution = run_search(routing, search_parameters, options, initial_routes, lower_bound=bound)
+        record_phase(options, 'solve')
+
         # Print solution on console.
-        if solution:
-            cvrp_object.print_solution(manager, routing, solution)
-        else:
+        if not solution:
             print('No Solution')
+            return None
+        result = extract_solution(
+            'cvrp', manager, routing, solution,
+            cvrp_object.input_data['distance_matrix'], cvrp_object.input_data['demands'],
+            lower_bound=bound,
+        )
+        cvrp_object.print_solution(result)
+        record_phase(options, 'extract')
+        return result
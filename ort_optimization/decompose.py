@@ -0,0 +1,443 @@
+"""Cluster-first, route-second decomposition of large VRP and CVRP instances.
+
+A single routing model over thousands of stops is too slow to build and to
+search. The decomposition partitions the stops into clusters around medoids of
+the distance matrix, balanced by demand (CVRP) or by number of stops (VRP),
+gives each cluster its share of the vehicles and solves every cluster as an
+independent sub-instance in a worker process. The routes are then stitched
+back into one plan. An optional improvement pass re-solves pairs of
+neighboring clusters together, seeded with their current routes, so that stops
+can move across the cluster borders.
+"""
+
+import contextlib
+import copy
+import io
+import math
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from ort_optimization.instance import load_instance, save_binary
+from ort_optimization.result import SolveResult
+from ort_optimization.search import SearchOptions
+from ort_optimization.solvers import get_solver
+from ort_optimization.vrp import SPAN_COST_COEFFICIENT
+
+PROBLEMS = ('vrp', 'cvrp')
+DEFAULT_CLUSTER_SIZE = 250
+MEDOID_ITERATIONS = 5
+
+# Share of the average cluster load a cluster may exceed while balancing.
+BALANCE_SLACK = 0.1
+
+
+def medoid_distances(matrix, stops, medoids):
+    """Return the round trip distances between stops and medoids.
+
+    Args:
+        matrix: Square distance matrix indexed by node, as an array.
+        stops: Nodes of the stops.
+        medoids: Nodes of the medoids.
+
+    Returns:
+        Matrix with one row per stop and one column per medoid.
+    """
+    return (
+        matrix[np.ix_(stops, medoids)].astype(np.int64)
+        + matrix[np.ix_(medoids, stops)].astype(np.int64).T
+    )
+
+
+def seed_medoids(matrix, stops, depot, clusters):
+    """Pick spread out initial medoids, each one the stop farthest from the previous ones.
+
+    Args:
+        matrix: Square distance matrix indexed by node.
+        stops: Nodes of the stops.
+        depot: Depot node.
+        clusters: Number of medoids.
+
+    Returns:
+        The list of medoid nodes.
+    """
+    closest = medoid_distances(matrix, stops, [depot])[:, 0]
+    medoids = []
+    for _ in range(clusters):
+        medoid = stops[np.argmax(closest)]
+        medoids.append(medoid)
+        closest = np.minimum(closest, medoid_distances(matrix, stops, [medoid])[:, 0])
+    return medoids
+
+
+def update_medoids(matrix, stops, labels, medoids):
+    """Move every medoid to the member of its cluster closest to the other members.
+
+    Args:
+        matrix: Square distance matrix indexed by node.
+        stops: Nodes of the stops.
+        labels: Cluster of every stop.
+        medoids: Current medoid nodes.
+
+    Returns:
+        The list of updated medoid nodes.
+    """
+    updated = []
+    for cluster, medoid in enumerate(medoids):
+        members = stops[labels == cluster]
+        if not len(members):
+            updated.append(medoid)
+            continue
+        distances = medoid_distances(matrix, members, members)
+        updated.append(members[np.argmin(distances.sum(axis=1))])
+    return updated
+
+
+def balanced_labels(distances, loads, capacity):
+    """Assign every stop to a close cluster without exceeding the cluster capacity.
+
+    Stop and cluster pairs are considered from the closest to the farthest.
+    Stops that fit nowhere go to their closest cluster.
+
+    Args:
+        distances: Matrix of distances with one row per stop and one column per cluster.
+        loads: Load of every stop.
+        capacity: Maximum load of a cluster.
+
+    Returns:
+        The cluster of every stop.
+    """
+    num_stops, clusters = distances.shape
+    labels = np.full(num_stops, -1)
+    cluster_loads = np.zeros(clusters)
+    unassigned = num_stops
+    for flat_index in np.argsort(distances, axis=None, kind='stable'):
+        stop, cluster = divmod(int(flat_index), clusters)
+        if labels[stop] >= 0 or cluster_loads[cluster] + loads[stop] > capacity:
+            continue
+        labels[stop] = cluster
+        cluster_loads[cluster] += loads[stop]
+        unassigned -= 1
+        if not unassigned:
+            break
+    leftovers = labels < 0
+    labels[leftovers] = np.argmin(distances[leftovers], axis=1)
+    return labels
+
+
+def node_loads(problem, input_data):
+    """Return the load of every node, the demand for a CVRP and one stop for a VRP.
+
+    Args:
+        problem: Problem name.
+        input_data: Instance data.
+
+    Returns:
+        Array of loads indexed by node, zero at the depot.
+    """
+    if problem == 'cvrp':
+        loads = np.array(input_data['demands'], dtype=np.float64)
+    else:
+        loads = np.ones(len(input_data['distance_matrix']))
+    loads[input_data['depot']] = 0
+    return loads
+
+
+def fleet_capacities(problem, input_data, total_load):
+    """Return the capacity of every vehicle, in the unit of node_loads.
+
+    Args:
+        problem: Problem name.
+        input_data: Instance data.
+        total_load: Load of all the stops.
+
+    Returns:
+        Array of capacities indexed by vehicle.
+    """
+    if problem == 'cvrp':
+        return np.array(input_data['vehicle_capacities'], dtype=np.float64)
+    num_vehicles = input_data['num_vehicles']
+    return np.full(num_vehicles, total_load / num_vehicles)
+
+
+def partition(problem, input_data, clusters):
+    """Partition the stops into balanced clusters around medoids.
+
+    Args:
+        problem: Problem name.
+        input_data: Instance data, with the distance matrix as an array.
+        clusters: Number of clusters.
+
+    Returns:
+        The stops of every non empty cluster and the medoid of every such cluster.
+    """
+    matrix = input_data['distance_matrix']
+    depot = input_data['depot']
+    stops = np.array([node for node in range(len(matrix)) if node != depot])
+    medoids = seed_medoids(matrix, stops, depot, min(clusters, len(stops)))
+    for _ in range(MEDOID_ITERATIONS):
+        labels = np.argmin(medoid_distances(matrix, stops, medoids), axis=1)
+        updated = update_medoids(matrix, stops, labels, medoids)
+        if updated == medoids:
+            break
+        medoids = updated
+    loads = node_loads(problem, input_data)[stops]
+    capacity = max(loads.sum() / len(medoids) * (1 + BALANCE_SLACK), loads.max())
+    labels = balanced_labels(medoid_distances(matrix, stops, medoids), loads, capacity)
+    groups = [stops[labels == cluster] for cluster in range(len(medoids))]
+    non_empty = [cluster for cluster, group in enumerate(groups) if len(group)]
+    return [groups[cluster] for cluster in non_empty], [medoids[cluster] for cluster in non_empty]
+
+
+def assign_vehicles(cluster_loads, capacities):
+    """Share the vehicles between the clusters.
+
+    Every cluster gets one vehicle, the largest ones going to the most loaded
+    clusters, then every other vehicle goes to the cluster whose load is the
+    least covered.
+
+    Args:
+        cluster_loads: Load of every cluster.
+        capacities: Capacity of every vehicle.
+
+    Raises:
+        ValueError: When there are fewer vehicles than clusters.
+
+    Returns:
+        The sorted vehicle ids of every cluster.
+    """
+    if len(capacities) < len(cluster_loads):
+        raise ValueError('{0} clusters need at least as many vehicles, got {1}'.format(
+            len(cluster_loads), len(capacities),
+        ))
+    vehicles = list(np.argsort(-capacities, kind='stable'))
+    fleets = [[] for _ in cluster_loads]
+    uncovered = np.array(cluster_loads, dtype=np.float64)
+    for cluster in np.argsort(-uncovered, kind='stable'):
+        vehicle = vehicles.pop(0)
+        fleets[cluster].append(int(vehicle))
+        uncovered[cluster] -= capacities[vehicle]
+    for vehicle in vehicles:
+        cluster = np.argmax(uncovered)
+        fleets[cluster].append(int(vehicle))
+        uncovered[cluster] -= capacities[vehicle]
+    return [sorted(fleet) for fleet in fleets]
+
+
+def sub_instance(problem, input_data, nodes, fleet):
+    """Return the instance restricted to some nodes and vehicles.
+
+    Args:
+        problem: Problem name.
+        input_data: Instance data, with the distance matrix as an array.
+        nodes: Nodes kept, the depot first.
+        fleet: Vehicles kept.
+
+    Returns:
+        The instance data of the sub-problem, with the depot as node 0.
+    """
+    sub_data = {
+        'distance_matrix': input_data['distance_matrix'][np.ix_(nodes, nodes)],
+        'num_vehicles': len(fleet),
+        'depot': 0,
+    }
+    if problem == 'cvrp':
+        sub_data['demands'] = [int(input_data['demands'][node]) for node in nodes]
+        sub_data['vehicle_capacities'] = [int(input_data['vehicle_capacities'][vehicle]) for vehicle in fleet]
+    else:
+        sub_data['travel distance'] = input_data['travel distance']
+    return sub_data
+
+
+def solve_cluster(problem, path, nodes, options):
+    """Solve a sub-instance, in a worker process.
+
+    Args:
+        problem: Problem name.
+        path: Path of the sub-instance.
+        nodes: Node of the instance of every node of the sub-instance.
+        options: Search options of the sub-problem.
+
+    Returns:
+        One route of instance nodes per vehicle of the sub-instance, or None.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = get_solver(problem).solve(path, options)
+    if result is None:
+        return None
+    return [[int(nodes[node]) for node in route] for route in result.routes]
+
+
+def route_costs(input_data, routes):
+    """Return the distance of every route of a plan.
+
+    Args:
+        input_data: Instance data.
+        routes: One list of nodes per vehicle, from its start to its end.
+
+    Returns:
+        The list of route distances.
+    """
+    matrix = input_data['distance_matrix']
+    return [
+        sum(int(matrix[from_node][to_node]) for from_node, to_node in zip(route, route[1:]))
+        for route in routes
+    ]
+
+
+def plan_objective(problem, input_data, routes):
+    """Return the objective of a route plan, as computed by the solver of the problem.
+
+    Args:
+        problem: Problem name.
+        input_data: Instance data.
+        routes: One list of nodes per vehicle, from its start to its end.
+
+    Returns:
+        The objective value.
+    """
+    costs = route_costs(input_data, routes)
+    if problem == 'vrp':
+        return sum(costs) + SPAN_COST_COEFFICIENT * max(costs, default=0)
+    return sum(costs)
+
+
+def neighbor_pairs(matrix, medoids):
+    """Match every cluster with its closest unmatched cluster.
+
+    Args:
+        matrix: Square distance matrix indexed by node.
+        medoids: Medoid node of every cluster.
+
+    Returns:
+        The list of disjoint (cluster, cluster) pairs.
+    """
+    distances = medoid_distances(matrix, medoids, medoids)
+    matched = set()
+    pairs = []
+    for flat_index in np.argsort(distances, axis=None, kind='stable'):
+        first, second = divmod(int(flat_index), len(medoids))
+        if first < second and first not in matched and second not in matched:
+            pairs.append((first, second))
+            matched.update((first, second))
+    return pairs
+
+
+def subproblem_options(options):
+    """Return the search options of the sub-problems.
+
+    The callbacks and the metrics cannot reach the worker processes, and the
+    target objective and the initial routes of the whole instance do not apply
+    to a cluster.
+
+    Args:
+        options: Search options of the instance.
+
+    Returns:
+        The search options of the sub-problems.
+    """
+    options = copy.copy(options) if options else SearchOptions()
+    options.on_solution = None
+    options.metrics = None
+    options.target_objective = None
+    options.initial_routes = None
+    return options
+
+
+def solve_decomposed(problem, path, clusters=None, workers=None, options=None, improve_time=None):
+    """Solve a large VRP or CVRP cluster by cluster on worker processes.
+
+    Args:
+        problem: Problem name, vrp or cvrp.
+        path: Path of the instance.
+        clusters: Number of clusters, defaults to one per 250 stops.
+        workers: Number of worker processes, defaults to the number of CPUs.
+        options: Search options of every sub-problem.
+        improve_time: Time limit in seconds of the re-solve of each pair of
+            neighboring clusters, no improvement pass when None.
+
+    Raises:
+        ValueError: When the problem cannot be decomposed.
+
+    Returns:
+        The stitched solution, or None when a cluster has no solution.
+    """
+    if problem not in PROBLEMS:
+        raise ValueError('Cannot decompose {0}, expected one of {1}'.format(problem, ', '.join(PROBLEMS)))
+    input_data = load_instance(path)
+    input_data['distance_matrix'] = np.asarray(input_data['distance_matrix'])
+    depot = input_data['depot']
+    num_stops = len(input_data['distance_matrix']) - 1
+    clusters = clusters or max(1, min(input_data['num_vehicles'], math.ceil(num_stops / DEFAULT_CLUSTER_SIZE)))
+    groups, medoids = partition(problem, input_data, clusters)
+    loads = node_loads(problem, input_data)
+    fleets = assign_vehicles(
+        [loads[stops].sum() for stops in groups], fleet_capacities(problem, input_data, loads.sum()),
+    )
+    options = subproblem_options(options)
+    routes = [[depot, depot] for _ in range(input_data['num_vehicles'])]
+    with tempfile.TemporaryDirectory() as tmp_dir, ProcessPoolExecutor(max_workers=workers) as executor:
+        jobs = []
+        for cluster, (stops, fleet) in enumerate(zip(groups, fleets)):
+            nodes = np.concatenate(([depot], stops))
+            cluster_path = Path(tmp_dir) / 'cluster{0}.json'.format(cluster)
+            save_binary(sub_instance(problem, input_data, nodes, fleet), cluster_path)
+            jobs.append(executor.submit(solve_cluster, problem, str(cluster_path), nodes, options))
+        for cluster, (fleet, job) in enumerate(zip(fleets, jobs)):
+            cluster_routes = job.result()
+            if cluster_routes is None:
+                print('No solution for cluster {0}'.format(cluster))
+                return None
+            for vehicle, route in zip(fleet, cluster_routes):
+                routes[vehicle] = route
+        if improve_time:
+            pair_fleets = [
+                fleets[first] + fleets[second]
+                for first, second in neighbor_pairs(input_data['distance_matrix'], medoids)
+            ]
+            improve_options = copy.copy(options)
+            improve_options.time_limit = improve_time
+            improve_borders(problem, input_data, routes, pair_fleets, executor, tmp_dir, improve_options)
+    loads = None
+    if problem == 'cvrp':
+        loads = [sum(int(input_data['demands'][node]) for node in route[:-1]) for route in routes]
+    return SolveResult(
+        problem, plan_objective(problem, input_data, routes), routes, route_costs(input_data, routes), loads,
+    )
+
+
+def improve_borders(problem, input_data, routes, pair_fleets, executor, tmp_dir, options):
+    """Re-solve pairs of neighboring clusters together and keep the improvements.
+
+    Every pair is seeded with its current routes and searched with guided local
+    search, unless the options name another metaheuristic. The routes are
+    updated in place.
+
+    Args:
+        problem: Problem name.
+        input_data: Instance data.
+        routes: Route plan of the instance, one list of nodes per vehicle.
+        pair_fleets: Vehicle ids of every pair of neighboring clusters.
+        executor: Pool of worker processes.
+        tmp_dir: Folder of the sub-instances.
+        options: Search options of the pairs, with their time limit.
+    """
+    options = copy.copy(options)
+    options.local_search_metaheuristic = options.local_search_metaheuristic or 'GUIDED_LOCAL_SEARCH'
+    jobs = []
+    for pair_id, fleet in enumerate(pair_fleets):
+        nodes = [input_data['depot']] + [node for vehicle in fleet for node in routes[vehicle][1:-1]]
+        sub_nodes = {node: sub_node for sub_node, node in enumerate(nodes)}
+        pair_options = copy.copy(options)
+        pair_options.initial_routes = [[sub_nodes[node] for node in routes[vehicle]] for vehicle in fleet]
+        pair_path = Path(tmp_dir) / 'pair{0}.json'.format(pair_id)
+        save_binary(sub_instance(problem, input_data, nodes, fleet), pair_path)
+        jobs.append((fleet, executor.submit(solve_cluster, problem, str(pair_path), nodes, pair_options)))
+    for fleet, job in jobs:
+        pair_routes = job.result()
+        current = [routes[vehicle] for vehicle in fleet]
+        if pair_routes and plan_objective(problem, input_data, pair_routes) < plan_objective(problem, input_data, current):
+            for vehicle, route in zip(fleet, pair_routes):
+                routes[vehicle] = route
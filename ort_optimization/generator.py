@@ -0,0 +1,281 @@
+"""Seeded generator of synthetic instances of every problem type.
+
+Stops are spread uniformly on a square with the depot at its center. The
+constraints are built around a planted solution, so every generated instance
+is feasible:
+
+* CVRP fleets are sized so that a first fit packing of the demands fits;
+* VRP and PDP travel distances cover the routes of an angular sweep of the
+  stops, pickups and deliveries being paired along the sweep;
+* TWCP and TWDCP time windows contain the arrival times of sweep routes that
+  fit the horizon, and the TWDCP depot capacity covers the overlap of their
+  loading and unloading intervals, spare vehicles included.
+
+Planted lengths are rounded up, so they bound the integer matrix entries. The
+instances hold their locations; the matrix is built from them when the
+instance is written, or when a locations only instance is loaded.
+"""
+
+import json
+import math
+
+import numpy as np
+
+from ort_optimization.instance import save_binary
+from ort_optimization.matrix import build_matrix
+
+OUTPUT_FORMATS = ('json', 'binary', 'locations')
+TIME_PROBLEMS = ('twcp', 'twdcp')
+
+# Side of the square of the locations and horizon of the time windows.
+DISTANCE_EXTENT = 1000
+TIME_SETTINGS = {
+    'twcp': {'extent': 100, 'horizon': 480},
+    'twdcp': {'extent': 100, 'horizon': 480},
+}
+STOPS_PER_VEHICLE = 25
+VEHICLE_CAPACITY = 100
+MAX_DEMAND = 9
+DOCK_TIME = 10
+
+# Planted time window routes use this share of the horizon, their windows open
+# up to a third of the horizon before and after the planted arrivals, and the
+# fleet has this share of spare vehicles, so that the search heuristics find
+# solutions and not only the planted one.
+ROUTE_SHARE = 0.35
+WINDOW_SHARE = 1 / 3
+SPARE_VEHICLES = 0.25
+
+
+def arc_lengths(locations, from_nodes, to_nodes):
+    """Return upper bounds of the integer euclidean lengths of arcs.
+
+    Args:
+        locations: Array of coordinates, one row per node.
+        from_nodes: Tail node of every arc.
+        to_nodes: Head node of every arc.
+
+    Returns:
+        Array of the rounded lengths plus one.
+    """
+    offsets = locations[to_nodes] - locations[from_nodes]
+    return np.rint(np.hypot(offsets[:, 0], offsets[:, 1])).astype(np.int64) + 1
+
+
+def route_length(locations, route, depot):
+    """Return an upper bound of the length of a route from and back to the depot.
+
+    Args:
+        locations: Array of coordinates, one row per node.
+        route: Stops of the route.
+        depot: Depot node.
+
+    Returns:
+        The length bound.
+    """
+    nodes = np.concatenate(([depot], route, [depot])).astype(np.int64)
+    return int(arc_lengths(locations, nodes[:-1], nodes[1:]).sum())
+
+
+def sweep_order(locations, depot):
+    """Return the stops sorted by their angle around the depot.
+
+    Args:
+        locations: Array of coordinates, one row per node.
+        depot: Depot node.
+
+    Returns:
+        Array of the stops.
+    """
+    offsets = locations - locations[depot]
+    angles = np.arctan2(offsets[:, 1], offsets[:, 0])
+    return np.array([node for node in np.argsort(angles, kind='stable') if node != depot])
+
+
+def timed_routes(locations, order, depot, horizon):
+    """Cut the sweep into routes that return to the depot within the horizon.
+
+    Args:
+        locations: Array of coordinates, one row per node.
+        order: Stops in sweep order.
+        depot: Depot node.
+        horizon: Latest return time, the routes leaving at time 0.
+
+    Returns:
+        The list of routes and the arrival time of every stop.
+    """
+    to_stop = arc_lengths(locations, np.full(len(order), depot), order)
+    between = arc_lengths(locations, order[:-1], order[1:])
+    routes = [[]]
+    arrivals = {}
+    clock = 0
+    for position, stop in enumerate(order):
+        arrival = clock + between[position - 1] if routes[-1] else to_stop[position]
+        if routes[-1] and arrival + to_stop[position] > horizon:
+            routes.append([])
+            arrival = to_stop[position]
+        routes[-1].append(int(stop))
+        arrivals[int(stop)] = int(arrival)
+        clock = arrival
+    return routes, arrivals
+
+
+def max_overlap(intervals):
+    """Return the largest number of intervals in progress at the same time.
+
+    Args:
+        intervals: List of (start, end) pairs, the end excluded.
+
+    Returns:
+        The maximum overlap.
+    """
+    events = sorted([(end, -1) for _, end in intervals] + [(start, 1) for start, _ in intervals])
+    overlap = 0
+    largest = 0
+    for _, change in events:
+        overlap += change
+        largest = max(largest, overlap)
+    return largest
+
+
+def time_window_fields(problem, rng, locations, depot, window_share=WINDOW_SHARE):
+    """Return the fields of a time window instance built around planted routes.
+
+    Args:
+        problem: twcp or twdcp.
+        rng: Random generator.
+        locations: Array of coordinates, one row per node.
+        depot: Depot node.
+        window_share: Largest share of the horizon a window opens before, and
+            closes after, the planted arrival.
+
+    Returns:
+        The instance fields besides the locations and the depot.
+    """
+    horizon = TIME_SETTINGS[problem]['horizon']
+    # TWDCP routes leave at staggered times, so the planted routes fit a shorter horizon.
+    stagger = horizon // 6 if problem == 'twdcp' else 0
+    routes, arrivals = timed_routes(locations, sweep_order(locations, depot), depot, (horizon - stagger) * ROUTE_SHARE)
+    departures = [(vehicle * DOCK_TIME) % (stagger or 1) for vehicle in range(len(routes))]
+    width = max(1, int(horizon * window_share))
+    time_windows = [[0, horizon] for _ in range(len(locations))]
+    for route, departure in zip(routes, departures):
+        for stop in route:
+            arrival = arrivals[stop] + departure
+            opening, closing = rng.integers(0, width + 1, 2)
+            time_windows[stop] = [int(max(0, arrival - opening)), int(min(horizon, arrival + closing))]
+    spare_vehicles = math.ceil(len(routes) * SPARE_VEHICLES)
+    fields = {
+        'time_windows': time_windows,
+        'num_vehicles': len(routes) + spare_vehicles,
+        'waiting_time': horizon,
+        'maximum_time': horizon,
+    }
+    if problem == 'twdcp':
+        last_stops = np.array([route[-1] for route in routes])
+        returns = arc_lengths(locations, last_stops, np.full(len(routes), depot))
+        # Spare vehicles load and unload at the horizon, without leaving the depot.
+        intervals = [(horizon, horizon + DOCK_TIME)] * (2 * spare_vehicles)
+        for departure, last_stop, back in zip(departures, last_stops, returns):
+            arrival = departure + arrivals[last_stop] + back
+            intervals += [(departure, departure + DOCK_TIME), (arrival, arrival + DOCK_TIME)]
+        fields.update(
+            vehicle_load_time=DOCK_TIME,
+            vehicle_unload_time=DOCK_TIME,
+            depot_capacity=max_overlap(intervals),
+        )
+    return fields
+
+
+def distance_fields(problem, rng, locations, depot):
+    """Return the fields of a distance instance built around planted routes.
+
+    Args:
+        problem: tsp, vrp, cvrp or pdp.
+        rng: Random generator.
+        locations: Array of coordinates, one row per node.
+        depot: Depot node.
+
+    Returns:
+        The instance fields besides the locations and the depot.
+    """
+    num_stops = len(locations) - 1
+    if problem == 'tsp':
+        return {'num_vehicles': 1}
+    if problem == 'cvrp':
+        demands = rng.integers(1, MAX_DEMAND + 1, len(locations))
+        demands[depot] = 0
+        num_vehicles = math.ceil(demands.sum() / (VEHICLE_CAPACITY - MAX_DEMAND + 1)) + 1
+        return {
+            'demands': demands.tolist(),
+            'vehicle_capacities': [VEHICLE_CAPACITY] * num_vehicles,
+            'num_vehicles': num_vehicles,
+        }
+    num_vehicles = max(2, math.ceil(num_stops / STOPS_PER_VEHICLE))
+    order = sweep_order(locations, depot)
+    fields = {'num_vehicles': num_vehicles}
+    if problem == 'pdp':
+        pairs = order[:num_stops - num_stops % 2].reshape(-1, 2)
+        fields['pickups_deliveries'] = pairs.tolist()
+        chunks = [chunk.ravel() for chunk in np.array_split(pairs, num_vehicles)]
+        chunks[-1] = np.concatenate((chunks[-1], order[len(pairs) * 2:]))
+    else:
+        chunks = np.array_split(order, num_vehicles)
+    fields['travel distance'] = max(route_length(locations, chunk, depot) for chunk in chunks)
+    return fields
+
+
+def generate(problem, size, seed=0, window_share=WINDOW_SHARE):
+    """Generate a feasible instance of a problem.
+
+    Args:
+        problem: Problem name.
+        size: Number of nodes, the depot included.
+        seed: Seed of the random generator.
+        window_share: Largest share of the horizon a time window opens before,
+            and closes after, the planted arrival; smaller shares give tighter windows.
+
+    Raises:
+        ValueError: When the size is below two nodes.
+
+    Returns:
+        The instance data, with locations instead of a matrix.
+    """
+    if size < 2:
+        raise ValueError('An instance needs a depot and at least one stop, got {0} nodes'.format(size))
+    rng = np.random.default_rng(seed)
+    extent = TIME_SETTINGS[problem]['extent'] if problem in TIME_PROBLEMS else DISTANCE_EXTENT
+    locations = rng.uniform(0, extent, (size, 2)).round()
+    depot = 0
+    locations[depot] = extent / 2
+    if problem in TIME_PROBLEMS:
+        fields = time_window_fields(problem, rng, locations, depot, window_share)
+    else:
+        fields = distance_fields(problem, rng, locations, depot)
+    return dict(locations=locations.tolist(), depot=depot, **fields)
+
+
+def write_instance(input_data, path, output_format='json'):
+    """Write a generated instance.
+
+    Args:
+        input_data: Instance data with locations.
+        path: Path of the JSON instance, or of the JSON header of a binary instance.
+        output_format: json writes the matrix in the JSON file, binary writes it
+            as a .npy file next to the header, locations leaves it to the loader.
+
+    Raises:
+        ValueError: When the output format is unknown.
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError('Unknown format {0}, expected one of {1}'.format(output_format, ', '.join(OUTPUT_FORMATS)))
+    if output_format != 'locations':
+        matrix_key = 'time_matrix' if 'time_windows' in input_data else 'distance_matrix'
+        input_data = dict(input_data, **{matrix_key: build_matrix(input_data['locations'])})
+    if output_format == 'binary':
+        save_binary(input_data, path)
+        return
+    if output_format == 'json':
+        input_data[matrix_key] = input_data[matrix_key].tolist()
+    with open(path, 'w') as json_file:
+        json.dump(input_data, json_file)
@@ -0,0 +1,173 @@
+"""Instance loading for the JSON and the binary input formats.
+
+Besides the plain JSON files in ``data_input_files``, an instance can be stored
+as a small JSON header plus one ``.npy`` file per matrix. The header holds the
+scalar and per-node data (``num_vehicles``, ``depot``, ``demands``,
+``time_windows``, ...) and a ``matrix_files`` entry mapping every matrix key to
+its ``.npy`` file, relative to the header::
+
+    {
+        "num_vehicles": 16,
+        "depot": 0,
+        "travel distance": 3000,
+        "matrix_files": {"distance_matrix": "vrp.distance_matrix.npy"}
+    }
+
+The matrices are memory mapped, so load time and resident memory do not grow
+with the instance size until the solver actually reads them.
+
+Either format may give ``locations`` instead of a matrix, see
+ort_optimization.matrix; the matrix is then built when the instance is loaded.
+
+The matrices of a JSON instance, or built from its locations, are packed,
+see ort_optimization.compact: a symmetric matrix only keeps its upper
+triangle, in the narrowest integer dtype holding its values.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+
+from ort_optimization.compact import pack_matrix, packed_dtype
+from ort_optimization.matrix import build_matrix
+
+MATRIX_KEYS = ('distance_matrix', 'time_matrix')
+MATRIX_FILES = 'matrix_files'
+
+
+def read_json(path):
+    """Read a JSON file, exiting with a message when it is not valid.
+
+    Args:
+        path: Path of the JSON file.
+
+    Returns:
+        The decoded JSON document.
+    """
+    try:
+        with open(path) as json_file:
+            return json.load(json_file)
+    except json.decoder.JSONDecodeError as er:
+        print('JSON VALIDATION FAILED')
+        print(er)
+        sys.exit(1)
+
+
+def load_instance(path):
+    """Load an instance from a JSON file or from a binary header.
+
+    Args:
+        path: Path of the JSON instance or of the binary header.
+
+    Returns:
+        The instance data, with memory mapped matrices for binary instances
+        and packed matrices otherwise.
+    """
+    input_data = read_json(path)
+    for key in MATRIX_KEYS:
+        if key in input_data:
+            input_data[key] = pack_matrix(input_data[key])
+    matrix_files = input_data.pop(MATRIX_FILES, None)
+    if matrix_files:
+        folder = Path(path).parent
+        for key, matrix_file in matrix_files.items():
+            input_data[key] = np.load(folder / matrix_file, mmap_mode='r')
+    if 'locations' in input_data and not any(key in input_data for key in MATRIX_KEYS):
+        matrix_key = 'time_matrix' if 'time_windows' in input_data else 'distance_matrix'
+        input_data[matrix_key] = pack_matrix(build_matrix(
+            input_data['locations'],
+            input_data.get('metric', 'euclidean'),
+            input_data.get('scale', 1),
+        ))
+    return input_data
+
+
+def detect_problem(input_data):
+    """Detect the problem type from the keys of the instance data.
+
+    Args:
+        input_data: Instance data, or the header of a binary instance.
+
+    Raises:
+        ValueError: When the data does not match any of the problem schemas.
+
+    Returns:
+        The problem name: cvrp, pdp, tsp, twcp, twdcp or vrp.
+    """
+    keys = set(input_data) | set(input_data.get(MATRIX_FILES, {}))
+    if 'time_matrix' in keys or 'time_windows' in keys:
+        return 'twdcp' if keys & {'depot_capacity', 'load_docks', 'unload_docks'} else 'twcp'
+    if 'distance_matrix' not in keys and 'locations' not in keys:
+        raise ValueError('Instance has neither a matrix nor locations')
+    if 'pickups_deliveries' in keys:
+        return 'pdp'
+    if 'demands' in keys:
+        return 'cvrp'
+    if 'travel distance' in keys:
+        return 'vrp'
+    return 'tsp'
+
+
+def matrix_dtype(matrix):
+    """Return the narrowest of int32 and int64 able to hold the matrix.
+
+    The binary files keep at least int32, the dtype their readers expect;
+    pack_matrix narrows the matrices further once loaded.
+
+    Args:
+        matrix: Matrix as a NumPy array.
+
+    Returns:
+        The NumPy dtype to store the matrix with.
+    """
+    return packed_dtype(matrix, (np.int32, np.int64))
+
+
+def save_binary(input_data, header_path):
+    """Write instance data as a JSON header plus one ``.npy`` file per matrix.
+
+    Args:
+        input_data: Instance data, with matrices as nested lists or arrays.
+        header_path: Path of the JSON header to write.
+    """
+    header_path = Path(header_path)
+    header = {}
+    matrix_files = {}
+    for key, input_value in input_data.items():
+        if key not in MATRIX_KEYS:
+            header[key] = input_value
+            continue
+        matrix = np.asarray(input_value)
+        matrix_file = '{0}.{1}.npy'.format(header_path.stem, key)
+        np.save(header_path.parent / matrix_file, matrix.astype(matrix_dtype(matrix)))
+        matrix_files[key] = matrix_file
+    header[MATRIX_FILES] = matrix_files
+    with open(header_path, 'w') as header_file:
+        json.dump(header, header_file, indent=4)
+
+
+def json_to_binary(json_path, header_path):
+    """Convert a JSON instance into the binary format.
+
+    Args:
+        json_path: Path of the JSON instance.
+        header_path: Path of the JSON header to write.
+    """
+    save_binary(read_json(json_path), header_path)
+
+
+def binary_to_json(header_path, json_path):
+    """Convert a binary instance back into a plain JSON instance.
+
+    Args:
+        header_path: Path of the JSON header.
+        json_path: Path of the JSON instance to write.
+    """
+    input_data = load_instance(header_path)
+    for key in MATRIX_KEYS:
+        if key in input_data:
+            input_data[key] = np.asarray(input_data[key]).tolist()
+    with open(json_path, 'w') as json_file:
+        json.dump(input_data, json_file)
@@ -0,0 +1,519 @@
+"""Local search engine for large single vehicle TSP instances.
+
+The routing model of a TSP of ten thousand nodes and more is too large and
+too slow to search. This engine only keeps the tour, as the array of its
+nodes and the position of every node in it, and the LOCAL_NEIGHBORS nearest
+neighbors of every node:
+
+* Construction: greedy matching, the edges towards the neighbors added
+  cheapest first unless they close a cycle or give a node a third edge, then
+  the fragments left joined nearest end first.
+* Improvement: rounds of 2-opt moves, which reverse a path of the tour, and
+  Or-opt moves, which move a path of up to three nodes elsewhere, possibly
+  reversed. Every round evaluates at once with NumPy the moves bringing an
+  active node next to one of its neighbors, then applies the improving ones
+  best first, skipping those that the moves applied before them made stale.
+  The ends of the changed edges are the active nodes of the next round, and
+  the rounds stop at a local optimum or at the time limit.
+
+The moves assume a symmetric matrix, the cost of a path not changing when it
+is reversed. The matrix is only read by blocks of rows and by vectors of
+arcs, so a SymmetricMatrix or a memory mapped matrix is never made dense.
+"""
+
+import time
+
+import numpy as np
+
+from ort_optimization.bounds import lower_bound
+from ort_optimization.compact import SymmetricMatrix
+from ort_optimization.metrics import record_phase
+from ort_optimization.result import SolveResult, arc_values, optimality_gap
+
+LOCAL_NEIGHBORS = 10
+SEGMENT_LENGTHS = (1, 2, 3)
+# Size of the block of rows of the matrix read at once.
+CHUNK_BYTES = 16 * 1024 * 1024
+# Moves applied between two checks of the time limit.
+DEADLINE_CHECK = 256
+TWO_OPT = 0
+OR_OPT = 1
+
+
+def as_matrix(matrix):
+    """Return a matrix that can be indexed with arrays of nodes.
+
+    Args:
+        matrix: Square matrix indexed by node, as nested lists, an array or a SymmetricMatrix.
+
+    Returns:
+        The matrix itself, or an array of its nested lists.
+    """
+    if isinstance(matrix, (np.ndarray, SymmetricMatrix)):
+        return matrix
+    return np.asarray(matrix)
+
+
+def is_symmetric(matrix, chunk_bytes=CHUNK_BYTES):
+    """Tell whether a matrix is symmetric, comparing it by blocks of rows.
+
+    Args:
+        matrix: Square matrix indexed by node.
+        chunk_bytes: Size of the block of rows compared at once.
+
+    Returns:
+        True if the matrix is its transpose.
+    """
+    if isinstance(matrix, SymmetricMatrix):
+        return True
+    matrix = as_matrix(matrix)
+    size = len(matrix)
+    chunk_size = max(1, chunk_bytes // max(1, size * 8))
+    for start in range(0, size, chunk_size):
+        stop = min(start + chunk_size, size)
+        if not np.array_equal(matrix[start:stop], matrix[:, start:stop].T):
+            return False
+    return True
+
+
+def neighbor_lists(matrix, depth, chunk_bytes=CHUNK_BYTES):
+    """Return the nearest neighbors of every node, by blocks of rows.
+
+    Args:
+        matrix: Square matrix indexed by node, indexable with arrays of nodes.
+        depth: Number of neighbors per node.
+        chunk_bytes: Size of the block of rows read at once.
+
+    Returns:
+        Array with one row of neighbors per node, nearest first, and the array of their costs.
+    """
+    size = len(matrix)
+    depth = max(min(depth, size - 1), 0)
+    nodes = np.arange(size)
+    chunk_size = max(1, chunk_bytes // max(1, size * 8))
+    neighbors = np.empty((size, depth), dtype=np.int64)
+    costs = np.empty((size, depth), dtype=np.int64)
+    if not depth:
+        return neighbors, costs
+    for start in range(0, size, chunk_size):
+        rows = nodes[start:start + chunk_size]
+        block = arc_values(matrix, rows[:, None], nodes[None, :])
+        block[np.arange(len(rows)), rows] = np.iinfo(np.int64).max
+        nearest = np.argpartition(block, depth - 1, axis=1)[:, :depth]
+        nearest_costs = np.take_along_axis(block, nearest, axis=1)
+        order = np.argsort(nearest_costs, axis=1, kind='stable')
+        neighbors[rows] = np.take_along_axis(nearest, order, axis=1)
+        costs[rows] = np.take_along_axis(nearest_costs, order, axis=1)
+    return neighbors, costs
+
+
+def greedy_tour(matrix, neighbors):
+    """Build a tour by greedy matching of the edges towards the neighbors.
+
+    Args:
+        matrix: Square matrix indexed by node, indexable with arrays of nodes.
+        neighbors: Neighbors of every node.
+
+    Returns:
+        The nodes of the tour.
+    """
+    size = len(neighbors)
+    tails = np.repeat(np.arange(size), neighbors.shape[1])
+    heads = neighbors.ravel()
+    edges = np.unique(np.minimum(tails, heads) * size + np.maximum(tails, heads))
+    lows, highs = np.divmod(edges, size)
+    order = np.argsort(arc_values(matrix, lows, highs), kind='stable')
+    degrees = [0] * size
+    roots = list(range(size))
+    adjacent = [[] for _ in range(size)]
+    for low, high in zip(lows[order].tolist(), highs[order].tolist()):
+        if degrees[low] == 2 or degrees[high] == 2:
+            continue
+        low_root, high_root = low, high
+        while roots[low_root] != low_root:
+            roots[low_root] = roots[roots[low_root]]
+            low_root = roots[low_root]
+        while roots[high_root] != high_root:
+            roots[high_root] = roots[roots[high_root]]
+            high_root = roots[high_root]
+        if low_root == high_root:
+            continue  # the edge would close a cycle
+        roots[low_root] = high_root
+        degrees[low] += 1
+        degrees[high] += 1
+        adjacent[low].append(high)
+        adjacent[high].append(low)
+    # Join the fragments, from the end of one to the nearest end of another.
+    ends = np.flatnonzero(np.asarray(degrees) < 2)
+    visited = np.zeros(size, dtype=bool)
+    tour = []
+    node = int(ends[0])
+    while True:
+        previous = -1
+        while True:
+            tour.append(node)
+            visited[node] = True
+            following = [other for other in adjacent[node] if other != previous]
+            if not following:
+                break
+            previous, node = node, following[0]
+        open_ends = ends[~visited[ends]]
+        if not len(open_ends):
+            break
+        node = int(open_ends[np.argmin(arc_values(matrix, np.full(len(open_ends), node), open_ends))])
+    return np.asarray(tour, dtype=np.int64)
+
+
+class Tour(object):
+    """Cyclic tour, with the position of every node."""
+
+    def __init__(self, nodes):
+        """Init the tour.
+
+        Args:
+            nodes: Nodes of the tour, every node once.
+        """
+        self.nodes = np.array(nodes, dtype=np.int64)
+        self.positions = np.empty_like(self.nodes)
+        self.positions[self.nodes] = np.arange(len(self.nodes))
+
+    def __len__(self):
+        """Return the number of nodes.
+
+        Returns:
+            The size of the tour.
+        """
+        return len(self.nodes)
+
+    def successors(self):
+        """Return the successor of every node.
+
+        Returns:
+            Array indexed by node.
+        """
+        return np.roll(self.nodes, -1)[self.positions]
+
+    def predecessors(self):
+        """Return the predecessor of every node.
+
+        Returns:
+            Array indexed by node.
+        """
+        return np.roll(self.nodes, 1)[self.positions]
+
+    def at(self, node, offset):
+        """Return the node at an offset from another.
+
+        Args:
+            node: Node.
+            offset: Number of steps forward, backward when negative.
+
+        Returns:
+            The node.
+        """
+        return int(self.nodes[(self.positions[node] + offset) % len(self.nodes)])
+
+    def distance(self, first, last):
+        """Return the number of steps forward from a node to another.
+
+        Args:
+            first: Start node.
+            last: End node.
+
+        Returns:
+            The number of steps.
+        """
+        return int(self.positions[last] - self.positions[first]) % len(self.nodes)
+
+    def rewrite(self, first, last, values):
+        """Replace the nodes of the forward path from a node to another.
+
+        Args:
+            first: First node of the path.
+            last: Last node of the path.
+            values: New nodes of the path, the same nodes in another order.
+        """
+        indices = self.path_indices(first, last)
+        self.nodes[indices] = values
+        self.positions[values] = indices
+
+    def path_indices(self, first, last):
+        """Return the positions of the forward path from a node to another.
+
+        Args:
+            first: First node of the path.
+            last: Last node of the path.
+
+        Returns:
+            Array of positions.
+        """
+        return (self.positions[first] + np.arange(self.distance(first, last) + 1)) % len(self.nodes)
+
+    def reverse(self, first, last):
+        """Reverse the forward path from a node to another, or the rest of the tour when shorter.
+
+        Args:
+            first: First node of the path.
+            last: Last node of the path.
+        """
+        if 2 * (self.distance(first, last) + 1) > len(self.nodes):
+            first, last = self.at(last, 1), self.at(first, -1)
+            if self.at(first, -1) == last:
+                return  # the rest is empty
+        self.rewrite(first, last, self.nodes[self.path_indices(first, last)][::-1])
+
+    def two_opt(self, move):
+        """Replace the edges {a, b} and {c, d} by {a, c} and {b, d}.
+
+        Args:
+            move: The nodes a, b, c and d.
+
+        Returns:
+            False when the edges are no longer in the tour.
+        """
+        a, b, c, d = move[:4]
+        if self.at(a, 1) == b and self.at(c, 1) == d:
+            self.reverse(b, c)
+        elif self.at(b, 1) == a and self.at(d, 1) == c:
+            self.reverse(a, d)
+        else:
+            return False
+        return True
+
+    def or_opt(self, move, length):
+        """Move the path from s to e between c and d, with s next to c.
+
+        Args:
+            move: The nodes s, e, c, d, and p and x, the nodes before s and after e.
+            length: Number of nodes of the path.
+
+        Returns:
+            False when the path or the edges are no longer in the tour.
+        """
+        s, e, c, d, p, x = move
+        if self.at(s, length - 1) == e and self.at(s, -1) == p and self.at(e, 1) == x:
+            first, last = s, e
+        elif self.at(s, 1 - length) == e and self.at(s, 1) == p and self.at(e, -1) == x:
+            first, last = e, s
+        else:
+            return False
+        if self.distance(first, c) < length or self.distance(first, d) < length:
+            return False  # c or d moved into the path
+        if self.at(c, 1) == d:
+            before, after = c, d
+        elif self.at(d, 1) == c:
+            before, after = d, c
+        else:
+            return False
+        segment = self.nodes[self.path_indices(first, last)]
+        if (first == s) != (before == c):
+            segment = segment[::-1]
+        # Rotate the shorter of the paths from the segment to the insertion edge.
+        if self.distance(first, before) <= self.distance(after, last):
+            rotated = self.nodes[self.path_indices(self.at(last, 1), before)]
+            self.rewrite(first, before, np.concatenate([rotated, segment]))
+        else:
+            rotated = self.nodes[self.path_indices(after, self.at(first, -1))]
+            self.rewrite(after, last, np.concatenate([segment, rotated]))
+        return True
+
+
+def two_opt_moves(matrix, tour, active, neighbors, neighbor_costs, arc_costs):
+    """Return the improving 2-opt moves adding an edge from an active node to a neighbor.
+
+    Args:
+        matrix: Square matrix indexed by node, indexable with arrays of nodes.
+        tour: Tour.
+        active: Active nodes.
+        neighbors: Neighbors of every node.
+        neighbor_costs: Costs of the edges towards the neighbors.
+        arc_costs: Cost of the edge from every node to its successor.
+
+    Returns:
+        The gains (negative) and the nodes a, b, c and d of the moves, see Tour.two_opt.
+    """
+    a = np.broadcast_to(active[:, None], (len(active), neighbors.shape[1]))
+    c = neighbors[active]
+    predecessors = tour.predecessors()
+    deltas, moves = [], []
+    for following, edge_costs in ((tour.successors(), arc_costs), (predecessors, arc_costs[predecessors])):
+        b = following[a]
+        d = following[c]
+        delta = neighbor_costs[active] + arc_values(matrix, b, d) - edge_costs[a] - edge_costs[c]
+        improving = delta < 0
+        deltas.append(delta[improving])
+        moves.append(np.stack([a[improving], b[improving], c[improving], d[improving]], axis=1))
+    return np.concatenate(deltas), np.concatenate(moves)
+
+
+def or_opt_moves(matrix, tour, active, neighbors, neighbor_costs, arc_costs, length):
+    """Return the improving Or-opt moves putting an active node next to a neighbor.
+
+    The paths start at the active node, forward and backward.
+
+    Args:
+        matrix: Square matrix indexed by node, indexable with arrays of nodes.
+        tour: Tour.
+        active: Active nodes.
+        neighbors: Neighbors of every node.
+        neighbor_costs: Costs of the edges towards the neighbors.
+        arc_costs: Cost of the edge from every node to its successor.
+        length: Number of nodes of the paths.
+
+    Returns:
+        The gains (negative) and the nodes s, e, c, d, p and x of the moves, see Tour.or_opt.
+    """
+    size = len(tour)
+    successors = tour.successors()
+    predecessors = tour.predecessors()
+    successor_costs = arc_costs
+    predecessor_costs = arc_costs[predecessors]
+    s = np.broadcast_to(active[:, None], (len(active), neighbors.shape[1]))
+    c = neighbors[active]
+    deltas, moves = [], []
+    directions = (
+        (successors, predecessors, successor_costs, predecessor_costs, 1),
+        (predecessors, successors, predecessor_costs, successor_costs, -1),
+    )
+    for forward, backward, forward_costs, backward_costs, step in directions:
+        e = active
+        for _ in range(length - 1):
+            e = forward[e]
+        p = backward[active]
+        x = forward[e]
+        removed = backward_costs[active] + forward_costs[e] - arc_values(matrix, p, x)
+        for d, insertion_costs in ((successors[c], successor_costs[c]), (predecessors[c], predecessor_costs[c])):
+            delta = neighbor_costs[active] + arc_values(matrix, np.broadcast_to(e[:, None], c.shape), d) - insertion_costs - removed[:, None]
+            # Neither end of the insertion edge may be in the path.
+            inside_c = (tour.positions[c] - tour.positions[s]) * step % size < length
+            inside_d = (tour.positions[d] - tour.positions[s]) * step % size < length
+            improving = (delta < 0) & ~inside_c & ~inside_d
+            ends = np.broadcast_to(e[:, None], c.shape)
+            deltas.append(delta[improving])
+            moves.append(np.stack([
+                s[improving], ends[improving], c[improving], d[improving],
+                np.broadcast_to(p[:, None], c.shape)[improving], np.broadcast_to(x[:, None], c.shape)[improving],
+            ], axis=1))
+    return np.concatenate(deltas), np.concatenate(moves)
+
+
+def improve(matrix, tour, neighbors, neighbor_costs, deadline=None, on_round=None):
+    """Apply 2-opt and Or-opt moves to a tour until a local optimum or a deadline.
+
+    Args:
+        matrix: Square matrix indexed by node, indexable with arrays of nodes.
+        tour: Tour, changed in place.
+        neighbors: Neighbors of every node.
+        neighbor_costs: Costs of the edges towards the neighbors.
+        deadline: time.perf_counter value stopping the search, None for no limit.
+        on_round: Called with the gain of every round applying moves; returning True stops the search.
+
+    Returns:
+        The number of moves applied.
+    """
+    size = len(tour)
+    lengths = [length for length in SEGMENT_LENGTHS if length + 3 <= size]
+    active = np.arange(size) if size > 3 else np.arange(0)
+    applied = 0
+    while len(active):
+        arc_costs = arc_values(matrix, np.arange(size), tour.successors())
+        found = [two_opt_moves(matrix, tour, active, neighbors, neighbor_costs, arc_costs)]
+        kinds = [np.full(len(found[0][0]), TWO_OPT)]
+        for length in lengths:
+            found.append(or_opt_moves(matrix, tour, active, neighbors, neighbor_costs, arc_costs, length))
+            kinds.append(np.full(len(found[-1][0]), OR_OPT + length))
+        deltas = np.concatenate([delta for delta, _ in found])
+        if not len(deltas):
+            break
+        moves = np.concatenate([np.pad(move, ((0, 0), (0, 6 - move.shape[1]))) for _, move in found])
+        kinds = np.concatenate(kinds)
+        gain = 0
+        touched = []
+        round_moves = 0
+        for count, index in enumerate(np.argsort(deltas, kind='stable').tolist()):
+            move = moves[index].tolist()
+            kind = int(kinds[index])
+            changed = tour.two_opt(move) if kind == TWO_OPT else tour.or_opt(move, kind - OR_OPT)
+            if changed:
+                round_moves += 1
+                gain += int(deltas[index])
+                touched.extend(move if kind != TWO_OPT else move[:4])
+            if deadline is not None and count % DEADLINE_CHECK == 0 and time.perf_counter() > deadline:
+                break
+        applied += round_moves
+        if not round_moves:
+            break
+        if on_round is not None and on_round(gain):
+            break
+        if deadline is not None and time.perf_counter() > deadline:
+            break
+        active = np.unique(touched)
+    return applied
+
+
+class RoundMonitor(object):
+    """Round callback streaming the objective of the local search and stopping it at the targets."""
+
+    def __init__(self, objective, options, lower_bound=None):
+        """Init the monitor.
+
+        Args:
+            objective: Objective of the first tour.
+            options: Search options holding the targets, the on_solution callback and the metrics.
+            lower_bound: Lower bound of the objective, for the target gap.
+        """
+        self.objective = objective
+        self.options = options
+        self.lower_bound = lower_bound
+        self.start = time.perf_counter()
+
+    def __call__(self, gain):
+        """Report the objective after a round.
+
+        Args:
+            gain: Change of the objective during the round.
+
+        Returns:
+            True to stop the search.
+        """
+        self.objective += gain
+        stop = False
+        if self.options.on_solution is not None:
+            stop = self.options.on_solution(self.objective, time.perf_counter() - self.start)
+        if self.options.target_objective is not None and self.objective <= self.options.target_objective:
+            stop = True
+        if self.options.target_gap is not None and self.lower_bound is not None:
+            stop = stop or optimality_gap(self.objective, self.lower_bound) <= self.options.target_gap
+        return stop
+
+
+def solve_local(input_data, options):
+    """Solve a single vehicle TSP with the local search engine.
+
+    The objective of the first tour and after every improving round is
+    reported to the on_solution callback of the options, and the targets of
+    the options stop the search like they stop the routing search.
+
+    Args:
+        input_data: TSP instance data, with a symmetric distance matrix.
+        options: Search options, for the time limit, the targets, the on_solution callback and the metrics.
+
+    Returns:
+        The result.
+    """
+    deadline = time.perf_counter() + options.time_limit if options.time_limit is not None else None
+    matrix = as_matrix(input_data['distance_matrix'])
+    depot = input_data['depot']
+    bound = lower_bound('tsp', input_data)
+    neighbors, neighbor_costs = neighbor_lists(matrix, LOCAL_NEIGHBORS)
+    tour = Tour(greedy_tour(matrix, neighbors))
+    record_phase(options, 'build')
+    monitor = RoundMonitor(int(arc_values(matrix, tour.nodes, np.roll(tour.nodes, -1)).sum()), options, bound)
+    if not monitor(0):
+        moves = improve(matrix, tour, neighbors, neighbor_costs, deadline, monitor)
+        if options.metrics is not None:
+            options.metrics.count('local_search_moves', moves)
+    record_phase(options, 'solve')
+    route = np.append(np.roll(tour.nodes, -int(tour.positions[depot])), depot)
+    objective = int(arc_values(matrix, route[:-1], route[1:]).sum())
+    return SolveResult('tsp', objective, [route.tolist()], [objective], lower_bound=bound)
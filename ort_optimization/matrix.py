@@ -0,0 +1,109 @@
+"""Vectorized distance and time matrices built from coordinates.
+
+Instances may give ``locations`` (planar x, y or latitude, longitude in
+degrees) instead of a precomputed matrix, together with an optional ``metric``
+(euclidean, manhattan or haversine, default euclidean) and ``scale`` applied
+before rounding to integers (default 1). The matrix is computed by blocks of
+rows of bounded size, so the floating point work area stays flat even for 10k+
+nodes and the peak memory is essentially the integer matrix itself.
+
+scipy.spatial is imported when a matrix is first built: its import takes
+longer than the rest of the package, and instances giving a matrix never need it.
+"""
+
+import numpy as np
+
+EARTH_RADIUS = 6371008.8  # meters
+METRICS = ('euclidean', 'manhattan', 'haversine')
+
+
+def unit_vectors(locations):
+    """Return the points of the unit sphere at the given latitudes and longitudes.
+
+    Args:
+        locations: Array of (latitude, longitude) in degrees, one row per point.
+
+    Returns:
+        Array of (x, y, z) coordinates, one row per point.
+    """
+    lat, lon = np.radians(locations).T
+    return np.column_stack((np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)))
+
+
+def haversine(from_vectors, to_vectors):
+    """Return the great circle distances in meters between two sets of points.
+
+    The distances are derived from the chord lengths between unit vectors,
+    which only needs one inverse sine per pair.
+
+    Args:
+        from_vectors: Unit vectors of the points, one row per point.
+        to_vectors: Unit vectors of the points, one row per point.
+
+    Returns:
+        The matrix of distances, one row per point of from_vectors.
+    """
+    from scipy.spatial.distance import cdist  # noqa: WPS433
+
+    block = cdist(from_vectors, to_vectors)
+    block *= 0.5
+    np.clip(block, 0, 1, out=block)
+    np.arcsin(block, out=block)
+    block *= 2 * EARTH_RADIUS
+    return block
+
+
+def distance_bound(locations, metric):
+    """Return an upper bound of the distances between the locations.
+
+    Args:
+        locations: Array of coordinates, one row per point.
+        metric: Name of the metric.
+
+    Returns:
+        The upper bound.
+    """
+    if metric == 'haversine':
+        return np.pi * EARTH_RADIUS
+    extent = locations.max(axis=0) - locations.min(axis=0) if len(locations) else np.zeros(2)
+    if metric == 'manhattan':
+        return float(extent.sum())
+    return float(np.sqrt((extent ** 2).sum()))
+
+
+def build_matrix(locations, metric='euclidean', scale=1, chunk_bytes=16 * 1024 * 1024):
+    """Build the integer distance matrix of a set of locations.
+
+    Args:
+        locations: Coordinates, one (x, y) or (latitude, longitude) pair per node.
+        metric: euclidean, manhattan or haversine.
+        scale: Factor applied to the distances before rounding to integers.
+        chunk_bytes: Size of the floating point block of rows computed at once.
+
+    Raises:
+        ValueError: When the metric is unknown.
+
+    Returns:
+        The matrix, as int32 when every distance fits and int64 otherwise.
+    """
+    from scipy.spatial.distance import cdist  # noqa: WPS433
+
+    if metric not in METRICS:
+        raise ValueError('Unknown metric {0}, expected one of {1}'.format(metric, ', '.join(METRICS)))
+    locations = np.asarray(locations, dtype=np.float64)
+    size = len(locations)
+    dtype = np.int32 if distance_bound(locations, metric) * scale < np.iinfo(np.int32).max else np.int64
+    if metric == 'haversine':
+        locations = unit_vectors(locations)
+    chunk_size = max(1, chunk_bytes // max(1, size * 8))
+    matrix = np.empty((size, size), dtype=dtype)
+    for start in range(0, size, chunk_size):
+        rows = locations[start:start + chunk_size]
+        if metric == 'haversine':
+            block = haversine(rows, locations)
+        else:
+            block = cdist(rows, locations, 'cityblock' if metric == 'manhattan' else 'euclidean')
+        block *= scale
+        np.rint(block, out=block)
+        matrix[start:start + chunk_size] = block
+    return matrix
@@ -0,0 +1,128 @@
+"""Phase timings, counters and search statistics of a solve.
+
+A Metrics object passed in the search options records, at the end of every
+phase of a solve (load, model, constraints, build, solve, extract), the
+seconds since the end of the previous phase and the peak resident set size of
+the process so far. It also counts the invocations of the Python callbacks of
+the search and keeps the statistics of the constraint solver: branches,
+failures, solutions and accepted neighbors. Without metrics the solvers skip
+the bookkeeping, and no Python callback is added to the search.
+
+The arc costs are evaluated natively (see transit), so the only Python
+callbacks of a search are the at solution callbacks.
+"""
+
+import contextlib
+import cProfile
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+SEARCH_STATISTICS = ('branches', 'failures', 'solutions', 'accepted_neighbors', 'wall_time')
+
+
+def peak_rss():
+    """Return the peak resident set size of the process.
+
+    Returns:
+        The size in kilobytes, or None where it is unknown.
+    """
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss // 1024 if sys.platform == 'darwin' else max_rss  # bytes on macOS
+
+
+class Metrics(object):
+    """Timings, peak memory, counters and search statistics of a solve."""
+
+    def __init__(self):
+        """Init the metrics, the first phase starting now."""
+        self.phases = []
+        self.counters = {}
+        self.search = {}
+        self.phase_start = time.perf_counter()
+
+    def lap(self, phase):
+        """Record the end of a phase.
+
+        Args:
+            phase: Name of the phase.
+        """
+        now = time.perf_counter()
+        self.phases.append({'phase': phase, 'elapsed': now - self.phase_start, 'peak_rss': peak_rss()})
+        self.phase_start = now
+
+    def count(self, name, amount=1):
+        """Increment a counter.
+
+        Args:
+            name: Name of the counter.
+            amount: Increment.
+        """
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def record_search(self, routing):
+        """Add the statistics of the solver of a routing model after its search.
+
+        The statistics are summed when a solve runs several searches, e.g. when
+        a pruned model is widened.
+
+        Args:
+            routing: Routing Model searched.
+        """
+        solver = routing.solver()
+        statistics = (
+            solver.Branches(),
+            solver.Failures(),
+            solver.Solutions(),
+            solver.AcceptedNeighbors(),
+            solver.WallTime() / 1000,  # milliseconds
+        )
+        for name, statistic in zip(SEARCH_STATISTICS, statistics):
+            self.search[name] = self.search.get(name, 0) + statistic
+
+    def to_dict(self):
+        """Return the metrics as a JSON serializable dictionary.
+
+        Returns:
+            The metrics fields.
+        """
+        return {'phases': self.phases, 'counters': self.counters, 'search': self.search}
+
+
+def record_phase(options, phase):
+    """Record the end of a phase in the metrics of the search options, if any.
+
+    Args:
+        options: Search options of the solve, or None.
+        phase: Name of the phase.
+    """
+    if options is not None and options.metrics is not None:
+        options.metrics.lap(phase)
+
+
+@contextlib.contextmanager
+def profiled(path):
+    """Profile the block with cProfile and dump the pstats file.
+
+    Args:
+        path: Path of the pstats file, no profiling when None.
+
+    Yields:
+        The profiler, or None.
+    """
+    if path is None:
+        yield None
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
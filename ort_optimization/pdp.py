@@ -1,8 +1,14 @@
 """Vehicle Routing with Pickup Delivery Problem (PDP)."""
-import json
-import sys
+from ortools.constraint_solver import pywrapcp
 
-from ortools.constraint_solver import pywrapcp, routing_enums_pb2
+from ort_optimization.bounds import lower_bound
+from ort_optimization.instance import load_instance
+from ort_optimization.metrics import record_phase
+from ort_optimization.result import extract_solution
+from ort_optimization.search import build_search_parameters, run_search
+from ort_optimization.transit import register_transit_matrix
+
+SPAN_COST_COEFFICIENT = 100
 
 
 class PDP(object):
@@ -20,50 +26,38 @@ class PDP(object):
 
     def create_data_model(self):
         """Store the data for the problem."""
-        try:
-            with open(self.path_input) as json_file:
-                self.input_data = json.load(json_file)
-        except json.decoder.JSONDecodeError as er:
-            print('JSON VALIDATION FAILED')
-            print(er)
-            sys.exit(1)
-
-    def print_solution(self, manager, routing, solution):
+        self.input_data = load_instance(self.path_input)
+
+    def print_solution(self, result):
         """Print solution on console.
 
         Args:
-            manager: Manager for any NodeIndex <-> variable index conversion.
-            routing: Routing Model
-            solution: Solves the current routing model with the given parameters
+            result: Result extracted from the solution.
         """
-        print(f'Objective: {solution.ObjectiveValue()}')
-        total_distance = 0
-        for vehicle_id in range(self.input_data['num_vehicles']):
-            index = routing.Start(vehicle_id)
-            plan_output = 'Route for vehicle {0}:\n'.format(vehicle_id)
-            route_distance = 0
-            while not routing.IsEnd(index):
-                plan_output += ' {0} -> '.format(manager.IndexToNode(index))
-                previous_index = index
-                index = solution.Value(routing.NextVar(index))
-                route_distance += routing.GetArcCostForVehicle(
-                    previous_index, index, vehicle_id,
-                )
-            plan_output += '{0}\n'.format(manager.IndexToNode(index))
-            plan_output += 'Distance of the route: {0}m\n'.format(route_distance)
+        print(f'Objective: {result.objective}')
+        for vehicle_id, (route, route_distance) in enumerate(zip(result.routes, result.costs)):
+            plan_output = ''.join((
+                'Route for vehicle {0}:\n'.format(vehicle_id),
+                ''.join(' {0} -> '.format(node) for node in route[:-1]),
+                '{0}\n'.format(route[-1]),
+                'Distance of the route: {0}m\n'.format(route_distance),
+            ))
             print(plan_output)
-            total_distance += route_distance
-        print('Total Distance of all routes: {0}m'.format(total_distance))
+        print('Total Distance of all routes: {0}m'.format(sum(result.costs)))
 
     @classmethod
-    def solve(cls, path):
+    def solve(cls, path, options=None):
         """Solve the problem.
 
         Args:
             path: Path for the input files.
+            options: Search options overriding the defaults of the solver.
 
+        Returns:
+            The solution found, or None.
         """
         pdp_object = cls(path)
+        record_phase(options, 'load')
 
         # Create the routing index manager.
         manager = pywrapcp.RoutingIndexManager(
@@ -75,22 +69,8 @@ class PDP(object):
         # Create Routing Model.
         routing = pywrapcp.RoutingModel(manager)
 
-        # Define cost of each arc.
-        def distance_callback(from_index, to_index):
-            """Convert from routing variable Index to distance matrix NodeIndex.
-
-            Args:
-                from_index: start node
-                to_index: destination node
-
-            Returns:
-                Returns the distance between the two nodes.
-            """
-            from_node = manager.IndexToNode(from_index)
-            to_node = manager.IndexToNode(to_index)
-            return pdp_object.input_data['distance_matrix'][from_node][to_node]
-
-        transit_callback_index = routing.RegisterTransitCallback(distance_callback)
+        # Register the distance matrix as a native transit callback.
+        transit_callback_index = register_transit_matrix(routing, pdp_object.input_data['distance_matrix'])
         routing.SetArcCostEvaluatorOfAllVehicles(transit_callback_index)
 
         # Add Distance constraint.
@@ -103,7 +83,8 @@ class PDP(object):
             dimension_name,
         )
         distance_dimension = routing.GetDimensionOrDie(dimension_name)
-        distance_dimension.SetGlobalSpanCostCoefficient(100)
+        distance_dimension.SetGlobalSpanCostCoefficient(SPAN_COST_COEFFICIENT)
+        record_phase(options, 'model')
 
         # Define Transportation Requests.
         for request in pdp_object.input_data['pickups_deliveries']:
@@ -117,16 +98,31 @@ class PDP(object):
                 distance_dimension.CumulVar(pickup_index) <=
                 distance_dimension.CumulVar(delivery_index),
             )
+        record_phase(options, 'constraints')
 
         # Setting first solution heuristic.
-        search_parameters = pywrapcp.DefaultRoutingSearchParameters()
-        search_parameters.first_solution_strategy = (
-            routing_enums_pb2.FirstSolutionStrategy.PARALLEL_CHEAPEST_INSERTION
+        search_parameters = build_search_parameters(
+            options,
+            first_solution_strategy='PARALLEL_CHEAPEST_INSERTION',
         )
 
+        # Bound the objective, for the optimality gap.
+        bound = lower_bound('pdp', pdp_object.input_data, SPAN_COST_COEFFICIENT)
+
+        record_phase(options, 'build')
+
         # Solve the problem.
-        solution = routing.SolveWithParameters(search_parameters)
+        solution = run_search(routing, search_parameters, options, lower_bound=bound)
+        record_phase(options, 'solve')
 
         # Print solution on console.
-        if solution:
-            pdp_object.print_solution(manager, routing, solution)
+        if not solution:
+            return None
+        result = extract_solution(
+            'pdp', manager, routing, solution,
+            pdp_object.input_data['distance_matrix'],
+            lower_bound=bound,
+        )
+        pdp_object.print_solution(result)
+        record_phase(options, 'extract')
+        return result
@@ -0,0 +1,127 @@
+"""Portfolio of search configurations raced across worker processes.
+
+The routing search of OR-Tools is single threaded. The portfolio builds the
+same model in several worker processes, each one searching with a different
+first solution strategy and metaheuristic under a shared deadline, and keeps
+the best solution.
+"""
+
+import contextlib
+import io
+import multiprocessing
+import os
+import queue
+import time
+
+from ort_optimization.search import SearchOptions
+from ort_optimization.solvers import get_solver
+
+DEFAULT_CONFIGURATIONS = (
+    ('PATH_CHEAPEST_ARC', 'GUIDED_LOCAL_SEARCH'),
+    ('PARALLEL_CHEAPEST_INSERTION', 'GUIDED_LOCAL_SEARCH'),
+    ('SAVINGS', 'GUIDED_LOCAL_SEARCH'),
+    ('PATH_CHEAPEST_ARC', 'TABU_SEARCH'),
+    ('PATH_CHEAPEST_ARC', 'SIMULATED_ANNEALING'),
+    ('CHRISTOFIDES', 'GUIDED_LOCAL_SEARCH'),
+    ('GLOBAL_CHEAPEST_ARC', 'GUIDED_LOCAL_SEARCH'),
+    ('LOCAL_CHEAPEST_INSERTION', 'TABU_SEARCH'),
+)
+
+# Extra time granted to the workers to build the model and report back.
+GRACE_PERIOD = 5
+
+
+def solve_configuration(problem, path, configuration_id, configuration, time_limit, target_objective, results):
+    """Solve an instance with one configuration and put the outcome on the queue.
+
+    Args:
+        problem: Problem name.
+        path: Path of the instance.
+        configuration_id: Position of the configuration in the portfolio.
+        configuration: Pair of first solution strategy and metaheuristic names.
+        time_limit: Time limit of the search in seconds.
+        target_objective: Objective at which the search stops, or None.
+        results: Queue receiving (configuration_id, result, error) tuples.
+    """
+    first_solution_strategy, local_search_metaheuristic = configuration
+    options = SearchOptions(
+        first_solution_strategy=first_solution_strategy,
+        local_search_metaheuristic=local_search_metaheuristic,
+        time_limit=time_limit,
+        target_objective=target_objective,
+    )
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = get_solver(problem).solve(path, options)
+    except (Exception, SystemExit) as er:  # noqa: B902
+        results.put((configuration_id, None, repr(er)))
+    else:
+        results.put((configuration_id, result, None))
+
+
+def solve_portfolio(problem, path, time_limit, configurations=DEFAULT_CONFIGURATIONS, workers=None, target_objective=None):
+    """Race several search configurations and return the best solution.
+
+    The workers still running are terminated once every configuration has
+    reported, when one of them reaches the target objective or at the deadline.
+
+    Args:
+        problem: Problem name.
+        path: Path of the instance.
+        time_limit: Shared time limit of the searches in seconds.
+        configurations: Pairs of first solution strategy and metaheuristic names.
+        workers: Number of configurations raced, defaults to the number of CPUs.
+        target_objective: Objective at which the portfolio stops, or None.
+
+    Returns:
+        The best result, or None, and one outcome record per configuration with
+        the winning one flagged.
+    """
+    configurations = list(configurations)[:workers or os.cpu_count()]
+    context = multiprocessing.get_context()
+    results = context.Queue()
+    processes = [
+        context.Process(
+            target=solve_configuration,
+            args=(problem, path, configuration_id, configuration, time_limit, target_objective, results),
+            daemon=True,
+        )
+        for configuration_id, configuration in enumerate(configurations)
+    ]
+    outcomes = [
+        {
+            'first_solution_strategy': first_solution_strategy,
+            'local_search_metaheuristic': local_search_metaheuristic,
+            'status': 'cancelled',
+        }
+        for first_solution_strategy, local_search_metaheuristic in configurations
+    ]
+    best = None
+    best_id = None
+    deadline = time.monotonic() + time_limit + GRACE_PERIOD
+    for process in processes:
+        process.start()
+    try:
+        for _ in processes:
+            try:
+                configuration_id, result, error = results.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                break
+            outcome = outcomes[configuration_id]
+            if error:
+                outcome.update(status='error', error=error)
+                continue
+            outcome.update(status='ok', objective=result.objective if result else None)
+            if result and (best is None or result.objective < best.objective):
+                best = result
+                best_id = configuration_id
+            if best and target_objective is not None and best.objective <= target_objective:
+                break
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+            process.join()
+    if best_id is not None:
+        outcomes[best_id]['winner'] = True
+    return best, outcomes
@@ -0,0 +1,147 @@
+"""Nearest-neighbor arc pruning for large routing instances.
+
+Most of the N² arcs of a large instance never appear in a good solution. The
+pruning keeps, for every stop, the arcs towards its k nearest stops (in either
+direction) and the arcs back to the depot, by reducing the domain of its next
+variable. The first solution and local search phases then scan far smaller
+neighborhoods.
+"""
+
+import copy
+
+import numpy as np
+
+# Time limit in seconds of a pruned search without one, so that a pruned model
+# with no solution gives up and widens its neighborhoods.
+PRUNED_TIME_LIMIT = 10
+
+
+def nearest_neighbors(matrix, neighbors):
+    """Return the k nearest successors of every node.
+
+    Args:
+        matrix: Square cost matrix indexed by node.
+        neighbors: Number of successors kept per node.
+
+    Returns:
+        Array with one row of successor nodes per node.
+    """
+    matrix = np.asarray(matrix, dtype=np.float64)
+    size = len(matrix)
+    neighbors = min(neighbors, size - 1)
+    costs = matrix.copy()
+    np.fill_diagonal(costs, np.inf)
+    return np.argpartition(costs, neighbors - 1, axis=1)[:, :neighbors]
+
+
+def allowed_successors(matrix, neighbors):
+    """Return the boolean matrix of the arcs kept by the pruning, depot arcs aside.
+
+    An arc is kept when either end is among the nearest neighbors of the other.
+
+    Args:
+        matrix: Square cost matrix indexed by node.
+        neighbors: Number of nearest neighbors per node.
+
+    Returns:
+        Boolean matrix, True for kept arcs.
+    """
+    size = len(matrix)
+    allowed = np.zeros((size, size), dtype=bool)
+    allowed[np.arange(size)[:, None], nearest_neighbors(matrix, neighbors)] = True
+    return allowed | allowed.T
+
+
+def restrict_successors(manager, routing, allowed, depot):
+    """Restrict the successors of every stop to the allowed stops and the route ends.
+
+    Args:
+        manager: Manager for any NodeIndex <-> variable index conversion.
+        routing: Routing Model.
+        allowed: Boolean matrix indexed by node, True for the arcs kept.
+        depot: Depot node.
+    """
+    ends = [routing.End(vehicle) for vehicle in range(manager.GetNumberOfVehicles())]
+    for node in range(len(allowed)):
+        if node == depot:
+            continue
+        successors = [
+            manager.NodeToIndex(int(successor))
+            for successor in np.flatnonzero(allowed[node])
+            if successor != depot
+        ]
+        routing.NextVar(manager.NodeToIndex(node)).SetValues(successors + ends)
+
+
+def restrict_arcs(manager, routing, matrix, depot, neighbors):
+    """Restrict the successors of every stop to its nearest neighbors and the depot.
+
+    Args:
+        manager: Manager for any NodeIndex <-> variable index conversion.
+        routing: Routing Model.
+        matrix: Square cost matrix indexed by node.
+        depot: Depot node.
+        neighbors: Number of nearest neighbors per node, None to keep every arc.
+
+    Raises:
+        ValueError: When the number of neighbors is below one.
+
+    Returns:
+        True if some arcs were removed, False if the model is unchanged.
+    """
+    if neighbors is not None and neighbors < 1:
+        raise ValueError('The number of neighbors must be at least 1, got {0}'.format(neighbors))
+    size = len(matrix)
+    if neighbors is None or neighbors >= size - 1:
+        return False
+    restrict_successors(manager, routing, allowed_successors(matrix, neighbors), depot)
+    return True
+
+
+def pruned_arc_ratio(matrix, neighbors):
+    """Return the fraction of the arcs between stops removed by the pruning.
+
+    Args:
+        matrix: Square cost matrix indexed by node.
+        neighbors: Number of nearest neighbors per node.
+
+    Returns:
+        The ratio of removed arcs.
+    """
+    size = len(matrix)
+    if neighbors is None or neighbors >= size - 1:
+        return 0.0
+    return 1 - (allowed_successors(matrix, neighbors).sum() / (size * (size - 1)))
+
+
+def bound_search(search_parameters, time_limit=PRUNED_TIME_LIMIT):
+    """Set a time limit on the search parameters of a pruned model, unless one is set.
+
+    Args:
+        search_parameters: Search parameters of the routing model.
+        time_limit: Time limit in seconds.
+    """
+    if not search_parameters.HasField('time_limit'):
+        search_parameters.time_limit.FromMilliseconds(int(time_limit * 1000))
+
+
+def widen_neighbors(options, elapsed):
+    """Return a copy of the search options with twice as many neighbors, and the time left.
+
+    The neighbors always grow, so the retries end with an unpruned model
+    once they reach the number of stops.
+
+    Args:
+        options: Search options with a number of neighbors.
+        elapsed: Seconds already spent by the solve.
+
+    Returns:
+        The widened search options, or None when their time limit is spent.
+    """
+    if options.time_limit is not None and elapsed >= options.time_limit:
+        return None
+    widened = copy.copy(options)
+    widened.neighbors = max(options.neighbors * 2, options.neighbors + 1)
+    if options.time_limit is not None:
+        widened.time_limit = options.time_limit - elapsed
+    return widened
@@ -0,0 +1,195 @@
+"""Result of a solve, independent from the OR-Tools objects."""
+
+import json
+
+import numpy as np
+
+from ort_optimization.compact import SymmetricMatrix
+
+
+def optimality_gap(objective, bound):
+    """Return the relative gap of an objective to a lower bound.
+
+    Args:
+        objective: Objective value of a solution.
+        bound: Lower bound of the objective.
+
+    Returns:
+        The gap, as a fraction of the objective.
+    """
+    if objective <= 0:
+        return 0.0
+    return max(objective - bound, 0) / objective
+
+
+class SolveResult(object):
+    """Objective, routes and per route totals of a solution."""
+
+    def __init__(self, problem, objective, routes, costs=None, loads=None, times=None, lower_bound=None):
+        """Init the result.
+
+        Args:
+            problem: Problem name, e.g. vrp.
+            objective: Objective value of the solution.
+            routes: One list of nodes per vehicle, from its start to its end.
+            costs: Arc cost of every route.
+            loads: Demand served by every route, for the problems with demands.
+            times: One [min, max] time cumul per node of every route, for the
+                problems with time windows.
+            lower_bound: Lower bound of the objective, see ort_optimization.bounds.
+        """
+        self.problem = problem
+        self.objective = objective
+        self.routes = routes
+        self.costs = costs
+        self.loads = loads
+        self.times = times
+        self.lower_bound = lower_bound
+
+    @property
+    def gap(self):
+        """Optimality gap of the solution.
+
+        Returns:
+            The gap to the lower bound as a fraction of the objective, None without bound.
+        """
+        if self.lower_bound is None:
+            return None
+        return optimality_gap(self.objective, self.lower_bound)
+
+    @classmethod
+    def from_dict(cls, result_fields):
+        """Create a result from the dictionary returned by to_dict.
+
+        Args:
+            result_fields: The result fields.
+
+        Returns:
+            The result.
+        """
+        return cls(
+            result_fields['problem'],
+            result_fields['objective'],
+            result_fields['routes'],
+            result_fields.get('costs'),
+            result_fields.get('loads'),
+            result_fields.get('times'),
+            result_fields.get('lower_bound'),
+        )
+
+    def to_dict(self):
+        """Return the result as a JSON serializable dictionary.
+
+        Returns:
+            The result fields, without the totals the problem does not have.
+        """
+        result_fields = {
+            'problem': self.problem,
+            'objective': self.objective,
+            'routes': self.routes,
+        }
+        for name in ('costs', 'loads', 'times', 'lower_bound', 'gap'):
+            if getattr(self, name) is not None:
+                result_fields[name] = getattr(self, name)
+        return result_fields
+
+    def to_json(self):
+        """Return the result as a single line JSON document.
+
+        Returns:
+            The JSON text.
+        """
+        return json.dumps(self.to_dict())
+
+
+def write_ndjson(results, stream):
+    """Write results as newline delimited JSON, one line per result.
+
+    Args:
+        results: Iterable of results.
+        stream: Text stream written to.
+    """
+    for result in results:
+        stream.write('{0}\n'.format(result.to_json()))
+
+
+def walk_routes(manager, routing, solution, time_dimension=None):
+    """Read the route of every vehicle, and optionally its time cumuls, in one pass.
+
+    The successor of every variable index is read once, then the routes are
+    followed in plain Python.
+
+    Args:
+        manager: Manager for any NodeIndex <-> variable index conversion.
+        routing: Routing Model
+        solution: Solution assignment of the routing model.
+        time_dimension: Dimension whose cumuls are read, if any.
+
+    Returns:
+        One list of nodes per vehicle, from its start to its end, and one list
+        of [min, max] cumuls per vehicle, or None without time dimension.
+    """
+    successors = [solution.Value(routing.NextVar(index)) for index in range(routing.Size())]
+    routes = []
+    times = [] if time_dimension else None
+    for vehicle_id in range(routing.vehicles()):
+        indices = [routing.Start(vehicle_id)]
+        while not routing.IsEnd(indices[-1]):
+            indices.append(successors[indices[-1]])
+        routes.append([manager.IndexToNode(index) for index in indices])
+        if time_dimension:
+            cumuls = [time_dimension.CumulVar(index) for index in indices]
+            times.append([[solution.Min(cumul), solution.Max(cumul)] for cumul in cumuls])
+    return routes, times
+
+
+def arc_values(matrix, from_nodes, to_nodes):
+    """Return the matrix entries of a sequence of arcs.
+
+    Args:
+        matrix: Square matrix indexed by node, as nested lists, an array or a SymmetricMatrix.
+        from_nodes: Array of the tail node of every arc.
+        to_nodes: Array of the head node of every arc.
+
+    Returns:
+        Array of the entries of the arcs.
+    """
+    if isinstance(matrix, (np.ndarray, SymmetricMatrix)):
+        return matrix[from_nodes, to_nodes].astype(np.int64)
+    arcs = zip(from_nodes.tolist(), to_nodes.tolist())
+    return np.fromiter((matrix[from_node][to_node] for from_node, to_node in arcs), dtype=np.int64, count=len(from_nodes))
+
+
+def extract_solution(problem, manager, routing, solution, matrix, demands=None, time_dimension=None, lower_bound=None):
+    """Extract the result of a solution in one pass, with vectorized route totals.
+
+    The arc costs are read from the matrix the arc cost evaluator was built
+    from, so they match GetArcCostForVehicle.
+
+    Args:
+        problem: Problem name, e.g. vrp.
+        manager: Manager for any NodeIndex <-> variable index conversion.
+        routing: Routing Model
+        solution: Solution assignment of the routing model.
+        matrix: Cost matrix of the arcs indexed by node.
+        demands: Demand of every node, for the problems with demands.
+        time_dimension: Time dimension, for the problems with time windows.
+        lower_bound: Lower bound of the objective, if any.
+
+    Returns:
+        The result.
+    """
+    routes, times = walk_routes(manager, routing, solution, time_dimension)
+    nodes = np.concatenate([np.asarray(route, dtype=np.int64) for route in routes])
+    starts = np.cumsum([0] + [len(route) for route in routes[:-1]])
+    ends = starts + [len(route) - 1 for route in routes]
+    arc_costs = np.zeros(len(nodes), dtype=np.int64)
+    arc_costs[:-1] = arc_values(matrix, nodes[:-1], nodes[1:])
+    arc_costs[ends] = 0  # no arc from the end of a route to the start of the next one
+    costs = np.add.reduceat(arc_costs, starts).tolist()
+    loads = None
+    if demands is not None:
+        node_demands = np.asarray(demands, dtype=np.int64)[nodes]
+        node_demands[ends] = 0  # the end depot is not served
+        loads = np.add.reduceat(node_demands, starts).tolist()
+    return SolveResult(problem, solution.ObjectiveValue(), routes, costs, loads, times, lower_bound)
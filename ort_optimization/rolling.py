@@ -0,0 +1,376 @@
+"""Rolling horizon planning of a stream of orders.
+
+Orders arrive as JSON events, one per line, from stdin or from the clients
+of a local TCP socket::
+
+    {"type": "order", "id": "a1", "time": 12, "location": [3.5, 7], "demand": 2, "time_window": [30, 90]}
+    {"type": "cancel", "id": "a1", "time": 20}
+    {"type": "tick", "time": 25}
+
+``time`` is the clock of the stream, in the unit of the travel times; an
+event without one happens at the current clock, and ``tick`` only moves the
+clock. ``demand`` (default 1) and ``time_window`` (default up to the end of
+the day) are optional.
+
+The fleet is described by a JSON configuration::
+
+    {"depot": [0, 0], "num_vehicles": 10, "vehicle_capacities": [20, ...],
+     "metric": "euclidean", "scale": 1, "horizon": 1440, "service_time": 5}
+
+where the vehicle capacities, the metric and scale of the travel times (see
+ort_optimization.matrix), the end of the day and the time spent at every
+stop are optional.
+
+Every ``interval`` of the clock, the open orders are re-planned in one
+TWCP-style model: travel times from the locations, the time windows of the
+orders, the capacities of the vehicles, and the vehicles leaving the depot
+no earlier than the re-plan and than their return from their previous route.
+An order that does not fit is left out of the plan until a later cycle; an
+order whose window has closed, or opens after the end of the day, is
+rejected, and the windows closing after the end of the day are cut there. Departures are planned as late as
+the time windows allow, and the routes leaving before the next re-plan are
+committed: they are final, their orders are forgotten and their vehicle is
+busy until its return. Each cycle only holds the open orders, so its latency
+and memory do not grow with the length of the day.
+
+The planner writes JSON records, one per line:
+
+* ``commit``: a committed route, its vehicle, orders, arrivals, departure and return;
+* ``plan``: after every re-plan, the routes changed since the previous one;
+* ``reject``: an order that could not be served;
+* ``error``: an invalid event, which is skipped;
+* ``summary``: the counts of the stream, at its end.
+"""
+
+import contextlib
+import io
+import json
+import queue
+import socketserver
+import sys
+import time
+
+import numpy as np
+from ortools.constraint_solver import pywrapcp
+
+from ort_optimization.matrix import build_matrix
+from ort_optimization.result import walk_routes
+from ort_optimization.search import SearchOptions, build_search_parameters, run_search
+from ort_optimization.transit import register_transit_matrix, register_unary_transit_vector
+
+EVENT_TYPES = ('order', 'cancel', 'tick')
+DEFAULT_INTERVAL = 5
+DEFAULT_HORIZON = 1440
+# Search defaults of a re-plan, the time limit in seconds.
+CYCLE_SEARCH = {'time_limit': 1}
+# Penalty of an order left out of a plan, in longest arcs, so that serving an order is always cheaper.
+DROP_PENALTY_FACTOR = 10
+
+
+def emit_json(record):
+    """Write a record on stdout as a JSON line.
+
+    Args:
+        record: JSON serializable record.
+    """
+    sys.stdout.write('{0}\n'.format(json.dumps(record)))
+    sys.stdout.flush()
+
+
+class RollingPlanner(object):
+    """Planner of a stream of order events, see the module documentation."""
+
+    def __init__(self, config, interval=DEFAULT_INTERVAL, lookahead=None, options=None, emit=emit_json):
+        """Init the planner.
+
+        Args:
+            config: Fleet configuration.
+            interval: Clock time between two re-plans.
+            lookahead: Only plan the orders whose window opens within this clock
+                time of the re-plan, every open order when None.
+            options: Search options overriding CYCLE_SEARCH.
+            emit: Called with every output record.
+        """
+        self.depot = list(config['depot'])
+        self.num_vehicles = config['num_vehicles']
+        self.capacities = config.get('vehicle_capacities')
+        self.metric = config.get('metric', 'euclidean')
+        self.scale = config.get('scale', 1)
+        self.horizon = config.get('horizon', DEFAULT_HORIZON)
+        self.service_time = config.get('service_time', 0)
+        self.interval = interval
+        self.lookahead = lookahead
+        self.options = options or SearchOptions()
+        self.emit = emit
+        self.clock = None
+        self.next_cycle = None
+        self.pending = {}
+        self.plan = {}
+        self.available = [0] * self.num_vehicles
+        self.counts = dict.fromkeys(('events', 'orders', 'cancelled', 'committed', 'rejected', 'cycles', 'errors'), 0)
+
+    def process(self, event):
+        """Apply an event, after the re-plans due by its time.
+
+        Args:
+            event: Decoded event.
+
+        Raises:
+            ValueError: When the event is invalid.
+        """
+        if not isinstance(event, dict):
+            raise ValueError('Event {0} is not a JSON object'.format(json.dumps(event)))
+        event_type = event.get('type')
+        if event_type not in EVENT_TYPES:
+            raise ValueError('Unknown event type {0}, expected one of {1}'.format(event_type, ', '.join(EVENT_TYPES)))
+        event_time = int(event.get('time', self.clock or 0))
+        self.advance(event_time)
+        self.counts['events'] += 1
+        if event_type == 'order':
+            self.add_order(event)
+        elif event_type == 'cancel':
+            if event.get('id') not in self.pending:
+                raise ValueError('Unknown or committed order {0}'.format(event.get('id')))
+            self.pending.pop(event['id'])
+            self.counts['cancelled'] += 1
+
+    def add_order(self, event):
+        """Add an order event to the open orders.
+
+        Args:
+            event: Decoded order event.
+
+        Raises:
+            ValueError: When the order is invalid or its id is already open.
+        """
+        order_id = event.get('id')
+        if order_id is None or order_id in self.pending:
+            raise ValueError('Missing or duplicate order id {0}'.format(order_id))
+        location = [float(coordinate) for coordinate in event['location']]
+        open_time, close_time = (int(bound) for bound in event.get('time_window', (0, self.horizon)))
+        if len(location) != len(self.depot) or open_time > close_time:
+            raise ValueError('Invalid location or time window of order {0}'.format(order_id))
+        self.counts['orders'] += 1
+        if open_time > self.horizon:
+            self.reject(order_id, 'after horizon', self.clock)
+            return
+        close_time = min(close_time, self.horizon)
+        if close_time < self.clock:
+            self.reject(order_id, 'expired', self.clock)
+            return
+        self.pending[order_id] = {
+            'location': location,
+            'demand': int(event.get('demand', 1)),
+            'time_window': (open_time, close_time),
+        }
+
+    def advance(self, event_time):
+        """Move the clock to the time of an event, re-planning on the way.
+
+        Events are applied in the order they are read, so an event older than
+        the clock happens at the clock.
+
+        Args:
+            event_time: Clock time of the event.
+        """
+        if self.clock is None:
+            self.clock = event_time
+            self.next_cycle = event_time + self.interval
+        self.clock = max(self.clock, event_time)
+        while self.next_cycle <= self.clock:
+            self.cycle(self.next_cycle)
+            self.next_cycle += self.interval
+
+    def reject(self, order_id, reason, now):
+        """Reject an order.
+
+        Args:
+            order_id: Id of the order.
+            reason: Why the order is rejected.
+            now: Clock time of the rejection.
+        """
+        self.pending.pop(order_id, None)
+        self.counts['rejected'] += 1
+        self.emit({'event': 'reject', 'time': now, 'order': order_id, 'reason': reason})
+
+    def cycle(self, now, final=False):
+        """Re-plan the open orders and commit the routes leaving before the next re-plan.
+
+        Args:
+            now: Clock time of the re-plan.
+            final: Commit every route, at the end of the stream.
+        """
+        start = time.perf_counter()
+        self.counts['cycles'] += 1
+        for order_id in [order_id for order_id, order in self.pending.items() if order['time_window'][1] < now]:
+            self.reject(order_id, 'expired', now)
+        plan, objective = self.replan(now)
+        for vehicle, route in sorted(plan.items()):
+            if final or route['departure'] < now + self.interval:
+                self.commit(now, vehicle, plan.pop(vehicle))
+        changes = {
+            vehicle: route
+            for vehicle, route in plan.items()
+            if self.plan.get(vehicle) != route
+        }
+        changes.update({vehicle: None for vehicle in self.plan if vehicle not in plan})
+        self.plan = plan
+        self.emit({
+            'event': 'plan',
+            'time': now,
+            'elapsed': round(time.perf_counter() - start, 6),
+            'open': len(self.pending),
+            'planned': sum(len(route['orders']) for route in plan.values()),
+            'objective': objective,
+            'changes': {str(vehicle): route for vehicle, route in sorted(changes.items())},
+        })
+
+    def commit(self, now, vehicle, route):
+        """Commit a route, forgetting its orders.
+
+        Args:
+            now: Clock time of the re-plan.
+            vehicle: Vehicle of the route.
+            route: Planned route.
+        """
+        for order_id in route['orders']:
+            self.pending.pop(order_id)
+        self.available[vehicle] = route['return']
+        self.counts['committed'] += len(route['orders'])
+        self.emit(dict({'event': 'commit', 'time': now, 'vehicle': vehicle}, **route))
+
+    def replan(self, now):
+        """Plan the open orders.
+
+        Args:
+            now: Clock time of the re-plan.
+
+        Returns:
+            The routes with orders by vehicle, each with its orders, their
+            arrival times, departure and return, and the objective of the plan, or None without any.
+        """
+        order_ids = [
+            order_id
+            for order_id, order in self.pending.items()
+            if self.lookahead is None or order['time_window'][0] <= now + self.lookahead
+        ]
+        if not order_ids:
+            return {}, None
+        orders = [self.pending[order_id] for order_id in order_ids]
+        matrix = build_matrix([self.depot] + [order['location'] for order in orders], self.metric, self.scale)
+        time_matrix = matrix + np.array([0] + [self.service_time] * len(orders))[:, None]
+
+        # Create the routing index manager and the routing model of the open orders.
+        manager = pywrapcp.RoutingIndexManager(len(matrix), self.num_vehicles, 0)
+        routing = pywrapcp.RoutingModel(manager)
+        routing.SetArcCostEvaluatorOfAllVehicles(register_transit_matrix(routing, matrix))
+
+        # Add the time windows, the vehicles leaving once back and no earlier than now.
+        routing.AddDimension(
+            register_transit_matrix(routing, time_matrix),
+            self.horizon,  # allow waiting time
+            self.horizon,  # end of the day
+            False,  # noqa: WPS425 Don't force start cumul to zero.
+            'Time',
+        )
+        time_dimension = routing.GetDimensionOrDie('Time')
+        penalty = DROP_PENALTY_FACTOR * max(int(matrix.max()), 1)
+        for node, order in enumerate(orders, 1):
+            index = manager.NodeToIndex(node)
+            open_time, close_time = order['time_window']
+            time_dimension.CumulVar(index).SetRange(min(max(open_time, now), close_time), close_time)
+            routing.AddDisjunction([index], penalty)
+        for vehicle in range(self.num_vehicles):
+            departure = min(max(now, self.available[vehicle]), self.horizon)
+            time_dimension.CumulVar(routing.Start(vehicle)).SetRange(departure, self.horizon)
+
+        # Add the capacities of the vehicles.
+        if self.capacities is not None:
+            routing.AddDimensionWithVehicleCapacity(
+                register_unary_transit_vector(routing, [0] + [order['demand'] for order in orders]),
+                0,  # null capacity slack
+                self.capacities,
+                True,  # noqa: WPS425
+                'Capacity',
+            )
+
+        # Leave as late as the windows allow, so that later orders can still join the route.
+        for vehicle in range(self.num_vehicles):
+            routing.AddVariableMaximizedByFinalizer(time_dimension.CumulVar(routing.Start(vehicle)))
+            routing.AddVariableMinimizedByFinalizer(time_dimension.CumulVar(routing.End(vehicle)))
+
+        search_parameters = build_search_parameters(self.options, first_solution_strategy='PATH_CHEAPEST_ARC', **CYCLE_SEARCH)
+
+        # Search from the previous plan, the new orders left out.
+        nodes = {order_id: node for node, order_id in enumerate(order_ids, 1)}
+        initial_routes = [
+            [manager.NodeToIndex(nodes[order_id]) for order_id in self.plan[vehicle]['orders'] if order_id in nodes]
+            if vehicle in self.plan else []
+            for vehicle in range(self.num_vehicles)
+        ]
+        with contextlib.redirect_stdout(io.StringIO()):
+            solution = run_search(routing, search_parameters, self.options, initial_routes if any(initial_routes) else None)
+        if not solution:
+            return {}, None
+        routes, times = walk_routes(manager, routing, solution, time_dimension)
+        plan = {}
+        for vehicle, (route, route_times) in enumerate(zip(routes, times)):
+            if len(route) > 2:
+                plan[vehicle] = {
+                    'orders': [order_ids[node - 1] for node in route[1:-1]],
+                    'arrivals': [arrival for arrival, _ in route_times[1:-1]],
+                    'departure': route_times[0][0],
+                    'return': route_times[-1][0],
+                }
+        return plan, solution.ObjectiveValue()
+
+    def close(self):
+        """Plan and commit the open orders at the end of the stream, then write a summary."""
+        if self.pending or self.plan:
+            self.cycle(self.clock, final=True)
+            for order_id in list(self.pending):
+                self.reject(order_id, 'unplanned', self.clock)
+        self.emit(dict(self.counts, event='summary'))
+
+
+def run_stream(planner, lines):
+    """Feed lines of JSON events to a planner, then close it.
+
+    Args:
+        planner: Rolling planner.
+        lines: Iterable of JSON lines.
+    """
+    for line_number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            planner.process(json.loads(line))
+        except (ValueError, TypeError, KeyError) as er:
+            planner.counts['errors'] += 1
+            planner.emit({'event': 'error', 'line': line_number, 'error': str(er)})
+    planner.close()
+
+
+class EventRequestHandler(socketserver.StreamRequestHandler):
+    """Connection of an event source, whose lines are queued for the planner."""
+
+    def handle(self):
+        """Queue every line received."""
+        for line in self.rfile:
+            self.server.lines.put(line.decode())
+
+
+def make_event_server(host='127.0.0.1', port=7000):
+    """Create the TCP server queueing the events of any number of connections.
+
+    Args:
+        host: Interface to listen on.
+        port: Port to listen on, 0 for any free port.
+
+    Returns:
+        The server, not serving yet, with the queue of the lines received as ``lines``.
+    """
+    server = socketserver.ThreadingTCPServer((host, port), EventRequestHandler)
+    server.daemon_threads = True
+    server.lines = queue.Queue()
+    return server
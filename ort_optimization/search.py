@@ -0,0 +1,187 @@
+"""Search parameters shared by all the routing solvers."""
+
+import time
+
+from ortools.constraint_solver import pywrapcp, routing_enums_pb2
+
+from ort_optimization.result import optimality_gap
+
+
+class SearchOptions(object):
+    """Options of the routing search, overriding the defaults of each solver."""
+
+    def __init__(
+        self,
+        first_solution_strategy=None,
+        local_search_metaheuristic=None,
+        time_limit=None,
+        solution_limit=None,
+        lns_time_limit=None,
+        target_objective=None,
+        on_solution=None,
+        initial_routes=None,
+        neighbors=None,
+        metrics=None,
+        window_pruning=None,
+        dock_scheduling=None,
+        target_gap=None,
+        engine=None,
+    ):
+        """Init the search options, None keeps the default of the solver.
+
+        Args:
+            first_solution_strategy: Name of a FirstSolutionStrategy, e.g. PATH_CHEAPEST_ARC.
+            local_search_metaheuristic: Name of a LocalSearchMetaheuristic, e.g. GUIDED_LOCAL_SEARCH.
+            time_limit: Time limit of the search in seconds.
+            solution_limit: Maximum number of solutions explored by the search.
+            lns_time_limit: Time limit in seconds of each large neighborhood search sub-problem.
+            target_objective: Stop the search as soon as a solution reaches this objective.
+            on_solution: Called with the objective and the elapsed seconds of
+                every improving solution; returning True stops the search.
+            initial_routes: Previous route plan seeding the search, one list of nodes per vehicle.
+            neighbors: Keep only the arcs towards the k nearest neighbors of every stop.
+            metrics: Metrics recording the phases of the solve.
+            window_pruning: False to keep the time windows and the arcs they make
+                impossible, which are removed by default.
+            dock_scheduling: joint (default) or two_stage, how TWDCP schedules
+                the depot docks, see ort_optimization.twdcp.
+            target_gap: Stop the search as soon as a solution is within this
+                fraction of its objective from the lower bound of the instance,
+                see ort_optimization.bounds.
+            engine: auto (default), local or routing, how TSP solves single
+                vehicle instances, see ort_optimization.tsp.
+        """
+        self.first_solution_strategy = first_solution_strategy
+        self.local_search_metaheuristic = local_search_metaheuristic
+        self.time_limit = time_limit
+        self.solution_limit = solution_limit
+        self.lns_time_limit = lns_time_limit
+        self.target_objective = target_objective
+        self.on_solution = on_solution
+        self.initial_routes = initial_routes
+        self.neighbors = neighbors
+        self.metrics = metrics
+        self.window_pruning = window_pruning
+        self.dock_scheduling = dock_scheduling
+        self.target_gap = target_gap
+        self.engine = engine
+
+
+class SolutionMonitor(object):
+    """At solution callback streaming the improving solutions of a search and counting its calls."""
+
+    def __init__(self, routing, options, lower_bound=None):
+        """Init the monitor.
+
+        Args:
+            routing: Routing Model.
+            options: Search options holding the targets, the on_solution callback and the metrics.
+            lower_bound: Lower bound of the objective, for the target gap.
+        """
+        self.routing = routing
+        self.options = options
+        self.lower_bound = lower_bound
+        self.start = time.perf_counter()
+        self.best_objective = None
+
+    def __call__(self):
+        """Report an improving solution and finish the search when requested."""
+        metrics = self.options.metrics
+        if metrics is not None:
+            metrics.count('at_solution_callbacks')
+        objective = self.routing.CostVar().Max()
+        if self.best_objective is not None and objective >= self.best_objective:
+            return
+        self.best_objective = objective
+        stop = False
+        if self.options.on_solution is not None:
+            if metrics is not None:
+                metrics.count('on_solution_calls')
+            stop = self.options.on_solution(objective, time.perf_counter() - self.start)
+        if self.options.target_objective is not None and objective <= self.options.target_objective:
+            stop = True
+        if self.options.target_gap is not None and self.lower_bound is not None:
+            stop = stop or optimality_gap(objective, self.lower_bound) <= self.options.target_gap
+        if stop:
+            self.routing.solver().FinishCurrentSearch()
+
+
+def build_search_parameters(
+    options=None,
+    first_solution_strategy='PATH_CHEAPEST_ARC',
+    local_search_metaheuristic=None,
+    time_limit=None,
+):
+    """Build the routing search parameters of a solver.
+
+    The keyword arguments are the defaults of the solver, used for every option
+    left to None.
+
+    Args:
+        options: Search options given by the caller.
+        first_solution_strategy: Default first solution strategy name.
+        local_search_metaheuristic: Default local search metaheuristic name.
+        time_limit: Default time limit in seconds.
+
+    Returns:
+        The routing search parameters.
+    """
+    options = options or SearchOptions()
+    first_solution_strategy = options.first_solution_strategy or first_solution_strategy
+    local_search_metaheuristic = options.local_search_metaheuristic or local_search_metaheuristic
+    if options.time_limit is not None:
+        time_limit = options.time_limit
+
+    search_parameters = pywrapcp.DefaultRoutingSearchParameters()
+    search_parameters.first_solution_strategy = (
+        getattr(routing_enums_pb2.FirstSolutionStrategy, first_solution_strategy)
+    )
+    if local_search_metaheuristic:
+        search_parameters.local_search_metaheuristic = (
+            getattr(routing_enums_pb2.LocalSearchMetaheuristic, local_search_metaheuristic)
+        )
+    if time_limit is not None:
+        search_parameters.time_limit.FromMilliseconds(int(time_limit * 1000))
+    if options.solution_limit is not None:
+        search_parameters.solution_limit = options.solution_limit
+    if options.lns_time_limit is not None:
+        search_parameters.lns_time_limit.FromMilliseconds(int(options.lns_time_limit * 1000))
+    return search_parameters
+
+
+def run_search(routing, search_parameters, options=None, initial_routes=None, lower_bound=None):
+    """Attach the monitors requested by the options and solve the model.
+
+    When the initial routes are not a feasible solution of the model, the
+    search starts from scratch with the first solution strategy. With metrics,
+    the statistics of the search are added to them.
+
+    Args:
+        routing: Routing Model.
+        search_parameters: Routing search parameters.
+        options: Search options given by the caller.
+        initial_routes: Routes seeding the search, as lists of variable indices.
+        lower_bound: Lower bound of the objective, for the target gap of the options.
+
+    Returns:
+        The solution assignment, or None when no solution was found.
+    """
+    options = options or SearchOptions()
+    monitored = (options.target_objective, options.on_solution, options.metrics)
+    if lower_bound is not None:
+        monitored += (options.target_gap,)
+    if any(option is not None for option in monitored):
+        routing.AddAtSolutionCallback(SolutionMonitor(routing, options, lower_bound))
+    initial_solution = None
+    if initial_routes is not None:
+        routing.CloseModelWithParameters(search_parameters)
+        initial_solution = routing.ReadAssignmentFromRoutes(initial_routes, True)  # noqa: WPS425
+        if initial_solution is None:
+            print('Initial routes are infeasible, solving from scratch')
+    if initial_solution is None:
+        solution = routing.SolveWithParameters(search_parameters)
+    else:
+        solution = routing.SolveFromAssignmentWithParameters(initial_solution, search_parameters)
+    if options.metrics is not None:
+        options.metrics.record_search(routing)
+    return solution
@@ -0,0 +1,351 @@
+"""Local HTTP solve service backed by a pool of warm worker processes.
+
+Solving from the command line pays the interpreter startup, the OR-Tools
+import and the instance file I/O on every call. The service keeps worker
+processes with the solvers imported and a first model already solved, and
+accepts instances over HTTP::
+
+    POST /solve[/<problem>][?time_limit=5]   solve and answer with the record
+    POST /jobs[/<problem>][?time_limit=5]    queue and answer with the job id
+    GET  /jobs/<id>                          status, then record, of a job
+    GET  /health                             workers and jobs in flight
+
+A body is either a JSON instance (application/json) or a binary instance
+(application/octet-stream), an ``.npz`` archive holding one array per matrix
+and the JSON of the other fields under ``header``, see pack_binary. The
+problem is detected from the instance when the path does not give it.
+
+At most ``workers + queue_size`` jobs are in flight; beyond that the service
+answers 503 with a Retry-After header instead of queueing without bound. The
+time limit requested by a job is capped by ``max_time_limit``; without one
+the job runs with ``default_time_limit``, capped the same way, so that no job
+holds a worker longer than ``max_time_limit``.
+"""
+
+import io
+import json
+import multiprocessing
+import os
+import tempfile
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+from ort_optimization.batch import solve_instance
+from ort_optimization.generator import generate, write_instance
+from ort_optimization.instance import MATRIX_KEYS, save_binary
+from ort_optimization.search import SearchOptions
+from ort_optimization.solvers import SOLVERS
+
+BINARY_CONTENT_TYPE = 'application/octet-stream'
+HEADER_KEY = 'header'
+MAX_TIME_LIMIT = 60
+DEFAULT_TIME_LIMIT = 10
+# Finished jobs kept for polling, the oldest ones being forgotten first.
+MAX_FINISHED_JOBS = 1000
+# Extra time a synchronous solve waits for its worker beyond the time limit,
+# before answering with the job id instead.
+GRACE_PERIOD = 5
+
+
+class QueueFullError(Exception):
+    """Raised when the service already has as many jobs in flight as it accepts."""
+
+
+def pack_binary(input_data):
+    """Pack instance data into the binary body accepted by the service.
+
+    Args:
+        input_data: Instance data, with matrices as nested lists or arrays.
+
+    Returns:
+        The bytes of an .npz archive.
+    """
+    header = {key: input_value for key, input_value in input_data.items() if key not in MATRIX_KEYS}
+    arrays = {key: np.asarray(input_data[key]) for key in MATRIX_KEYS if key in input_data}
+    arrays[HEADER_KEY] = np.frombuffer(json.dumps(header).encode(), dtype=np.uint8)
+    archive = io.BytesIO()
+    np.savez(archive, **arrays)
+    return archive.getvalue()
+
+
+def unpack_binary(body):
+    """Unpack a binary body into instance data.
+
+    Args:
+        body: Bytes of an .npz archive built by pack_binary.
+
+    Returns:
+        The instance data, with the matrices as arrays.
+    """
+    with np.load(io.BytesIO(body), allow_pickle=False) as archive:
+        input_data = json.loads(archive[HEADER_KEY].tobytes())
+        for key in MATRIX_KEYS:
+            if key in archive.files:
+                input_data[key] = archive[key]
+    return input_data
+
+
+def warm_worker():
+    """Import the solvers and solve a tiny instance of every problem in a new worker."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = str(Path(tmp_dir) / 'instance.json')
+        for problem in SOLVERS:
+            write_instance(generate(problem, 5), path)
+            solve_instance(path, problem, SearchOptions(time_limit=1))
+
+
+def solve_body(body, binary, problem, time_limit):
+    """Solve an instance received by the service, in a worker process.
+
+    Args:
+        body: Bytes of the instance.
+        binary: Whether the body is a binary instance rather than JSON.
+        problem: Problem name, detected from the instance when None.
+        time_limit: Time limit of the search in seconds.
+
+    Returns:
+        The record of the outcome, see batch.solve_instance.
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = Path(tmp_dir) / 'instance.json'
+        if binary:
+            save_binary(unpack_binary(body), path)
+        else:
+            path.write_bytes(body)
+        record = solve_instance(str(path), problem, SearchOptions(time_limit=time_limit))
+    record.pop('path')
+    record.pop('output')
+    return record
+
+
+class SolveService(object):
+    """Job queue in front of a pool of warm worker processes."""
+
+    def __init__(self, workers=None, queue_size=8, default_time_limit=DEFAULT_TIME_LIMIT, max_time_limit=MAX_TIME_LIMIT):
+        """Start the worker processes and wait until they are warm.
+
+        Args:
+            workers: Number of worker processes, i.e. of jobs solved at once,
+                defaults to the number of CPUs.
+            queue_size: Number of jobs waiting for a worker beyond which jobs are refused.
+            default_time_limit: Time limit of the jobs not giving one in seconds,
+                max_time_limit when None.
+            max_time_limit: Largest time limit of a job, in seconds.
+        """
+        self.workers = workers or os.cpu_count()
+        self.default_time_limit = default_time_limit
+        self.max_time_limit = max_time_limit
+        self.slots = threading.BoundedSemaphore(self.workers + queue_size)
+        self.jobs = OrderedDict()
+        self.lock = threading.Lock()
+        # Spawned workers do not inherit the threads of the server.
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'), initializer=warm_worker,
+        )
+        for future in [self.executor.submit(os.getpid) for _ in range(self.workers)]:
+            future.result()
+
+    def job_time_limit(self, time_limit=None):
+        """Return the time limit of a job.
+
+        Args:
+            time_limit: Time limit requested in seconds, or None.
+
+        Returns:
+            The requested time limit, or the default one, capped by max_time_limit.
+        """
+        if time_limit is None:
+            time_limit = self.default_time_limit if self.default_time_limit is not None else self.max_time_limit
+        return min(time_limit, self.max_time_limit)
+
+    def submit(self, body, binary=False, problem=None, time_limit=None):
+        """Queue an instance.
+
+        Args:
+            body: Bytes of the instance.
+            binary: Whether the body is a binary instance rather than JSON.
+            problem: Problem name, detected from the instance when None.
+            time_limit: Time limit of the search in seconds, capped by max_time_limit.
+
+        Raises:
+            QueueFullError: When workers + queue_size jobs are already in flight.
+
+        Returns:
+            The id of the job.
+        """
+        if not self.slots.acquire(blocking=False):
+            raise QueueFullError('{0} jobs in flight'.format(len(self.pending())))
+        time_limit = self.job_time_limit(time_limit)
+        job_id = uuid.uuid4().hex
+        try:
+            future = self.executor.submit(solve_body, body, binary, problem, time_limit)
+        except Exception:
+            self.slots.release()
+            raise
+        with self.lock:
+            self.jobs[job_id] = {'future': future, 'problem': problem, 'time_limit': time_limit}
+        future.add_done_callback(self.finish)
+        return job_id
+
+    def finish(self, _future):
+        """Free the slot of a finished job and forget the oldest finished jobs.
+
+        Args:
+            _future: Future of the finished job.
+        """
+        self.slots.release()
+        with self.lock:
+            finished = [job_id for job_id, job in self.jobs.items() if job['future'].done()]
+            for job_id in finished[:max(len(finished) - MAX_FINISHED_JOBS, 0)]:
+                self.jobs.pop(job_id)
+
+    def pending(self):
+        """Return the ids of the jobs not finished yet.
+
+        Returns:
+            The list of job ids.
+        """
+        with self.lock:
+            return [job_id for job_id, job in self.jobs.items() if not job['future'].done()]
+
+    def status(self, job_id, timeout=0):
+        """Describe a job, waiting for its end at most timeout seconds.
+
+        Args:
+            job_id: Id of the job.
+            timeout: Seconds to wait for the end of the job.
+
+        Returns:
+            The job record, with the record of the outcome once finished, or
+            None for an unknown job.
+        """
+        with self.lock:
+            job = self.jobs.get(job_id)
+        if job is None:
+            return None
+        record = {'id': job_id, 'problem': job['problem'], 'time_limit': job['time_limit']}
+        try:
+            outcome = job['future'].result(timeout=timeout)
+        except FutureTimeoutError:
+            record['status'] = 'running' if job['future'].running() else 'queued'
+        except Exception as er:  # a worker process died
+            record.update(status='error', error=repr(er))
+        else:
+            record.update(outcome)
+        return record
+
+    def health(self):
+        """Describe the service.
+
+        Returns:
+            The number of workers and of jobs in flight.
+        """
+        return {'workers': self.workers, 'pending': len(self.pending())}
+
+    def shutdown(self):
+        """Stop the worker processes once the jobs in flight are finished."""
+        self.executor.shutdown()
+
+
+class SolveRequestHandler(BaseHTTPRequestHandler):
+    """HTTP routes of the solve service, see the module documentation."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):  # noqa: N802
+        """Answer the health and job status requests."""
+        service = self.server.service
+        parts = urlparse(self.path).path.strip('/').split('/')
+        if parts == ['health']:
+            self.send_json(HTTPStatus.OK, service.health())
+        elif len(parts) == 2 and parts[0] == 'jobs':
+            record = service.status(parts[1])
+            if record is None:
+                self.send_json(HTTPStatus.NOT_FOUND, {'error': 'Unknown job {0}'.format(parts[1])})
+            else:
+                self.send_json(HTTPStatus.OK, record)
+        else:
+            self.send_json(HTTPStatus.NOT_FOUND, {'error': 'Unknown path {0}'.format(self.path)})
+
+    def do_POST(self):  # noqa: N802
+        """Queue an instance, then answer with its record or its job id."""
+        service = self.server.service
+        url = urlparse(self.path)
+        parts = url.path.strip('/').split('/')
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        if parts[0] not in {'solve', 'jobs'} or len(parts) > 2:
+            self.send_json(HTTPStatus.NOT_FOUND, {'error': 'Unknown path {0}'.format(self.path)})
+            return
+        problem = parts[1] if len(parts) == 2 else None
+        if problem is not None and problem not in SOLVERS:
+            self.send_json(HTTPStatus.NOT_FOUND, {'error': 'Unknown problem {0}'.format(problem)})
+            return
+        query = parse_qs(url.query)
+        try:
+            time_limit = float(query['time_limit'][0]) if 'time_limit' in query else None
+        except ValueError:
+            self.send_json(HTTPStatus.BAD_REQUEST, {'error': 'Invalid time_limit'})
+            return
+        binary = self.headers.get('Content-Type', '').startswith(BINARY_CONTENT_TYPE)
+        try:
+            job_id = service.submit(body, binary, problem, time_limit)
+        except QueueFullError as er:
+            self.send_json(HTTPStatus.SERVICE_UNAVAILABLE, {'error': str(er)}, {'Retry-After': '1'})
+            return
+        if parts[0] == 'jobs':
+            self.send_json(HTTPStatus.ACCEPTED, {'id': job_id, 'status': 'queued'})
+            return
+        record = service.status(job_id, timeout=service.job_time_limit(time_limit) + GRACE_PERIOD)
+        finished = record['status'] not in {'queued', 'running'}
+        self.send_json(HTTPStatus.OK if finished else HTTPStatus.ACCEPTED, record)
+
+    def send_json(self, status, document, headers=None):
+        """Send a JSON response.
+
+        Args:
+            status: HTTP status.
+            document: JSON serializable document.
+            headers: Extra headers.
+        """
+        content = json.dumps(document).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        for name, header_value in (headers or {}).items():
+            self.send_header(name, header_value)
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format_string, *args):  # noqa: WPS110
+        """Keep the access log quiet, the records carry the timings.
+
+        Args:
+            format_string: Format of the message.
+            args: Values of the message.
+        """
+
+
+def make_server(service, host='127.0.0.1', port=8000):
+    """Create the HTTP server of a solve service, one thread per connection.
+
+    Args:
+        service: Solve service answering the requests.
+        host: Interface to listen on.
+        port: Port to listen on, 0 for any free port.
+
+    Returns:
+        The HTTP server, not serving yet.
+    """
+    server = ThreadingHTTPServer((host, port), SolveRequestHandler)
+    server.daemon_threads = True
+    server.service = service
+    return server
@@ -0,0 +1,357 @@
+"""Stateful route plan of a day, updated by order events.
+
+Orders are added and cancelled while the vehicles are on the road. Solving
+the edited instance again rebuilds the model of every stop and searches the
+whole plan from scratch. A RoutingSession keeps the current plan instead and
+applies events to it:
+
+* insert: a new order, a stop (CVRP) or a (pickup, delivery) pair (PDP), is
+  offered to the routes where it is the cheapest to insert, and only these
+  routes are re-optimized;
+* cancel: the stops of an order leave their route, which is re-optimized;
+* lock: a stop has been visited, and so have the stops before it on its
+  route; visited stops keep their place in every later re-optimization.
+
+A re-optimization builds a small routing model over the affected routes only,
+with the visited stops chained from the start of their vehicle, and searches
+from the current routes, the new order at its cheapest insertion. The other
+routes are left as they are. When the affected routes cannot take an order,
+every route is re-optimized.
+
+The stops of the orders are nodes of the instance: its matrix covers every
+stop of the day, and the stops of the orders not received yet are simply
+left out of the plan.
+"""
+
+import contextlib
+import io
+
+import numpy as np
+from ortools.constraint_solver import pywrapcp
+
+from ort_optimization.decompose import route_costs
+from ort_optimization.instance import load_instance
+from ort_optimization.pdp import SPAN_COST_COEFFICIENT
+from ort_optimization.result import SolveResult, walk_routes
+from ort_optimization.search import SearchOptions, build_search_parameters, run_search
+from ort_optimization.transit import register_transit_matrix, register_unary_transit_vector
+from ort_optimization.warmstart import insertion_cost
+
+PROBLEMS = ('cvrp', 'pdp')
+FIRST_SOLUTION_STRATEGIES = {'cvrp': 'PATH_CHEAPEST_ARC', 'pdp': 'PARALLEL_CHEAPEST_INSERTION'}
+# Routes re-optimized when an order is inserted.
+AFFECTED_ROUTES = 5
+# Search defaults of the initial plan and of the re-optimizations, the time limits in seconds.
+PLAN_SEARCH = {'local_search_metaheuristic': 'GUIDED_LOCAL_SEARCH', 'time_limit': 2}
+UPDATE_SEARCH = {'time_limit': 0.3}
+
+
+def best_insertion(matrix, route, visited, nodes, depot):
+    """Return the cheapest insertion of the stops of an order after the visited stops of a route.
+
+    Args:
+        matrix: Cost matrix indexed by node.
+        route: Stops of the route, without the depot.
+        visited: Number of visited stops at the start of the route.
+        nodes: Stop of the order, or its pickup and its delivery.
+        depot: Depot node.
+
+    Returns:
+        The cost increase of the route and the route with the order.
+    """
+    positions = range(visited, len(route) + 1)
+    if len(nodes) == 1:
+        cost, position = min((insertion_cost(matrix, route, position, nodes[0], depot), position) for position in positions)
+        return cost, route[:position] + list(nodes) + route[position:]
+    pickup, delivery = nodes
+    candidates = []
+    cheapest_pickup = None
+    for position in positions:
+        # The delivery right after the pickup, on the same arc.
+        previous_node = route[position - 1] if position else depot
+        next_node = route[position] if position < len(route) else depot
+        candidates.append((
+            int(matrix[previous_node][pickup]) + int(matrix[pickup][delivery])
+            + int(matrix[delivery][next_node]) - int(matrix[previous_node][next_node]),
+            position,
+            position,
+        ))
+        # The delivery on a later arc than the cheapest pickup arc.
+        if cheapest_pickup is not None:
+            candidates.append((
+                cheapest_pickup[0] + insertion_cost(matrix, route, position, delivery, depot), cheapest_pickup[1], position,
+            ))
+        pickup_insertion = (insertion_cost(matrix, route, position, pickup, depot), position)
+        cheapest_pickup = min(cheapest_pickup or pickup_insertion, pickup_insertion)
+    cost, pickup_position, delivery_position = min(candidates)
+    return cost, (
+        route[:pickup_position] + [pickup] + route[pickup_position:delivery_position] + [delivery] + route[delivery_position:]
+    )
+
+
+class RoutingSession(object):
+    """Current route plan of a CVRP or a PDP instance, updated by order events."""
+
+    def __init__(self, problem, path, orders=None, options=None, affected_routes=AFFECTED_ROUTES):
+        """Load the instance and plan the initial orders with every route.
+
+        Args:
+            problem: cvrp or pdp.
+            path: Path of the instance, whose matrix covers the stops of every order of the day.
+            orders: Orders planned at the start, stops for CVRP and (pickup, delivery)
+                pairs for PDP, every order of the instance when None.
+            options: Search options overriding the defaults of the initial plan
+                and of the re-optimizations, PLAN_SEARCH and UPDATE_SEARCH.
+            affected_routes: Number of routes re-optimized when an order is inserted.
+
+        Raises:
+            ValueError: When the problem has no session, or when the initial orders cannot be planned.
+        """
+        if problem not in PROBLEMS:
+            raise ValueError('No session for {0}, expected one of {1}'.format(problem, ', '.join(PROBLEMS)))
+        self.problem = problem
+        self.input_data = load_instance(path)
+        if isinstance(self.input_data['distance_matrix'], list):
+            self.input_data['distance_matrix'] = np.asarray(self.input_data['distance_matrix'])
+        self.depot = self.input_data['depot']
+        self.options = options or SearchOptions()
+        self.affected_routes = affected_routes
+        self.routes = [[] for _ in range(self.input_data['num_vehicles'])]
+        self.visited = [0] * self.input_data['num_vehicles']
+        self.orders = set()
+        if orders is None:
+            if problem == 'cvrp':
+                orders = [node for node in range(len(self.input_data['distance_matrix'])) if node != self.depot]
+            else:
+                orders = self.input_data['pickups_deliveries']
+        stops = []
+        for order in orders:
+            order, nodes = self.order_nodes(order)
+            if order in self.orders:
+                raise ValueError('Order {0} is given twice'.format(order))
+            self.orders.add(order)
+            stops.extend(nodes)
+        if not self.reoptimize(range(len(self.routes)), stops, search_defaults=PLAN_SEARCH):
+            raise ValueError('No plan for the initial orders')
+
+    def order_nodes(self, order):
+        """Check an order and return its stops.
+
+        Args:
+            order: Stop of a CVRP order, or (pickup, delivery) pair of a PDP order.
+
+        Raises:
+            ValueError: When a stop of the order is the depot or is not a node of the instance.
+
+        Returns:
+            The order, as an int or a tuple, and the tuple of its stops.
+        """
+        if self.problem == 'cvrp':
+            order = int(order)
+            nodes = (order,)
+        else:
+            order = tuple(int(node) for node in order)
+            nodes = order
+        for node in nodes:
+            if node == self.depot or not 0 <= node < len(self.input_data['distance_matrix']):
+                raise ValueError('Invalid stop {0} in order {1}'.format(node, order))
+        return order, nodes
+
+    def locate(self, node):
+        """Find a stop in the plan.
+
+        Args:
+            node: Stop of an order.
+
+        Raises:
+            ValueError: When the stop is not planned.
+
+        Returns:
+            The vehicle of the stop and its position in the route.
+        """
+        for vehicle, route in enumerate(self.routes):
+            if node in route:
+                return vehicle, route.index(node)
+        raise ValueError('Stop {0} is not planned'.format(node))
+
+    def fits(self, vehicle, route, cost):
+        """Return whether a route is within the limit of its vehicle.
+
+        Args:
+            vehicle: Vehicle of the route.
+            route: Stops of the route.
+            cost: Distance of the route, for PDP.
+
+        Returns:
+            True when the demand of the route is within the capacity of the
+            vehicle (CVRP), or the route within the travel distance (PDP).
+        """
+        if self.problem == 'cvrp':
+            demands = self.input_data['demands']
+            return sum(int(demands[node]) for node in route) <= self.input_data['vehicle_capacities'][vehicle]
+        return cost <= self.input_data['travel distance']
+
+    def insert(self, order):
+        """Add an order to the plan, re-optimizing the routes where it is the cheapest to insert.
+
+        Args:
+            order: Stop of a CVRP order, or (pickup, delivery) pair of a PDP order.
+
+        Raises:
+            ValueError: When the order, or one of its stops, is already planned.
+
+        Returns:
+            True when the order is planned, False when no route can take it.
+        """
+        order, nodes = self.order_nodes(order)
+        if order in self.orders:
+            raise ValueError('Order {0} is already planned'.format(order))
+        if any(node in route for route in self.routes for node in nodes):
+            raise ValueError('A stop of order {0} is already planned'.format(order))
+        matrix = self.input_data['distance_matrix']
+        costs = route_costs(self.input_data, [[self.depot] + route + [self.depot] for route in self.routes])
+        ranking = []
+        for vehicle, route in enumerate(self.routes):
+            cost, inserted = best_insertion(matrix, route, self.visited[vehicle], nodes, self.depot)
+            ranking.append((not self.fits(vehicle, inserted, costs[vehicle] + cost), cost, vehicle, inserted))
+        ranking.sort(key=lambda insertion: insertion[:3])
+        seed = {ranking[0][2]: ranking[0][3]}
+        vehicles = sorted(vehicle for _, _, vehicle, _ in ranking[:self.affected_routes])
+        self.orders.add(order)
+        if self.reoptimize(vehicles, nodes, seed) or self.reoptimize(range(len(self.routes)), nodes, seed):
+            return True
+        self.orders.remove(order)
+        return False
+
+    def cancel(self, order):
+        """Remove an order from the plan and re-optimize its route.
+
+        Args:
+            order: Stop of a CVRP order, or (pickup, delivery) pair of a PDP order.
+
+        Raises:
+            ValueError: When the order is not planned, or a stop of it is already visited.
+        """
+        order, nodes = self.order_nodes(order)
+        if order not in self.orders:
+            raise ValueError('Order {0} is not planned'.format(order))
+        places = [self.locate(node) for node in nodes]
+        if any(position < self.visited[vehicle] for vehicle, position in places):
+            raise ValueError('Order {0} is already visited'.format(order))
+        for node in nodes:
+            vehicle, _ = self.locate(node)
+            self.routes[vehicle].remove(node)
+        self.orders.remove(order)
+        self.reoptimize(sorted({vehicle for vehicle, _ in places}))
+
+    def lock(self, node):
+        """Mark a stop, and the stops before it on its route, as visited.
+
+        Args:
+            node: Stop of an order.
+        """
+        vehicle, position = self.locate(node)
+        self.visited[vehicle] = max(self.visited[vehicle], position + 1)
+
+    def reoptimize(self, vehicles, new_nodes=(), seed=None, search_defaults=UPDATE_SEARCH):
+        """Re-optimize some routes, adding new stops to them.
+
+        The search starts from the current routes, updated by the seed; with
+        new stops and no seed, it starts from scratch.
+
+        Args:
+            vehicles: Vehicles whose routes are re-optimized together.
+            new_nodes: Stops to add to these routes.
+            seed: Routes by vehicle holding the new stops.
+            search_defaults: Defaults of the search parameters, overridden by the options of the session.
+
+        Returns:
+            True when the routes are updated, False when they cannot take the new stops.
+        """
+        vehicles = list(vehicles)
+        nodes = [self.depot] + [node for vehicle in vehicles for node in self.routes[vehicle]] + list(new_nodes)
+        sub_nodes = {node: index for index, node in enumerate(nodes)}
+        matrix = self.input_data['distance_matrix'][np.ix_(nodes, nodes)]
+
+        # Create the routing index manager and the routing model of the affected routes.
+        manager = pywrapcp.RoutingIndexManager(len(nodes), len(vehicles), 0)
+        routing = pywrapcp.RoutingModel(manager)
+        transit_callback_index = register_transit_matrix(routing, matrix)
+        routing.SetArcCostEvaluatorOfAllVehicles(transit_callback_index)
+
+        if self.problem == 'cvrp':
+            demand_callback_index = register_unary_transit_vector(
+                routing, [int(self.input_data['demands'][node]) for node in nodes],
+            )
+            routing.AddDimensionWithVehicleCapacity(
+                demand_callback_index,
+                0,  # null capacity slack
+                [self.input_data['vehicle_capacities'][vehicle] for vehicle in vehicles],
+                True,  # noqa: WPS425
+                'Capacity',
+            )
+        else:
+            routing.AddDimension(
+                transit_callback_index,
+                0,  # no slack
+                self.input_data['travel distance'],
+                True,  # noqa: WPS425 start cumul to zero
+                'Distance',
+            )
+            distance_dimension = routing.GetDimensionOrDie('Distance')
+            distance_dimension.SetGlobalSpanCostCoefficient(SPAN_COST_COEFFICIENT)
+            for pickup, delivery in self.orders:
+                if pickup not in sub_nodes:
+                    continue
+                pickup_index = manager.NodeToIndex(sub_nodes[pickup])
+                delivery_index = manager.NodeToIndex(sub_nodes[delivery])
+                routing.AddPickupAndDelivery(pickup_index, delivery_index)
+                routing.solver().Add(routing.VehicleVar(pickup_index) == routing.VehicleVar(delivery_index))
+                routing.solver().Add(distance_dimension.CumulVar(pickup_index) <= distance_dimension.CumulVar(delivery_index))
+
+        # Keep the visited stops at the start of their route.
+        for sub_vehicle, vehicle in enumerate(vehicles):
+            chain = [routing.Start(sub_vehicle)] + [
+                manager.NodeToIndex(sub_nodes[node]) for node in self.routes[vehicle][:self.visited[vehicle]]
+            ]
+            for index, next_index in zip(chain, chain[1:]):
+                routing.NextVar(index).SetValue(next_index)
+
+        search_parameters = build_search_parameters(
+            self.options,
+            first_solution_strategy=FIRST_SOLUTION_STRATEGIES[self.problem],
+            **search_defaults,
+        )
+        initial_routes = None
+        if seed is not None or not new_nodes:
+            seed = seed or {}
+            initial_routes = [
+                [manager.NodeToIndex(sub_nodes[node]) for node in seed.get(vehicle, self.routes[vehicle])]
+                for vehicle in vehicles
+            ]
+
+        # An infeasible seed is reported by run_search, then the search starts from scratch.
+        with contextlib.redirect_stdout(io.StringIO()):
+            solution = run_search(routing, search_parameters, self.options, initial_routes)
+        if not solution:
+            return False
+        routes, _ = walk_routes(manager, routing, solution)
+        for sub_vehicle, vehicle in enumerate(vehicles):
+            self.routes[vehicle] = [nodes[node] for node in routes[sub_vehicle][1:-1]]
+        return True
+
+    def result(self):
+        """Return the current plan.
+
+        Returns:
+            The result of the plan, with the objective of the solver of the problem.
+        """
+        routes = [[self.depot] + route + [self.depot] for route in self.routes]
+        costs = route_costs(self.input_data, routes)
+        loads = None
+        if self.problem == 'cvrp':
+            loads = [sum(int(self.input_data['demands'][node]) for node in route[:-1]) for route in routes]
+            objective = sum(costs)
+        else:
+            objective = sum(costs) + SPAN_COST_COEFFICIENT * max(costs, default=0)
+        return SolveResult(self.problem, objective, routes, costs, loads)
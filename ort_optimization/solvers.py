@@ -0,0 +1,25 @@
+"""Registry of the solver classes by problem name."""
+
+import importlib
+
+SOLVERS = {
+    'cvrp': ('ort_optimization.cvrp', 'CVRP'),
+    'pdp': ('ort_optimization.pdp', 'PDP'),
+    'tsp': ('ort_optimization.tsp', 'TSP'),
+    'twcp': ('ort_optimization.twcp', 'TWCP'),
+    'twdcp': ('ort_optimization.twdcp', 'TWDCP'),
+    'vrp': ('ort_optimization.vrp', 'VRP'),
+}
+
+
+def get_solver(problem):
+    """Return the solver class of a problem, importing its module on demand.
+
+    Args:
+        problem: Problem name, one of the keys of SOLVERS.
+
+    Returns:
+        The solver class.
+    """
+    module_name, class_name = SOLVERS[problem]
+    return getattr(importlib.import_module(module_name), class_name)
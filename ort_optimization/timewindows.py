@@ -0,0 +1,95 @@
+"""Time window preprocessing for the routing problems with time windows.
+
+An arc i -> j cannot be used when even the earliest arrival at i, plus the
+travel time, is after the latest arrival at j. Both bounds are tightened
+from the depot: a stop cannot be reached before the earliest arrival through
+one of its possible predecessors, the depot start included, nor left later
+than it can still reach one of its possible successors, the depot end
+included, by the horizon. The bounds and the possible arcs are propagated
+together, vectorized over the whole matrix, until they are stable.
+
+No solution of the model is lost: the removed arcs and the trimmed parts of
+the windows cannot appear in any of them. The slack limit of the time
+dimension is ignored, which only makes the bounds looser.
+"""
+
+import numpy as np
+
+from ort_optimization.pruning import restrict_successors
+
+# Passes of the propagation, each one tightening the bounds of the previous one.
+MAX_PASSES = 10
+
+
+def tighten_windows(time_matrix, time_windows, depot, horizon):
+    """Propagate the time windows through the matrix.
+
+    Args:
+        time_matrix: Square travel time matrix indexed by node.
+        time_windows: One [open, close] window per node, the depot one
+            bounding the departures.
+        depot: Depot node.
+        horizon: Latest time of the routes, i.e. the capacity of the time dimension.
+
+    Returns:
+        The earliest and latest arrival of every stop as arrays, the depot
+        entries holding its earliest departure and the horizon, and the
+        boolean matrix of the possible arcs.
+    """
+    times = np.asarray(time_matrix, dtype=np.int64)
+    windows = np.asarray(time_windows, dtype=np.int64).reshape(-1, 2)
+    earliest = windows[:, 0].copy()
+    latest = np.minimum(windows[:, 1], horizon)
+    latest[depot] = horizon
+    stops = np.arange(len(times)) != depot
+    possible = np.ones(times.shape, dtype=bool)
+    np.fill_diagonal(possible, False)
+    for _ in range(MAX_PASSES):
+        possible &= earliest[:, None] + times <= latest[None, :]
+        arrivals = np.where(possible, earliest[:, None] + times, np.iinfo(np.int64).max)
+        departures = np.where(possible, latest[None, :] - times, np.iinfo(np.int64).min)
+        tightened_earliest = np.where(stops, np.maximum(earliest, arrivals.min(axis=0)), earliest)
+        tightened_latest = np.where(stops, np.minimum(latest, departures.max(axis=1)), latest)
+        if np.array_equal(tightened_earliest, earliest) and np.array_equal(tightened_latest, latest):
+            break
+        earliest, latest = tightened_earliest, tightened_latest
+    possible &= earliest[:, None] + times <= latest[None, :]
+    return earliest, latest, possible
+
+
+def preprocess_windows(manager, routing, time_dimension, input_data, horizon, options=None):
+    """Tighten the time windows of the stops and remove the impossible arcs.
+
+    Args:
+        manager: Manager for any NodeIndex <-> variable index conversion.
+        routing: Routing Model.
+        time_dimension: Time dimension whose cumuls are bounded.
+        input_data: Instance data with the time matrix, the time windows and the depot.
+        horizon: Latest time of the routes.
+        options: Search options, whose metrics count the arcs removed and the windows tightened.
+
+    Returns:
+        The ratio of the arcs between stops removed, or None when a stop has
+        no feasible arrival and the model is left unchanged.
+    """
+    depot = input_data['depot']
+    earliest, latest, possible = tighten_windows(input_data['time_matrix'], input_data['time_windows'], depot, horizon)
+    if np.any(earliest > latest):
+        print('Some time windows cannot be met, skipping the time window preprocessing')
+        return None
+    windows = np.asarray(input_data['time_windows'], dtype=np.int64).reshape(-1, 2)
+    tightened = 0
+    for node in np.flatnonzero((earliest != windows[:, 0]) | (latest != windows[:, 1])):
+        if node == depot:
+            continue
+        time_dimension.CumulVar(manager.NodeToIndex(int(node))).SetRange(int(earliest[node]), int(latest[node]))
+        tightened += 1
+    stops = np.arange(len(possible)) != depot
+    removed = int((~possible[np.ix_(stops, stops)]).sum() - stops.sum())
+    if removed:
+        restrict_successors(manager, routing, possible, depot)
+    if options is not None and options.metrics is not None:
+        options.metrics.count('pruned_arcs', removed)
+        options.metrics.count('tightened_windows', tightened)
+    size = int(stops.sum())
+    return removed / (size * (size - 1)) if size > 1 else 0.0
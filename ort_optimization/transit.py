@@ -0,0 +1,60 @@
+"""Shared transit layer for the routing solvers.
+
+The routing solvers used to register Python closures that OR-Tools called back
+from C++ for every arc evaluation. The helpers below hand the whole matrix (or
+vector) to the routing model at once, so the arc evaluation stays native.
+"""
+
+
+def as_int_rows(matrix):
+    """Convert a matrix into the list of integer rows expected by OR-Tools.
+
+    Args:
+        matrix: Square matrix given as nested sequences or as a NumPy array.
+
+    Returns:
+        The matrix as a list of lists of Python integers.
+    """
+    if hasattr(matrix, 'tolist'):
+        return matrix.tolist()
+    return [[int(cell) for cell in row] for row in matrix]
+
+
+def as_int_vector(vector):
+    """Convert a vector into the list of integers expected by OR-Tools.
+
+    Args:
+        vector: Values given as a sequence or as a NumPy array.
+
+    Returns:
+        The vector as a list of Python integers.
+    """
+    if hasattr(vector, 'tolist'):
+        return vector.tolist()
+    return [int(cell) for cell in vector]
+
+
+def register_transit_matrix(routing, matrix):
+    """Register a node-indexed transit matrix evaluated natively by the solver.
+
+    Args:
+        routing: Routing Model.
+        matrix: Square matrix indexed by node, e.g. the distance matrix.
+
+    Returns:
+        The index of the registered transit callback.
+    """
+    return routing.RegisterTransitMatrix(as_int_rows(matrix))
+
+
+def register_unary_transit_vector(routing, vector):
+    """Register a node-indexed unary transit vector evaluated natively by the solver.
+
+    Args:
+        routing: Routing Model.
+        vector: Values indexed by node, e.g. the demands.
+
+    Returns:
+        The index of the registered unary transit callback.
+    """
+    return routing.RegisterUnaryTransitVector(as_int_vector(vector))
@@ -1,9 +1,35 @@
-"""Traveling Salesperson Problem."""
+"""Traveling Salesperson Problem.
 
-import json
-import sys
+Engines, chosen with the engine search option:
 
-from ortools.constraint_solver import pywrapcp, routing_enums_pb2
+* auto: single vehicle instances of at most EXACT_MAX_NODES nodes are solved
+  exactly by the Held-Karp dynamic program, see ort_optimization.exact, the
+  others, and those whose arcs are pruned with the neighbors search option,
+  with the routing model.
+* local: single vehicle instances with a symmetric matrix are solved by the
+  2-opt and Or-opt local search of ort_optimization.localsearch, which scales
+  to tens of thousands of nodes, the others with the routing model.
+* routing: always the routing model.
+
+The neighbors search option only prunes the routing model: the exact engine
+is not used when it is set, and the local engine keeps its own neighbor lists.
+"""
+
+import time
+
+from ortools.constraint_solver import pywrapcp
+
+from ort_optimization.bounds import lower_bound
+from ort_optimization.exact import EXACT_MAX_NODES, solve_exact
+from ort_optimization.instance import load_instance
+from ort_optimization.localsearch import is_symmetric, solve_local
+from ort_optimization.metrics import record_phase
+from ort_optimization.pruning import bound_search, restrict_arcs, widen_neighbors
+from ort_optimization.result import extract_solution
+from ort_optimization.search import SearchOptions, build_search_parameters, run_search
+from ort_optimization.transit import register_transit_matrix
+
+ENGINES = ('auto', 'local', 'routing')
 
 
 class TSP(object):
@@ -21,48 +47,70 @@ class TSP(object):
 
     def create_data_model(self):
         """Store the data for the problem."""
-        # with open("sample.json", "w") as outfile:
-        #     json.dump(self.input_data, outfile)
-        try:
-            with open(self.path_input) as json_file:
-                self.input_data = json.load(json_file)
-        except json.decoder.JSONDecodeError as er:
-            print('JSON VALIDATION FAILED')
-            print(er)
-            sys.exit(1)
-
-    def print_solution(self, manager, routing, solution):
+        self.input_data = load_instance(self.path_input)
+
+    def select_engine(self, engine, neighbors=None):
+        """Return the engine solving the instance.
+
+        Args:
+            engine: Engine requested, auto when None.
+            neighbors: Number of neighbors of the arc pruning requested, if any.
+
+        Returns:
+            exact, local or routing.
+        """
+        matrix = self.input_data['distance_matrix']
+        if self.input_data['num_vehicles'] != 1:
+            return 'routing'
+        if engine == 'local':
+            if is_symmetric(matrix):
+                return 'local'
+            print('The local engine needs a symmetric matrix, solving with the routing model')
+        elif engine in {None, 'auto'} and neighbors is None and len(matrix) <= EXACT_MAX_NODES:
+            return 'exact'
+        return 'routing'
+
+    def print_solution(self, result):
         """Print solution on console.
 
         Args:
-            manager: Manager for any NodeIndex <-> variable index conversion.
-            routing: Routing Model
-            solution: Solves the current routing model with the given parameters
+            result: Result extracted from the solution.
         """
-        print('Objective: {0} miles'.format(solution.ObjectiveValue()))
-        index = routing.Start(0)
-        plan_output = 'Route for vehicle 0:\n'
-        route_distance = 0
-        while not routing.IsEnd(index):
-            plan_output += ' {0} ->'.format(manager.IndexToNode(index))
-            previous_index = index
-            index = solution.Value(routing.NextVar(index))
-            route_distance += routing.GetArcCostForVehicle(previous_index, index, 0)
-        plan_output += ' {0}\n'.format(manager.IndexToNode(index))
+        print('Objective: {0} miles'.format(result.objective))
+        route = result.routes[0]
+        plan_output = ''.join((
+            'Route for vehicle 0:\n',
+            ''.join(' {0} ->'.format(node) for node in route[:-1]),
+            ' {0}\n'.format(route[-1]),
+        ))
         print(plan_output)
-        plan_output += 'Route distance: {0}miles\n'.format(route_distance)
 
     @classmethod
-    def solve(cls, path):
+    def solve(cls, path, options=None):
         """Solve the problem.
 
         Args:
             path: Path for the input files.
+            options: Search options overriding the defaults of the solver.
 
+        Returns:
+            The solution found, or None.
         """
+        start = time.perf_counter()
+        options = options or SearchOptions()
         tsp_object = cls(path)
+        record_phase(options, 'load')
         # print(classe.input_data.keys())
 
+        # Solve the small instances exactly, and the large ones by local search if requested.
+        engine = tsp_object.select_engine(options.engine, options.neighbors)
+        if engine != 'routing':
+            solve_engine = solve_exact if engine == 'exact' else solve_local
+            result = solve_engine(tsp_object.input_data, options)
+            tsp_object.print_solution(result)
+            record_phase(options, 'extract')
+            return result
+
         # Create the routing index manager.
         manager = pywrapcp.RoutingIndexManager(
             len(tsp_object.input_data['distance_matrix']),
@@ -73,34 +121,52 @@ class TSP(object):
         # Create Routing Model.
         routing = pywrapcp.RoutingModel(manager)
 
-        def distance_callback(from_index, to_index):
-            """Convert from routing variable Index to distance matrix NodeIndex.
-
-            Args:
-                from_index: start node
-                to_index: destination node
-
-            Returns:
-                Returns the distance between the two nodes.
-            """
-            from_node = manager.IndexToNode(from_index)
-            to_node = manager.IndexToNode(to_index)
-            return tsp_object.input_data['distance_matrix'][from_node][to_node]
-
-        transit_callback_index = routing.RegisterTransitCallback(distance_callback)
+        # Register the distance matrix as a native transit callback.
+        transit_callback_index = register_transit_matrix(routing, tsp_object.input_data['distance_matrix'])
 
         # Define cost of each arc.
         routing.SetArcCostEvaluatorOfAllVehicles(transit_callback_index)
 
+        # Keep only the arcs towards the nearest neighbors, if requested.
+        pruned = restrict_arcs(
+            manager,
+            routing,
+            tsp_object.input_data['distance_matrix'],
+            tsp_object.input_data['depot'],
+            options.neighbors,
+        )
+
         # Setting first solution heuristic.
-        search_parameters = pywrapcp.DefaultRoutingSearchParameters()
-        search_parameters.first_solution_strategy = (
-            routing_enums_pb2.FirstSolutionStrategy.PATH_CHEAPEST_ARC
+        search_parameters = build_search_parameters(
+            options,
+            first_solution_strategy='PATH_CHEAPEST_ARC',
         )
+        if pruned:
+            bound_search(search_parameters)
+
+        # Bound the objective, for the optimality gap.
+        bound = lower_bound('tsp', tsp_object.input_data)
+
+        record_phase(options, 'build')
 
         # Solve the problem.
-        solution = routing.SolveWithParameters(search_parameters)
+        solution = run_search(routing, search_parameters, options, lower_bound=bound)
+        record_phase(options, 'solve')
+
+        # Widen the neighborhoods if the pruned model has no solution.
+        widened = widen_neighbors(options, time.perf_counter() - start) if not solution and pruned else None
+        if widened is not None:
+            print('No solution with {0} neighbors, widening the neighborhoods'.format(options.neighbors))
+            return cls.solve(path, widened)
 
         # Print solution on console.
-        if solution:
-            tsp_object.print_solution(manager, routing, solution)
+        if not solution:
+            return None
+        result = extract_solution(
+            'tsp', manager, routing, solution,
+            tsp_object.input_data['distance_matrix'],
+            lower_bound=bound,
+        )
+        tsp_object.print_solution(result)
+        record_phase(options, 'extract')
+        return result
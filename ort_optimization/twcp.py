@@ -1,8 +1,13 @@
 """Vehicle Routing Problems with Time Windows (VRPTWs)."""
-import json
-import sys
+from ortools.constraint_solver import pywrapcp
 
-from ortools.constraint_solver import pywrapcp, routing_enums_pb2
+from ort_optimization.bounds import lower_bound
+from ort_optimization.instance import load_instance
+from ort_optimization.metrics import record_phase
+from ort_optimization.result import extract_solution
+from ort_optimization.search import SearchOptions, build_search_parameters, run_search
+from ort_optimization.timewindows import preprocess_windows
+from ort_optimization.transit import register_transit_matrix
 
 
 class TWCP(object):
@@ -20,56 +25,42 @@ class TWCP(object):
 
     def create_data_model(self):
         """Store the data for the problem."""
-        try:
-            with open(self.path_input) as json_file:
-                self.input_data = json.load(json_file)
-        except json.decoder.JSONDecodeError as er:
-            print('JSON VALIDATION FAILED')
-            print(er)
-            sys.exit(1)
-
-    def print_solution(self, manager, routing, solution):
+        self.input_data = load_instance(self.path_input)
+
+    def print_solution(self, result):
         """Print solution on console.
 
         Args:
-            manager: Manager for any NodeIndex <-> variable index conversion.
-            routing: Routing Model
-            solution: Solves the current routing model with the given parameters
+            result: Result extracted from the solution.
         """
-        print(f'Objective: {solution.ObjectiveValue()}')
-        time_dimension = routing.GetDimensionOrDie('Time')
-        total_time = 0
-        for vehicle_id in range(self.input_data['num_vehicles']):
-            index = routing.Start(vehicle_id)
-            plan_output = 'Route for vehicle {0}:\n'.format(vehicle_id)
-            while not routing.IsEnd(index):
-                time_var = time_dimension.CumulVar(index)
-                plan_output += '{0} Time({1},{2}) -> '.format(
-                    manager.IndexToNode(index),
-                    solution.Min(time_var),
-                    solution.Max(time_var),
-                )
-                index = solution.Value(routing.NextVar(index))
-            time_var = time_dimension.CumulVar(index)
-            plan_output += '{0} Time({1},{2})\n'.format(
-                manager.IndexToNode(index),
-                solution.Min(time_var),
-                solution.Max(time_var),
-            )
-            plan_output += 'Time of the route: {0}min\n'.format(solution.Min(time_var))
+        print(f'Objective: {result.objective}')
+        for vehicle_id, (route, route_times) in enumerate(zip(result.routes, result.times)):
+            plan_output = ''.join((
+                'Route for vehicle {0}:\n'.format(vehicle_id),
+                ''.join(
+                    '{0} Time({1},{2}) -> '.format(node, window[0], window[1])
+                    for node, window in zip(route[:-1], route_times)
+                ),
+                '{0} Time({1},{2})\n'.format(route[-1], route_times[-1][0], route_times[-1][1]),
+                'Time of the route: {0}min\n'.format(route_times[-1][0]),
+            ))
             print(plan_output)
-            total_time += solution.Min(time_var)
-        print('Total time of all routes: {0}min'.format(total_time))
+        print('Total time of all routes: {0}min'.format(sum(route_times[-1][0] for route_times in result.times)))
 
     @classmethod
-    def solve(cls, path):
+    def solve(cls, path, options=None):
         """Solve the VRP with time windows.
 
         Args:
             path: Path for the input files.
+            options: Search options overriding the defaults of the solver.
 
+        Returns:
+            The solution found, or None.
         """
+        options = options or SearchOptions()
         twc_object = cls(path)
+        record_phase(options, 'load')
 
         # Create the routing index manager.
         manager = pywrapcp.RoutingIndexManager(
@@ -81,22 +72,8 @@ class TWCP(object):
         # Create Routing Model.
         routing = pywrapcp.RoutingModel(manager)
 
-        # Create and register a transit callback.
-        def time_callback(from_index, to_index):
-            """Convert from routing variable Index to time matrix NodeIndex.
-
-            Args:
-                from_index: start node
-                to_index: destination node
-
-            Returns:
-                Return the travel time between the two nodes.
-            """
-            from_node = manager.IndexToNode(from_index)
-            to_node = manager.IndexToNode(to_index)
-            return twc_object.input_data['time_matrix'][from_node][to_node]
-
-        transit_callback_index = routing.RegisterTransitCallback(time_callback)
+        # Register the time matrix as a native transit callback.
+        transit_callback_index = register_transit_matrix(routing, twc_object.input_data['time_matrix'])
 
         # Define cost of each arc.
         routing.SetArcCostEvaluatorOfAllVehicles(transit_callback_index)
@@ -111,6 +88,7 @@ class TWCP(object):
             dimension_name,
         )
         time_dimension = routing.GetDimensionOrDie(dimension_name)
+        record_phase(options, 'model')
         # Add time window constraints for each location except depot.
         for location_idx, time_window in enumerate(twc_object.input_data['time_windows']):
             if location_idx == twc_object.input_data['depot']:
@@ -126,6 +104,12 @@ class TWCP(object):
                 twc_object.input_data['time_windows'][depot_idx][1],
             )
 
+        # Tighten the time windows and remove the arcs they make impossible.
+        if options.window_pruning is not False:
+            preprocess_windows(
+                manager, routing, time_dimension, twc_object.input_data, twc_object.input_data['maximum_time'], options,
+            )
+
         # Instantiate route start and end times to produce feasible times.
         for element in range(twc_object.input_data['num_vehicles']):
             routing.AddVariableMinimizedByFinalizer(
@@ -134,16 +118,31 @@ class TWCP(object):
             routing.AddVariableMinimizedByFinalizer(
                 time_dimension.CumulVar(routing.End(element)),
             )
+        record_phase(options, 'constraints')
 
         # Setting first solution heuristic.
-        search_parameters = pywrapcp.DefaultRoutingSearchParameters()
-        search_parameters.first_solution_strategy = (
-            routing_enums_pb2.FirstSolutionStrategy.PATH_CHEAPEST_ARC
+        search_parameters = build_search_parameters(
+            options,
+            first_solution_strategy='PATH_CHEAPEST_ARC',
         )
 
+        # Bound the objective, for the optimality gap.
+        bound = lower_bound('twcp', twc_object.input_data)
+
+        record_phase(options, 'build')
+
         # Solve the problem.
-        solution = routing.SolveWithParameters(search_parameters)
+        solution = run_search(routing, search_parameters, options, lower_bound=bound)
+        record_phase(options, 'solve')
 
         # Print solution on console.
-        if solution:
-            twc_object.print_solution(manager, routing, solution)
+        if not solution:
+            return None
+        result = extract_solution(
+            'twcp', manager, routing, solution,
+            twc_object.input_data['time_matrix'], time_dimension=time_dimension,
+            lower_bound=bound,
+        )
+        twc_object.print_solution(result)
+        record_phase(options, 'extract')
+        return result
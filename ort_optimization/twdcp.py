@@ -1,9 +1,77 @@
-"""Vehicle Routing Problems with Time Windows and Depot Constraints."""
+"""Vehicle Routing Problems with Time Windows and Depot Constraints.
 
-import json
-import sys
+Every vehicle occupies a dock of the depot while it loads at the start of its
+route and while it unloads at its end. The docks are either one pool of
+``depot_capacity`` docks shared by the loads and the unloads, or separate
+pools of ``load_docks`` and ``unload_docks`` docks; a pool missing from the
+instance has ``depot_capacity`` docks.
 
-from ortools.constraint_solver import pywrapcp, routing_enums_pb2
+With many vehicles the dock constraint dominates the search. The two stage
+dock scheduling first routes without the docks, then searches from those
+routes with the docks, where only the departure and return times need to
+move for the routes to fit the docks.
+"""
+
+import contextlib
+import copy
+import io
+import time
+
+from ortools.constraint_solver import pywrapcp
+
+from ort_optimization.bounds import lower_bound
+from ort_optimization.instance import load_instance
+from ort_optimization.metrics import record_phase
+from ort_optimization.result import extract_solution
+from ort_optimization.search import SearchOptions, build_search_parameters, run_search
+from ort_optimization.timewindows import preprocess_windows
+from ort_optimization.transit import register_transit_matrix
+from ort_optimization.warmstart import hint_routes
+
+DOCK_SCHEDULING = ('joint', 'two_stage')
+# Waiting time and maximum time of the instances giving none, in minutes.
+DEFAULT_HORIZON = 60
+# Shares of the time limit of the two stage scheduling: the routing stage gets
+# its share, the dock stage the time left, and never less than its share.
+ROUTING_STAGE_SHARE = 0.5
+MIN_DOCK_STAGE_SHARE = 0.25
+
+
+def add_dock_constraints(routing, time_dimension, input_data):
+    """Make every vehicle occupy a dock while it loads and while it unloads.
+
+    Args:
+        routing: Routing Model.
+        time_dimension: Time dimension of the routes.
+        input_data: Instance data with the load and unload times and the dock capacities.
+    """
+    solver = routing.solver()
+    load_intervals = []
+    unload_intervals = []
+    for vehicle in range(input_data['num_vehicles']):
+        load_intervals.append(
+            solver.FixedDurationIntervalVar(
+                time_dimension.CumulVar(routing.Start(vehicle)),
+                input_data['vehicle_load_time'],
+                'load_interval',
+            ),
+        )
+        unload_intervals.append(
+            solver.FixedDurationIntervalVar(
+                time_dimension.CumulVar(routing.End(vehicle)),
+                input_data['vehicle_unload_time'],
+                'unload_interval',
+            ),
+        )
+    if 'load_docks' not in input_data and 'unload_docks' not in input_data:
+        pools = [(load_intervals + unload_intervals, input_data['depot_capacity'], 'depot')]
+    else:
+        pools = [
+            (intervals, input_data[key] if key in input_data else input_data['depot_capacity'], key)
+            for intervals, key in ((load_intervals, 'load_docks'), (unload_intervals, 'unload_docks'))
+        ]
+    for intervals, capacity, name in pools:
+        solver.Add(solver.Cumulative(intervals, [1] * len(intervals), capacity, name))
 
 
 class TWDCP(object):
@@ -21,52 +89,46 @@ class TWDCP(object):
 
     def create_data_model(self):
         """Store the data for the problem."""
-        try:
-            with open(self.path_input) as json_file:
-                self.input_data = json.load(json_file)
-        except json.decoder.JSONDecodeError as er:
-            print('JSON VALIDATION FAILED')
-            print(er)
-            sys.exit(1)
-
-    def print_solution(self, manager, routing, solution):
+        self.input_data = load_instance(self.path_input)
+
+    def print_solution(self, result):
         """Print solution on console.
 
         Args:
-            manager: Manager for any NodeIndex <-> variable index conversion.
-            routing: Routing Model
-            solution: Solves the current routing model with the given parameters
+            result: Result extracted from the solution.
         """
-        print(f'Objective: {solution.ObjectiveValue()}')
-        time_dimension = routing.GetDimensionOrDie('Time')
-        total_time = 0
-        for vehicle_id in range(self.input_data['num_vehicles']):
-            index = routing.Start(vehicle_id)
-            plan_output = 'Route for vehicle {0}:\n'.format(vehicle_id)
-            while not routing.IsEnd(index):
-                time_var = time_dimension.CumulVar(index)
-                plan_output += '{0} Time({1},{2}) -> '.format(
-                    manager.IndexToNode(index), solution.Min(time_var), solution.Max(time_var),
-                )
-                index = solution.Value(routing.NextVar(index))
-            time_var = time_dimension.CumulVar(index)
-            plan_output += '{0} Time({1},{2})\n'.format(
-                manager.IndexToNode(index), solution.Min(time_var), solution.Max(time_var),
-            )
-            plan_output += 'Time of the route: {0}min\n'.format(solution.Min(time_var))
+        print(f'Objective: {result.objective}')
+        for vehicle_id, (route, route_times) in enumerate(zip(result.routes, result.times)):
+            plan_output = ''.join((
+                'Route for vehicle {0}:\n'.format(vehicle_id),
+                ''.join(
+                    '{0} Time({1},{2}) -> '.format(node, window[0], window[1])
+                    for node, window in zip(route[:-1], route_times)
+                ),
+                '{0} Time({1},{2})\n'.format(route[-1], route_times[-1][0], route_times[-1][1]),
+                'Time of the route: {0}min\n'.format(route_times[-1][0]),
+            ))
             print(plan_output)
-            total_time += solution.Min(time_var)
-        print('Total time of all routes: {0}min'.format(total_time))
+        print('Total time of all routes: {0}min'.format(sum(route_times[-1][0] for route_times in result.times)))
 
     @classmethod
-    def solve(cls, path):
+    def solve(cls, path, options=None, docks=True):
         """Solve the VRP with time windows.
 
         Args:
             path: Path for the input files.
+            options: Search options overriding the defaults of the solver.
+            docks: Whether to constrain the docks, False for the routing stage
+                of the two stage dock scheduling.
 
+        Returns:
+            The solution found, or None.
         """
+        options = options or SearchOptions()
+        if docks and options.dock_scheduling == 'two_stage':
+            return cls.solve_two_stage(path, options)
         twdcp_object = cls(path)
+        record_phase(options, 'load')
 
         # Create the routing index manager.
         manager = pywrapcp.RoutingIndexManager(
@@ -78,30 +140,16 @@ class TWDCP(object):
         # Create Routing Model.
         routing = pywrapcp.RoutingModel(manager)
 
-        # Create and register a transit callback.
-        def time_callback(from_index, to_index):
-            """Convert from routing variable Index to time matrix NodeIndex.
-
-            Args:
-                from_index: start node
-                to_index: destination node
-
-            Returns:
-                Return the travel time between the two nodes.
-            """
-            from_node = manager.IndexToNode(from_index)
-            to_node = manager.IndexToNode(to_index)
-            return twdcp_object.input_data['time_matrix'][from_node][to_node]
-
-        transit_callback_index = routing.RegisterTransitCallback(time_callback)
+        # Register the time matrix as a native transit callback.
+        transit_callback_index = register_transit_matrix(routing, twdcp_object.input_data['time_matrix'])
 
         # Define cost of each arc.
         routing.SetArcCostEvaluatorOfAllVehicles(transit_callback_index)
 
         # Add Time Windows constraint.
         dimension_name = 'Time'
-        twdcp_object.input_data['waiting_time'] = 60
-        twdcp_object.input_data['maximum_time'] = 60
+        twdcp_object.input_data.setdefault('waiting_time', DEFAULT_HORIZON)
+        twdcp_object.input_data.setdefault('maximum_time', DEFAULT_HORIZON)
         routing.AddDimension(
             transit_callback_index,
             twdcp_object.input_data['waiting_time'],  # allow waiting time
@@ -110,6 +158,7 @@ class TWDCP(object):
             dimension_name,
         )
         time_dimension = routing.GetDimensionOrDie(dimension_name)
+        record_phase(options, 'model')
         # Add time window constraints for each location except depot.
         for location_idx, time_window in enumerate(twdcp_object.input_data['time_windows']):
             if location_idx == 0:
@@ -124,50 +173,90 @@ class TWDCP(object):
                 twdcp_object.input_data['time_windows'][0][1],
             )
 
+        # Tighten the time windows and remove the arcs they make impossible.
+        if options.window_pruning is not False:
+            preprocess_windows(
+                manager, routing, time_dimension, twdcp_object.input_data, twdcp_object.input_data['maximum_time'], options,
+            )
+
         # Add resource constraints at the depot.
-        solver = routing.solver()
-        intervals = []
+        if docks:
+            add_dock_constraints(routing, time_dimension, twdcp_object.input_data)
+
+        # Instantiate route start and end times to produce feasible times.
         for vehicle in range(twdcp_object.input_data['num_vehicles']):
-            # Add time windows at start of routes
-            intervals.append(
-                solver.FixedDurationIntervalVar(
-                    time_dimension.CumulVar(routing.Start(vehicle)),
-                    twdcp_object.input_data['vehicle_load_time'],
-                    'depot_interval',
-                ),
-            )
-            # Add time windows at end of routes and
-            # Instantiate route start and end times to produce feasible times.
-            intervals.append(
-                solver.FixedDurationIntervalVar(
-                    time_dimension.CumulVar(routing.End(vehicle)),
-                    twdcp_object.input_data['vehicle_unload_time'],
-                    'depot_interval',
-                ),
-            )
             routing.AddVariableMinimizedByFinalizer(
                 time_dimension.CumulVar(routing.Start(vehicle)),
             )
             routing.AddVariableMinimizedByFinalizer(
                 time_dimension.CumulVar(routing.End(vehicle)),
             )
+        record_phase(options, 'constraints')
 
-        depot_usage = [1 for _ in range(len(intervals))]
-        solver.Add(
-            solver.Cumulative(intervals, depot_usage, twdcp_object.input_data['depot_capacity'], 'depot'),
+        # Setting first solution heuristic.
+        search_parameters = build_search_parameters(
+            options,
+            first_solution_strategy='PATH_CHEAPEST_ARC',
         )
 
-        # Setting first solution heuristic.
-        search_parameters = pywrapcp.DefaultRoutingSearchParameters()
-        search_parameters.first_solution_strategy = (
-            routing_enums_pb2.FirstSolutionStrategy.PATH_CHEAPEST_ARC
+        # Seed the search with the initial routes, if any.
+        initial_routes = hint_routes(
+            manager, options, twdcp_object.input_data['time_matrix'], twdcp_object.input_data['depot'],
         )
 
+        # Bound the objective, for the optimality gap.
+        bound = lower_bound('twdcp', twdcp_object.input_data)
+
+        record_phase(options, 'build')
+
         # Solve the problem.
-        solution = routing.SolveWithParameters(search_parameters)
+        solution = run_search(routing, search_parameters, options, initial_routes, lower_bound=bound)
+        record_phase(options, 'solve')
 
         # Print solution on console.
-        if solution:
-            twdcp_object.print_solution(manager, routing, solution)
-        else:
+        if not solution:
             print('No solution found !')
+            return None
+        result = extract_solution(
+            'twdcp', manager, routing, solution,
+            twdcp_object.input_data['time_matrix'], time_dimension=time_dimension,
+            lower_bound=bound,
+        )
+        twdcp_object.print_solution(result)
+        record_phase(options, 'extract')
+        return result
+
+    @classmethod
+    def solve_two_stage(cls, path, options):
+        """Route without the docks, then fit the routes to the docks.
+
+        The routes of the first stage seed the search of the complete model;
+        when no dock schedule fits them, that search starts from scratch. A
+        time limit is shared by the two stages, ROUTING_STAGE_SHARE of it for
+        the routing stage and the time left for the dock stage, and only the
+        dock stage reports its solutions to the callbacks.
+
+        Args:
+            path: Path for the input files.
+            options: Search options of the solve.
+
+        Returns:
+            The solution found, or None.
+        """
+        start = time.perf_counter()
+        routing_options = copy.copy(options)
+        routing_options.on_solution = None
+        routing_options.target_objective = None
+        if options.time_limit is not None:
+            routing_options.time_limit = options.time_limit * ROUTING_STAGE_SHARE
+        with contextlib.redirect_stdout(io.StringIO()):
+            routes_first = cls.solve(path, routing_options, docks=False)
+        dock_options = copy.copy(options)
+        dock_options.dock_scheduling = 'joint'
+        if routes_first is not None:
+            dock_options.initial_routes = routes_first.routes
+        if options.time_limit is not None:
+            dock_options.time_limit = max(
+                options.time_limit - (time.perf_counter() - start), options.time_limit * MIN_DOCK_STAGE_SHARE,
+            )
+        return cls.solve(path, dock_options)
@@ -0,0 +1,514 @@
+"""Independent validation and evaluation of route plans.
+
+A plan gives one route per vehicle, from the depot back to the depot, as
+printed by the solvers and stored in their JSON results. It is scored and
+checked against an instance of any of the six problems without building an
+OR-Tools model: the routes of all the plans evaluated together are laid end to
+end in flat arrays, and every total and check is a NumPy gather, bincount or
+cumulative sum over them, so that ten thousand plans take seconds.
+
+The objective is the one of the solver of the problem: the arc costs of the
+routes, plus the span cost of the longest route for the VRP and the PDP. The
+violations are records naming their ``constraint``:
+
+* ``vehicles``: the plan has one route per vehicle;
+* ``node``: every node of a route exists;
+* ``route``: every route leaves from the depot and returns to it;
+* ``visits``: every other node is visited exactly once;
+* ``distance``: the length of a route is within the ``travel distance`` (vrp, pdp);
+* ``capacity``: the load of a route is within its ``vehicle_capacities`` (cvrp);
+* ``pickup_delivery``: a pickup is visited before its delivery, by the same vehicle (pdp);
+* ``time_window``: a vehicle leaves within the window of the depot and reaches
+  every node within its window, and within the maximum time (twcp, twdcp);
+* ``schedule``: consecutive arrival times are at least the travel time apart,
+  waiting no longer than the waiting time (twcp, twdcp, with arrival times);
+* ``docks``: the docks of the depot are never used by more vehicles than they
+  have (twdcp, with arrival times).
+
+The arrival times of the time window problems are given with the routes, as
+the ``times`` of a result, or the routes are scheduled as early as possible:
+every vehicle leaves when the depot opens and waits at a node until its window
+opens. The departures of the TWDCP depend on the docks, so the docks are only
+checked on given arrival times.
+"""
+
+import json
+
+import numpy as np
+
+from ort_optimization.result import arc_values
+
+# Mirrored from the solvers, which import OR-Tools, so that plans are checked without it.
+DEFAULT_HORIZON = 60  # ort_optimization.twdcp.DEFAULT_HORIZON
+
+MATRIX_KEYS = {
+    'cvrp': 'distance_matrix',
+    'pdp': 'distance_matrix',
+    'tsp': 'distance_matrix',
+    'twcp': 'time_matrix',
+    'twdcp': 'time_matrix',
+    'vrp': 'distance_matrix',
+}
+SPAN_COST_COEFFICIENTS = {'pdp': 100, 'vrp': 100}  # ort_optimization.pdp and ort_optimization.vrp SPAN_COST_COEFFICIENT
+TIME_WINDOW_PROBLEMS = ('twcp', 'twdcp')
+
+
+class Evaluation(object):
+    """Objective, per route totals and violations of a plan."""
+
+    def __init__(self, problem, objective, costs, loads=None, violations=None):
+        """Init the evaluation.
+
+        Args:
+            problem: Problem name, e.g. vrp.
+            objective: Objective value of the plan.
+            costs: Arc cost of every route.
+            loads: Demand served by every route, for the problems with demands.
+            violations: Violation records, see the module documentation.
+        """
+        self.problem = problem
+        self.objective = objective
+        self.costs = costs
+        self.loads = loads
+        self.violations = violations or []
+
+    @property
+    def feasible(self):
+        """Whether the plan satisfies every constraint.
+
+        Returns:
+            True without violations.
+        """
+        return not self.violations
+
+    def to_dict(self):
+        """Return the evaluation as a JSON serializable dictionary.
+
+        Returns:
+            The evaluation fields, without the loads the problem does not have.
+        """
+        evaluation_fields = {
+            'problem': self.problem,
+            'feasible': self.feasible,
+            'objective': self.objective,
+            'costs': self.costs,
+        }
+        if self.loads is not None:
+            evaluation_fields['loads'] = self.loads
+        evaluation_fields['violations'] = self.violations
+        return evaluation_fields
+
+    def to_json(self):
+        """Return the evaluation as a single line JSON document.
+
+        Returns:
+            The JSON text.
+        """
+        return json.dumps(self.to_dict())
+
+
+def read_plans(path):
+    """Read the plans of a JSON or newline delimited JSON file.
+
+    Every document is a result, as printed with --json or written by
+    write_ndjson, a batch record holding one, or a bare list of routes.
+
+    Args:
+        path: Path of the file.
+
+    Raises:
+        ValueError: When a document holds no routes.
+
+    Returns:
+        The routes and the arrival times (None when not given) of every plan.
+    """
+    with open(path) as plans_file:
+        text = plans_file.read()
+    try:
+        documents = [json.loads(text)]
+    except json.decoder.JSONDecodeError:
+        documents = [json.loads(line) for line in text.splitlines() if line.strip()]
+    plans = []
+    for document in documents:
+        if isinstance(document, dict) and 'result' in document:
+            document = document['result'] or {}
+        routes = document.get('routes') if isinstance(document, dict) else document
+        if not isinstance(routes, list):
+            raise ValueError('No routes in plan {0} of {1}'.format(len(plans), path))
+        plans.append((routes, document.get('times') if isinstance(document, dict) else None))
+    return plans
+
+
+def earliest_arrivals(route_starts, route_lengths, travel, opens, departure):
+    """Schedule routes laid end to end as early as possible.
+
+    The routes are scheduled together, one position of the routes at a time.
+
+    Args:
+        route_starts: Flat index of the first node of every route.
+        route_lengths: Number of nodes of every route.
+        travel: Travel time from every flat node to the next one.
+        opens: Opening of the time window of every flat node.
+        departure: Departure time of every vehicle.
+
+    Returns:
+        The arrival time at every flat node.
+    """
+    arrivals = np.zeros(len(travel), dtype=np.int64)
+    by_length = route_starts[np.argsort(-route_lengths, kind='stable')]
+    descending_lengths = -np.sort(-route_lengths)
+    arrivals[by_length[descending_lengths > 0]] = departure
+    for position in range(1, int(descending_lengths[0]) if len(descending_lengths) else 0):
+        current = by_length[:np.count_nonzero(descending_lengths > position)] + position
+        arrivals[current] = np.maximum(arrivals[current - 1] + travel[current - 1], opens[current])
+    return arrivals
+
+
+def peak_usage(plan_count, interval_plans, interval_starts, durations):
+    """Return the largest number of intervals overlapping in every plan.
+
+    The intervals are half open, so one ending when another starts do not overlap.
+
+    Args:
+        plan_count: Number of plans.
+        interval_plans: Plan of every interval.
+        interval_starts: Start of every interval.
+        durations: Duration of every interval.
+
+    Returns:
+        The peak number of overlapping intervals of every plan.
+    """
+    plans = np.concatenate([interval_plans, interval_plans])
+    times = np.concatenate([interval_starts, interval_starts + durations])
+    deltas = np.concatenate([np.ones(len(interval_plans), np.int64), -np.ones(len(interval_plans), np.int64)])
+    order = np.lexsort((deltas, times, plans))
+    peaks = np.zeros(plan_count, dtype=np.int64)
+    # Every plan adds as many ends as starts, so the running total restarts from zero at each plan.
+    np.maximum.at(peaks, plans[order], np.cumsum(deltas[order]))
+    return peaks
+
+
+class PlanLayout(object):
+    """Routes of many plans laid end to end in flat arrays."""
+
+    def __init__(self, plans, depot):
+        """Init the layout.
+
+        Args:
+            plans: Routes of every plan, one list of nodes per vehicle.
+            depot: Depot node.
+        """
+        self.depot = depot
+        self.plan_routes = np.fromiter((len(routes) for routes in plans), dtype=np.int64, count=len(plans))
+        self.route_lengths = np.fromiter((len(route) for routes in plans for route in routes), dtype=np.int64)
+        self.route_plans = np.repeat(np.arange(len(plans)), self.plan_routes)
+        self.route_vehicles = np.arange(len(self.route_plans)) - np.repeat(np.cumsum(self.plan_routes) - self.plan_routes, self.plan_routes)
+        self.route_starts = np.cumsum(self.route_lengths) - self.route_lengths
+        self.route_ends = self.route_starts + self.route_lengths - 1
+        self.nodes = np.fromiter(
+            (node for routes in plans for route in routes for node in route), dtype=np.int64, count=int(self.route_lengths.sum()),
+        )
+        self.node_routes = np.repeat(np.arange(len(self.route_lengths)), self.route_lengths)
+        self.node_plans = self.route_plans[self.node_routes]
+        self.lasts = np.zeros(len(self.nodes), dtype=bool)
+        self.lasts[self.route_ends[self.route_lengths > 0]] = True
+        self.stops = ~self.lasts
+        self.stops[self.route_starts[self.route_lengths > 0]] = False
+        self.valid_routes = self.route_lengths >= 2
+        self.violations = [[] for _ in plans]
+
+    def flag(self, route, constraint, **fields):
+        """Record a violation of a route.
+
+        Args:
+            route: Flat index of the route.
+            constraint: Name of the violated constraint.
+            fields: Further fields of the violation record.
+        """
+        record = dict({'constraint': constraint, 'vehicle': int(self.route_vehicles[route])}, **fields)
+        self.violations[self.route_plans[route]].append(record)
+
+    def split(self, route_values):
+        """Split per route values by plan.
+
+        Args:
+            route_values: One value per route.
+
+        Returns:
+            One array of values per plan.
+        """
+        return np.split(route_values, np.cumsum(self.plan_routes)[:-1])
+
+
+def check_routes(layout, num_vehicles, size):
+    """Flag the plans with a wrong number of routes, unknown nodes or open routes.
+
+    The unknown nodes are replaced by the depot, so that the other checks can index them.
+
+    Args:
+        layout: Layout of the plans, updated in place.
+        num_vehicles: Number of vehicles of the instance.
+        size: Number of nodes of the instance.
+    """
+    for plan in np.flatnonzero(layout.plan_routes != num_vehicles).tolist():
+        layout.violations[plan].append({'constraint': 'vehicles', 'value': int(layout.plan_routes[plan]), 'limit': num_vehicles})
+    nodes = layout.nodes
+    unknown = (nodes < 0) | (nodes >= size)
+    for index in np.flatnonzero(unknown).tolist():
+        layout.flag(layout.node_routes[index], 'node', node=int(nodes[index]))
+    nodes[unknown] = layout.depot
+    valid_routes = layout.valid_routes
+    valid_routes[valid_routes] = (nodes[layout.route_starts[valid_routes]] == layout.depot) & (nodes[layout.route_ends[valid_routes]] == layout.depot)
+    for route in np.flatnonzero(~valid_routes).tolist():
+        layout.flag(route, 'route')
+
+
+def check_visits(layout, size):
+    """Flag the nodes visited other than once, the depot never being a stop.
+
+    Args:
+        layout: Layout of the plans.
+        size: Number of nodes of the instance.
+
+    Returns:
+        The flat index of every stop, the order sorting their keys, plan times
+        size plus node, and the sorted keys.
+    """
+    depot = layout.depot
+    stop_indices = np.flatnonzero(layout.stops)
+    stop_keys = layout.node_plans[stop_indices] * size + layout.nodes[stop_indices]
+    key_order = np.argsort(stop_keys, kind='stable')
+    sorted_keys = stop_keys[key_order]
+    visited_keys, visit_counts = np.unique(sorted_keys, return_counts=True)
+    visited_plans, visited_nodes = np.divmod(visited_keys, size)
+    for key_index in np.flatnonzero((visit_counts > 1) | (visited_nodes == depot)).tolist():
+        layout.violations[visited_plans[key_index]].append({
+            'constraint': 'visits',
+            'node': int(visited_nodes[key_index]),
+            'value': int(visit_counts[key_index]),
+            'limit': 0 if visited_nodes[key_index] == depot else 1,
+        })
+    distinct_visits = np.bincount(visited_plans[visited_nodes != depot], minlength=len(layout.violations))
+    for plan in np.flatnonzero(distinct_visits < size - 1).tolist():
+        missing = set(range(size)) - {depot} - set(visited_nodes[visited_plans == plan].tolist())
+        layout.violations[plan].extend({'constraint': 'visits', 'node': node, 'value': 0, 'limit': 1} for node in sorted(missing))
+    return stop_indices, key_order, sorted_keys
+
+
+def evaluate_costs(problem, input_data, layout):
+    """Sum the arc costs of every route and plan, and flag the routes too long.
+
+    Args:
+        problem: Problem name, one of the keys of MATRIX_KEYS.
+        input_data: Instance data.
+        layout: Layout of the plans.
+
+    Returns:
+        The cost of the arc leaving every flat node, the cost of every route
+        and the objective of every plan.
+    """
+    nodes = layout.nodes
+    # An arc leaving the end of a route belongs to none.
+    arc_costs = np.zeros(len(nodes), dtype=np.int64)
+    if len(nodes) > 1:
+        arc_costs[:-1] = arc_values(input_data[MATRIX_KEYS[problem]], nodes[:-1], nodes[1:])
+    arc_costs[layout.lasts] = 0
+    costs = np.bincount(layout.node_routes, weights=arc_costs, minlength=len(layout.route_lengths)).astype(np.int64)
+    objectives = np.bincount(layout.route_plans, weights=costs, minlength=len(layout.violations)).astype(np.int64)
+    if problem in SPAN_COST_COEFFICIENTS:
+        longest = np.zeros(len(layout.violations), dtype=np.int64)
+        np.maximum.at(longest, layout.route_plans, costs)
+        objectives += SPAN_COST_COEFFICIENTS[problem] * longest
+        for route in np.flatnonzero(costs > input_data['travel distance']).tolist():
+            layout.flag(route, 'distance', value=int(costs[route]), limit=input_data['travel distance'])
+    return arc_costs, costs, objectives
+
+
+def evaluate_loads(input_data, layout):
+    """Sum the demands of every route, and flag the routes over capacity.
+
+    Args:
+        input_data: Instance data.
+        layout: Layout of the plans.
+
+    Returns:
+        The load of every route, the end depot not being served, or None without demands.
+    """
+    if 'demands' not in input_data:
+        return None
+    node_demands = np.asarray(input_data['demands'], dtype=np.int64)[layout.nodes]
+    loads = np.bincount(
+        layout.node_routes, weights=np.where(layout.lasts, 0, node_demands), minlength=len(layout.route_lengths),
+    ).astype(np.int64)
+    if 'vehicle_capacities' in input_data:
+        capacities = np.asarray(input_data['vehicle_capacities'], dtype=np.int64)
+        route_capacities = capacities[np.minimum(layout.route_vehicles, len(capacities) - 1)]
+        for route in np.flatnonzero(loads > route_capacities).tolist():
+            layout.flag(route, 'capacity', value=int(loads[route]), limit=int(route_capacities[route]))
+    return loads
+
+
+def check_pickups_deliveries(input_data, layout, size, visits):
+    """Flag the pickups not visited before their delivery by the same vehicle.
+
+    Args:
+        input_data: PDP instance data.
+        layout: Layout of the plans.
+        size: Number of nodes of the instance.
+        visits: Stop indices, key order and sorted keys, as returned by check_visits.
+    """
+    stop_indices, key_order, sorted_keys = visits
+    if not len(sorted_keys):  # no plan visits a stop, so none misplaces a pair
+        return
+    plan_count = len(layout.violations)
+    # Look up the first visit of every pickup and delivery in every plan.
+    pairs = np.asarray(input_data['pickups_deliveries'], dtype=np.int64)
+    pair_keys = (np.arange(plan_count)[:, None, None] * size + pairs[None, :, :]).reshape(-1)
+    found_at = np.minimum(np.searchsorted(sorted_keys, pair_keys), len(sorted_keys) - 1)
+    found = (sorted_keys[found_at] == pair_keys).reshape(plan_count, len(pairs), 2)
+    positions = stop_indices[key_order[found_at]].reshape(plan_count, len(pairs), 2)
+    pickup_routes = layout.node_routes[positions[:, :, 0]]
+    delivery_routes = layout.node_routes[positions[:, :, 1]]
+    misplaced = found.all(axis=2) & ((pickup_routes != delivery_routes) | (positions[:, :, 0] > positions[:, :, 1]))
+    for plan, pair in zip(*np.nonzero(misplaced)):
+        layout.violations[plan].append({'constraint': 'pickup_delivery', 'pickup': int(pairs[pair, 0]), 'delivery': int(pairs[pair, 1])})
+
+
+def plan_arrivals(input_data, layout, arc_costs, plan_times):
+    """Return the arrival time at every flat node, and flag the infeasible schedules.
+
+    Args:
+        input_data: Time window instance data.
+        layout: Layout of the plans.
+        arc_costs: Travel time from every flat node to the next one.
+        plan_times: Arrival times of every plan, see evaluate_plans.
+
+    Raises:
+        ValueError: When the arrival times do not match the routes.
+
+    Returns:
+        The given arrival times, or the earliest ones when not given.
+    """
+    windows = np.asarray(input_data['time_windows'], dtype=np.int64)
+    if plan_times is None:
+        return earliest_arrivals(layout.route_starts, layout.route_lengths, arc_costs, windows[layout.nodes, 0], windows[layout.depot, 0])
+    time_lengths = [len(route_times) for times in plan_times for route_times in times]
+    if time_lengths != layout.route_lengths.tolist():
+        raise ValueError('The arrival times do not match the routes')
+    arrivals = np.fromiter(
+        (
+            cumul[0] if isinstance(cumul, (list, tuple)) else cumul
+            for times in plan_times for route_times in times for cumul in route_times
+        ),
+        dtype=np.int64,
+        count=len(layout.nodes),
+    )
+    waiting_time = input_data.get('waiting_time', DEFAULT_HORIZON)
+    slacks = arrivals[1:] - arrivals[:-1] - arc_costs[:-1]
+    for index in np.flatnonzero(~layout.lasts[:-1] & ((slacks < 0) | (slacks > waiting_time))).tolist():
+        layout.flag(layout.node_routes[index], 'schedule', node=int(layout.nodes[index + 1]), value=int(slacks[index]), limit=[0, waiting_time])
+    return arrivals
+
+
+def check_time_windows(input_data, layout, arrivals):
+    """Flag the arrivals outside the window of their node or after the maximum time.
+
+    Args:
+        input_data: Time window instance data.
+        layout: Layout of the plans.
+        arrivals: Arrival time at every flat node.
+    """
+    lasts = layout.lasts
+    maximum_time = input_data.get('maximum_time', DEFAULT_HORIZON)
+    node_windows = np.asarray(input_data['time_windows'], dtype=np.int64)[layout.nodes]
+    late = arrivals > maximum_time
+    late[~lasts] |= (arrivals[~lasts] < node_windows[~lasts, 0]) | (arrivals[~lasts] > node_windows[~lasts, 1])
+    for index in np.flatnonzero(late).tolist():
+        limit = [0, maximum_time] if lasts[index] else [int(node_windows[index, 0]), min(int(node_windows[index, 1]), maximum_time)]
+        layout.flag(layout.node_routes[index], 'time_window', node=int(layout.nodes[index]), value=int(arrivals[index]), limit=limit)
+
+
+def evaluate_plans(problem, input_data, plans, plan_times=None):
+    """Evaluate many plans of an instance at once.
+
+    Args:
+        problem: Problem name, one of the keys of MATRIX_KEYS.
+        input_data: Instance data, as loaded by load_instance.
+        plans: Routes of every plan, one list of nodes per vehicle.
+        plan_times: Arrival times of every plan, for the time window problems:
+            one time or [min, max] cumul per node of every route, or None to
+            schedule the plan as early as possible.
+
+    Raises:
+        ValueError: When the arrival times do not match the routes.
+
+    Returns:
+        The evaluation of every plan.
+    """
+    size = len(input_data[MATRIX_KEYS[problem]])
+    layout = PlanLayout(plans, input_data.get('depot', 0))
+    check_routes(layout, input_data['num_vehicles'], size)
+    visits = check_visits(layout, size)
+    arc_costs, costs, objectives = evaluate_costs(problem, input_data, layout)
+    loads = evaluate_loads(input_data, layout)
+    if problem == 'pdp' and input_data['pickups_deliveries']:
+        check_pickups_deliveries(input_data, layout, size, visits)
+    if problem in TIME_WINDOW_PROBLEMS:
+        arrivals = plan_arrivals(input_data, layout, arc_costs, plan_times)
+        check_time_windows(input_data, layout, arrivals)
+        if problem == 'twdcp' and plan_times is not None:
+            route_starts = layout.route_starts[layout.valid_routes]
+            route_ends = layout.route_ends[layout.valid_routes]
+            check_docks(input_data, layout.violations, layout.route_plans[layout.valid_routes], arrivals[route_starts], arrivals[route_ends])
+    loads_by_plan = layout.split(loads) if loads is not None else [None] * len(plans)
+    return [
+        Evaluation(problem, int(objective), plan_costs.tolist(), None if plan_loads is None else plan_loads.tolist(), plan_violations)
+        for objective, plan_costs, plan_loads, plan_violations in zip(objectives.tolist(), layout.split(costs), loads_by_plan, layout.violations)
+    ]
+
+
+def check_docks(input_data, violations, route_plans, departures, returns):
+    """Flag the plans using more docks than the depot has.
+
+    The docks are pooled as in ort_optimization.twdcp.add_dock_constraints.
+
+    Args:
+        input_data: TWDCP instance data.
+        violations: Violation records of every plan, extended in place.
+        route_plans: Plan of every route.
+        departures: Departure time of every route.
+        returns: Return time of every route.
+    """
+    load_time = input_data['vehicle_load_time']
+    unload_time = input_data['vehicle_unload_time']
+    if 'load_docks' not in input_data and 'unload_docks' not in input_data:
+        pools = [('depot', input_data['depot_capacity'], ((departures, load_time), (returns, unload_time)))]
+    else:
+        pools = [
+            (key, input_data[key] if key in input_data else input_data['depot_capacity'], intervals)
+            for key, intervals in (('load_docks', ((departures, load_time),)), ('unload_docks', ((returns, unload_time),)))
+        ]
+    for name, capacity, intervals in pools:
+        peaks = peak_usage(
+            len(violations),
+            np.concatenate([route_plans for _ in intervals]),
+            np.concatenate([starts for starts, _ in intervals]),
+            np.concatenate([np.full(len(starts), duration, dtype=np.int64) for starts, duration in intervals]),
+        )
+        for plan in np.flatnonzero(peaks > capacity).tolist():
+            violations[plan].append({'constraint': 'docks', 'pool': name, 'value': int(peaks[plan]), 'limit': capacity})
+
+
+def evaluate(problem, input_data, routes, times=None):
+    """Evaluate a plan of an instance.
+
+    Args:
+        problem: Problem name, one of the keys of MATRIX_KEYS.
+        input_data: Instance data, as loaded by load_instance.
+        routes: One list of nodes per vehicle.
+        times: Arrival times of the routes, see evaluate_plans.
+
+    Returns:
+        The evaluation of the plan.
+    """
+    return evaluate_plans(problem, input_data, [routes], None if times is None else [times])[0]
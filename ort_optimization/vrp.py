@@ -1,8 +1,19 @@
 """Simple Vehicles Routing Problem (VRP)."""
-import json
-import sys
+import time
 
-from ortools.constraint_solver import pywrapcp, routing_enums_pb2
+from ortools.constraint_solver import pywrapcp
+
+from ort_optimization.bounds import lower_bound
+from ort_optimization.instance import load_instance
+from ort_optimization.metrics import record_phase
+from ort_optimization.pruning import bound_search, restrict_arcs, widen_neighbors
+from ort_optimization.result import extract_solution
+from ort_optimization.search import SearchOptions, build_search_parameters, run_search
+from ort_optimization.transit import register_transit_matrix
+from ort_optimization.warmstart import hint_routes
+
+# Cost per unit of the longest route, added to the total distance.
+SPAN_COST_COEFFICIENT = 100
 
 
 class VRP(object):
@@ -20,50 +31,40 @@ class VRP(object):
 
     def create_data_model(self):
         """Store the data for the problem."""
-        try:
-            with open(self.path_input) as json_file:
-                self.input_data = json.load(json_file)
-        except json.decoder.JSONDecodeError as er:
-            print('JSON VALIDATION FAILED')
-            print(er)
-            sys.exit(1)
-
-    def print_solution(self, manager, routing, solution):
+        self.input_data = load_instance(self.path_input)
+
+    def print_solution(self, result):
         """Print solution on console.
 
         Args:
-            manager: Manager for any NodeIndex <-> variable index conversion.
-            routing: Routing Model
-            solution: Solves the current routing model with the given parameters
+            result: Result extracted from the solution.
         """
-        print(f'Objective: {solution.ObjectiveValue()}')
-        max_route_distance = 0
-        for vehicle_id in range(self.input_data['num_vehicles']):
-            index = routing.Start(vehicle_id)
-            plan_output = 'Route for vehicle {0}:\n'.format(vehicle_id)
-            route_distance = 0
-            while not routing.IsEnd(index):
-                plan_output += ' {0} -> '.format(manager.IndexToNode(index))
-                previous_index = index
-                index = solution.Value(routing.NextVar(index))
-                route_distance += routing.GetArcCostForVehicle(
-                    previous_index, index, vehicle_id,
-                )
-            plan_output += '{0}\n'.format(manager.IndexToNode(index))
-            plan_output += 'Distance of the route: {0}m\n'.format(route_distance)
+        print(f'Objective: {result.objective}')
+        for vehicle_id, (route, route_distance) in enumerate(zip(result.routes, result.costs)):
+            plan_output = ''.join((
+                'Route for vehicle {0}:\n'.format(vehicle_id),
+                ''.join(' {0} -> '.format(node) for node in route[:-1]),
+                '{0}\n'.format(route[-1]),
+                'Distance of the route: {0}m\n'.format(route_distance),
+            ))
             print(plan_output)
-            max_route_distance = max(route_distance, max_route_distance)
-        print('Maximum of the route distances: {0}m'.format(max_route_distance))
+        print('Maximum of the route distances: {0}m'.format(max(result.costs)))
 
     @classmethod
-    def solve(cls, path):
+    def solve(cls, path, options=None):
         """Solve the problem.
 
         Args:
             path: Path for the input files.
+            options: Search options overriding the defaults of the solver.
 
+        Returns:
+            The solution found, or None.
         """
+        start = time.perf_counter()
+        options = options or SearchOptions()
         vrp_object = cls(path)
+        record_phase(options, 'load')
 
         # Create the routing index manager.
         manager = pywrapcp.RoutingIndexManager(
@@ -75,22 +76,8 @@ class VRP(object):
         # Create Routing Model.
         routing = pywrapcp.RoutingModel(manager)
 
-        # Create and register a transit callback.
-        def distance_callback(from_index, to_index):
-            """Convert from routing variable Index to distance matrix NodeIndex.
-
-            Args:
-                from_index: start node
-                to_index: destination node
-
-            Returns:
-                Returns the distance between the two nodes.
-            """
-            from_node = manager.IndexToNode(from_index)
-            to_node = manager.IndexToNode(to_index)
-            return vrp_object.input_data['distance_matrix'][from_node][to_node]
-
-        transit_callback_index = routing.RegisterTransitCallback(distance_callback)
+        # Register the distance matrix as a native transit callback.
+        transit_callback_index = register_transit_matrix(routing, vrp_object.input_data['distance_matrix'])
 
         # Define cost of each arc.
         routing.SetArcCostEvaluatorOfAllVehicles(transit_callback_index)
@@ -105,19 +92,54 @@ class VRP(object):
             dimension_name,
         )
         distance_dimension = routing.GetDimensionOrDie(dimension_name)
-        distance_dimension.SetGlobalSpanCostCoefficient(100)
+        distance_dimension.SetGlobalSpanCostCoefficient(SPAN_COST_COEFFICIENT)
+
+        # Keep only the arcs towards the nearest neighbors, if requested.
+        pruned = restrict_arcs(
+            manager,
+            routing,
+            vrp_object.input_data['distance_matrix'],
+            vrp_object.input_data['depot'],
+            options.neighbors,
+        )
 
         # Setting first solution heuristic.
-        search_parameters = pywrapcp.DefaultRoutingSearchParameters()
-        search_parameters.first_solution_strategy = (
-            routing_enums_pb2.FirstSolutionStrategy.PATH_CHEAPEST_ARC
+        search_parameters = build_search_parameters(
+            options,
+            first_solution_strategy='PATH_CHEAPEST_ARC',
+        )
+        if pruned:
+            bound_search(search_parameters)
+
+        # Seed the search with the initial routes, if any.
+        initial_routes = hint_routes(
+            manager, options, vrp_object.input_data['distance_matrix'], vrp_object.input_data['depot'],
         )
 
+        # Bound the objective, for the optimality gap.
+        bound = lower_bound('vrp', vrp_object.input_data, SPAN_COST_COEFFICIENT)
+
+        record_phase(options, 'build')
+
         # Solve the problem.
-        solution = routing.SolveWithParameters(search_parameters)
+        solution = run_search(routing, search_parameters, options, initial_routes, lower_bound=bound)
+        record_phase(options, 'solve')
+
+        # Widen the neighborhoods if the pruned model has no solution.
+        widened = widen_neighbors(options, time.perf_counter() - start) if not solution and pruned else None
+        if widened is not None:
+            print('No solution with {0} neighbors, widening the neighborhoods'.format(options.neighbors))
+            return cls.solve(path, widened)
 
         # Print solution on console.
-        if solution:
-            vrp_object.print_solution(manager, routing, solution)
-        else:
+        if not solution:
             print('No solution found !')
+            return None
+        result = extract_solution(
+            'vrp', manager, routing, solution,
+            vrp_object.input_data['distance_matrix'],
+            lower_bound=bound,
+        )
+        vrp_object.print_solution(result)
+        record_phase(options, 'extract')
+        return result
@@ -0,0 +1,101 @@
+"""Warm start of the search from a previous route plan.
+
+A route plan is one list of nodes per vehicle, as reported by print_solution
+and stored in SolveResult.routes. Before seeding the search the plan is
+repaired against the current instance: depots are stripped, stops that no
+longer exist or are visited twice are dropped, and new stops are inserted at
+their cheapest position.
+"""
+
+import json
+
+
+def load_routes(path):
+    """Load a route plan from a JSON file.
+
+    The file holds either the list of routes or a solve result with a routes key.
+
+    Args:
+        path: Path of the JSON file.
+
+    Returns:
+        One list of nodes per vehicle.
+    """
+    with open(path) as json_file:
+        routes = json.load(json_file)
+    if isinstance(routes, dict):
+        return routes['routes']
+    return routes
+
+
+def insertion_cost(matrix, route, position, node, depot):
+    """Return the extra cost of inserting a node in a route.
+
+    Args:
+        matrix: Cost matrix indexed by node.
+        route: Stops of the route, without the depot.
+        position: Position of the node in the route after the insertion.
+        node: Node to insert.
+        depot: Depot node.
+
+    Returns:
+        The cost increase of the route.
+    """
+    previous_node = route[position - 1] if position else depot
+    next_node = route[position] if position < len(route) else depot
+    # Entries of narrow integer arrays would overflow in the sum.
+    return int(matrix[previous_node][node]) + int(matrix[node][next_node]) - int(matrix[previous_node][next_node])
+
+
+def repair_routes(routes, matrix, depot, num_vehicles):
+    """Fit a previous route plan to the current instance.
+
+    Args:
+        routes: One list of nodes per vehicle, with or without the depot.
+        matrix: Cost matrix indexed by node.
+        depot: Depot node.
+        num_vehicles: Number of vehicles of the instance.
+
+    Returns:
+        One list of stops per vehicle, without the depot, visiting every node once.
+    """
+    num_nodes = len(matrix)
+    routes = list(routes)[:num_vehicles]
+    routes += [[] for _ in range(num_vehicles - len(routes))]
+    visited = {depot}
+    repaired = []
+    for route in routes:
+        stops = []
+        for node in route:
+            if 0 <= node < num_nodes and node not in visited:
+                visited.add(node)
+                stops.append(node)
+        repaired.append(stops)
+    for node in range(num_nodes):
+        if node in visited:
+            continue
+        _, vehicle, position = min(
+            (insertion_cost(matrix, route, position, node, depot), vehicle, position)
+            for vehicle, route in enumerate(repaired)
+            for position in range(len(route) + 1)
+        )
+        repaired[vehicle].insert(position, node)
+    return repaired
+
+
+def hint_routes(manager, options, matrix, depot):
+    """Return the initial routes of the options as routing variable indices.
+
+    Args:
+        manager: Manager for any NodeIndex <-> variable index conversion.
+        options: Search options, possibly holding initial_routes.
+        matrix: Cost matrix indexed by node, used to insert new stops.
+        depot: Depot node.
+
+    Returns:
+        The repaired routes as variable indices, or None without initial routes.
+    """
+    if options is None or options.initial_routes is None:
+        return None
+    repaired = repair_routes(options.initial_routes, matrix, depot, manager.GetNumberOfVehicles())
+    return [[manager.NodeToIndex(node) for node in route] for route in repaired]
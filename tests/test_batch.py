@@ -0,0 +1,29 @@
+#!/usr/bin/env python
+
+"""Tests for `ort_optimization.batch` module."""
+
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from ort_optimization.batch import run_batch
+
+DATA_FOLDER = Path(__file__).parent.parent / 'data_input_files'
+
+
+class TestBatch(unittest.TestCase):
+    """Tests for the batch solve."""
+
+    def test_failure_is_isolated(self):
+        """An invalid instance is reported without stopping the others."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            bad_path = str(Path(tmp_dir) / 'bad.json')
+            with open(bad_path, 'w') as bad_file:
+                bad_file.write('{')
+            paths = [bad_path, str(DATA_FOLDER / 'tsp.json'), str(DATA_FOLDER / 'twcp.json')]
+            records = {record['path']: record for record in run_batch(paths, workers=2)}
+        self.assertEqual(records[bad_path]['status'], 'error')
+        self.assertEqual(records[paths[1]]['status'], 'ok')
+        self.assertEqual(records[paths[1]]['problem'], 'tsp')
+        self.assertEqual(records[paths[2]]['problem'], 'twcp')
@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+
+"""Tests for `ort_optimization.bounds` module."""
+
+
+import contextlib
+import io
+import tempfile
+import unittest
+from pathlib import Path
+
+from ort_optimization.bounds import held_karp_bound, lower_bound, vehicles_needed
+from ort_optimization.generator import generate, write_instance
+from ort_optimization.instance import load_instance
+from ort_optimization.search import SearchOptions
+from ort_optimization.solvers import get_solver
+from ort_optimization.validate import evaluate
+
+DATA_FOLDER = Path(__file__).parent.parent / 'data_input_files'
+
+
+class TestBounds(unittest.TestCase):
+    """Tests for the lower bounds of the objective."""
+
+    def test_held_karp(self):
+        """The Held-Karp bound of the sample TSP is its optimal tour."""
+        input_data = load_instance(DATA_FOLDER / 'tsp.json')
+        self.assertEqual(held_karp_bound(input_data['distance_matrix'], input_data['depot']), 7293)
+
+    def test_bounds_hold(self):
+        """The bound of every problem is below the objective of its solution."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for problem in ('cvrp', 'pdp', 'tsp', 'twcp', 'twdcp', 'vrp'):
+                path = Path(tmp_dir) / '{0}.json'.format(problem)
+                write_instance(generate(problem, 25, seed=5), path)
+                with contextlib.redirect_stdout(io.StringIO()):
+                    result = get_solver(problem).solve(str(path), SearchOptions(time_limit=0.5))
+                self.assertIsNotNone(result.lower_bound, problem)
+                self.assertLessEqual(result.lower_bound, result.objective, problem)
+                self.assertGreater(result.lower_bound, 0, problem)
+
+    def test_non_metric_span(self):
+        """The span bound holds when a detour is shorter than the direct arc."""
+        matrix = [[0, 1, 10], [1, 0, 1], [10, 1, 0]]
+        input_data = {'distance_matrix': matrix, 'num_vehicles': 2, 'depot': 0, 'travel distance': 100}
+        plan = evaluate('vrp', input_data, [[0, 1, 2, 0], [0, 0]])
+        self.assertEqual(plan.objective, 12 + 100 * 12)
+        self.assertLessEqual(lower_bound('vrp', input_data, 100), plan.objective)
+
+    def test_vehicles_needed(self):
+        """The largest vehicles are filled first."""
+        self.assertEqual(vehicles_needed([0, 4, 5, 6], [5, 10, 3]), 2)
+        self.assertEqual(vehicles_needed([0, 40], [5, 10, 3]), 3)
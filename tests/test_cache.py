@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+
+"""Tests for `ort_optimization.cache` module."""
+
+
+import contextlib
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from ort_optimization.cache import SolutionCache, instance_hash
+from ort_optimization.instance import json_to_binary, load_instance
+from ort_optimization.result import SolveResult
+from ort_optimization.search import SearchOptions
+
+DATA_FOLDER = Path(__file__).parent.parent / 'data_input_files'
+
+
+class TestCache(unittest.TestCase):
+    """Tests for the solution cache."""
+
+    def setUp(self):
+        """Create a temporary folder for the store."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.folder = Path(self.tmp_dir.name)
+
+    def tearDown(self):
+        """Remove the temporary folder."""
+        self.tmp_dir.cleanup()
+
+    def test_hash_is_canonical(self):
+        """Reordered keys and the binary format give the same hash."""
+        input_data = load_instance(DATA_FOLDER / 'pdp.json')
+        reordered = dict(reversed(list(input_data.items())))
+        json_to_binary(DATA_FOLDER / 'pdp.json', self.folder / 'pdp.json')
+        binary = load_instance(self.folder / 'pdp.json')
+        key = instance_hash('pdp', input_data)
+        self.assertEqual(instance_hash('pdp', reordered), key)
+        self.assertEqual(instance_hash('pdp', binary), key)
+        self.assertNotEqual(instance_hash('vrp', input_data), key)
+        self.assertNotEqual(instance_hash('pdp', input_data, SearchOptions(time_limit=1)), key)
+
+    def test_hit_and_miss(self):
+        """A second identical request is served from the store."""
+        cache = SolutionCache(self.folder / 'store')
+        with contextlib.redirect_stdout(io.StringIO()):
+            first = cache.solve('tsp', str(DATA_FOLDER / 'tsp.json'))
+            second = cache.solve('tsp', str(DATA_FOLDER / 'tsp.json'))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual(second.to_dict(), first.to_dict())
+
+    def test_lru_eviction(self):
+        """The least recently used results are evicted over the size bound."""
+        result = SolveResult('tsp', 1, [[0, 1, 0]])
+        entry_size = len(json.dumps(result.to_dict()))
+        cache = SolutionCache(self.folder / 'store', max_bytes=2 * entry_size)
+        cache.put('a', result)
+        cache.put('b', result)
+        cache.get('a')
+        cache.put('c', result)
+        self.assertIsNotNone(cache.get('a'))
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNotNone(cache.get('c'))
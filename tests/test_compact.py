@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+
+"""Tests for `ort_optimization.compact` module."""
+
+
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from ort_optimization.compact import SymmetricMatrix, pack_matrix, packed_dtype
+from ort_optimization.instance import load_instance, matrix_dtype, read_json
+
+DATA_FOLDER = Path(__file__).parent.parent / 'data_input_files'
+
+
+class TestCompact(unittest.TestCase):
+    """Tests for the packed matrices."""
+
+    def test_symmetric_matrix(self):
+        """A symmetric matrix keeps its upper triangle and answers like the dense one."""
+        rows = read_json(DATA_FOLDER / 'vrp.json')['distance_matrix']
+        dense = np.array(rows)
+        matrix = load_instance(DATA_FOLDER / 'vrp.json')['distance_matrix']
+        self.assertIsInstance(matrix, SymmetricMatrix)
+        self.assertEqual(matrix.dtype, np.int16)
+        self.assertEqual(matrix.nbytes, len(dense) * (len(dense) + 1))
+        self.assertEqual(matrix.tolist(), rows)
+        np.testing.assert_array_equal(np.asarray(matrix), dense)
+        self.assertEqual(matrix[3][7], rows[3][7])
+        self.assertEqual(matrix[7, 3], rows[7][3])
+        self.assertIsInstance(matrix[7, 3], int)
+        stops = np.array([4, 1, 9])
+        np.testing.assert_array_equal(matrix[np.ix_(stops, stops[:2])], dense[np.ix_(stops, stops[:2])])
+
+    def test_pack_matrix(self):
+        """Other matrices are stored in the narrowest dtype, or left alone."""
+        asymmetric = pack_matrix([[0, 300], [70000, 0]])
+        self.assertIsInstance(asymmetric, np.ndarray)
+        self.assertEqual(asymmetric.dtype, np.int32)
+        self.assertEqual(pack_matrix([[0, 5], [5, 0]]).dtype, np.int8)
+        floats = [[0, 1.5], [1.5, 0]]
+        self.assertIs(pack_matrix(floats), floats)
+
+    def test_packed_dtype(self):
+        """The binary files use the same selection, from int32 up."""
+        small = np.array([[0, 5], [5, 0]])
+        large = np.array([[0, 2 ** 40], [5, 0]])
+        self.assertEqual(packed_dtype(small), np.int8)
+        self.assertEqual(packed_dtype(large), np.int64)
+        self.assertEqual(matrix_dtype(small), np.int32)
+        self.assertEqual(matrix_dtype(large), np.int64)
+        self.assertEqual(matrix_dtype(np.zeros((0, 0), dtype=np.int64)), np.int32)
@@ -0,0 +1,46 @@
+#!/usr/bin/env python
+
+"""Tests for `ort_optimization.decompose` module."""
+
+
+import contextlib
+import io
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from ort_optimization.decompose import assign_vehicles, partition, plan_objective, solve_decomposed
+from ort_optimization.instance import load_instance
+from ort_optimization.search import SearchOptions
+
+DATA_FOLDER = Path(__file__).parent.parent / 'data_input_files'
+
+
+class TestDecompose(unittest.TestCase):
+    """Tests for the cluster-first, route-second decomposition."""
+
+    def test_partition(self):
+        """The clusters cover every stop once and stay balanced."""
+        input_data = load_instance(DATA_FOLDER / 'vrp.json')
+        input_data['distance_matrix'] = np.asarray(input_data['distance_matrix'])
+        groups, medoids = partition('vrp', input_data, 4)
+        self.assertEqual(len(medoids), 4)
+        self.assertEqual(sorted(np.concatenate(groups).tolist()), list(range(1, 200)))
+        self.assertLessEqual(max(len(stops) for stops in groups), 199 / 4 * 1.1)
+
+    def test_assign_vehicles(self):
+        """Every cluster gets a vehicle, then the least covered ones get the others."""
+        self.assertEqual(assign_vehicles([10, 30], np.array([5, 10, 10, 10])), [[2], [0, 1, 3]])
+        with self.assertRaises(ValueError):
+            assign_vehicles([10, 30], np.array([5]))
+
+    def test_solve_decomposed(self):
+        """The stitched plan visits every stop once and its objective is recomputed."""
+        path = str(DATA_FOLDER / 'vrp.json')
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = solve_decomposed('vrp', path, clusters=2, workers=1, options=SearchOptions(time_limit=1))
+        stops = sorted(node for route in result.routes for node in route[1:-1])
+        self.assertEqual(stops, list(range(1, 200)))
+        self.assertEqual(len(result.routes), 16)
+        self.assertEqual(result.objective, plan_objective('vrp', load_instance(path), result.routes))
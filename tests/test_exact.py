@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+
+"""Tests for `ort_optimization.exact` module."""
+
+
+import contextlib
+import io
+import itertools
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from ort_optimization.exact import held_karp_tour
+from ort_optimization.search import SearchOptions
+from ort_optimization.tsp import TSP
+
+DATA_FOLDER = Path(__file__).parent.parent / 'data_input_files'
+
+
+class TestExact(unittest.TestCase):
+    """Tests for the exact small TSP engine."""
+
+    def test_held_karp_tour(self):
+        """The tour is the cheapest of all the permutations, from any depot."""
+        rand = np.random.default_rng(1)
+        for size, depot in ((2, 1), (5, 3), (8, 0)):
+            matrix = rand.integers(1, 100, (size, size))
+            cost, route = held_karp_tour(matrix, depot)
+            stops = [node for node in range(size) if node != depot]
+            optimum = min(
+                sum(matrix[from_node, to_node] for from_node, to_node in zip((depot,) + tour, tour + (depot,)))
+                for tour in itertools.permutations(stops)
+            )
+            self.assertEqual(cost, optimum)
+            self.assertEqual(cost, sum(matrix[from_node, to_node] for from_node, to_node in zip(route, route[1:])))
+            self.assertEqual((route[0], route[-1], sorted(route[1:-1])), (depot, depot, stops))
+
+    def test_dispatch(self):
+        """The sample TSP is solved exactly by default, with the routing model on request."""
+        path = str(DATA_FOLDER / 'tsp.json')
+        with contextlib.redirect_stdout(io.StringIO()):
+            exact = TSP.solve(path)
+            routing = TSP.solve(path, SearchOptions(engine='routing'))
+        self.assertEqual(exact.objective, 7293)
+        self.assertEqual(exact.gap, 0)
+        self.assertEqual(exact.costs, [exact.objective])
+        self.assertLessEqual(exact.objective, routing.objective)
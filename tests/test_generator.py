@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+
+"""Tests for `ort_optimization.generator` module."""
+
+
+import contextlib
+import io
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from ort_optimization.generator import generate, write_instance
+from ort_optimization.instance import detect_problem, load_instance
+from ort_optimization.search import SearchOptions
+from ort_optimization.solvers import SOLVERS, get_solver
+
+
+class TestGenerator(unittest.TestCase):
+    """Tests for the synthetic instance generator."""
+
+    def test_generate(self):
+        """Every generated instance has its problem type and is solved."""
+        for problem in sorted(SOLVERS):
+            with self.subTest(problem=problem), tempfile.TemporaryDirectory() as tmp_dir:
+                input_data = generate(problem, 40, seed=1)
+                self.assertEqual(detect_problem(input_data), problem)
+                self.assertEqual(generate(problem, 40, seed=1), input_data)
+                path = str(Path(tmp_dir) / 'instance.json')
+                write_instance(input_data, path, 'locations')
+                with contextlib.redirect_stdout(io.StringIO()):
+                    result = get_solver(problem).solve(path, SearchOptions(time_limit=2))
+                self.assertIsNotNone(result)
+
+    def test_write_instance(self):
+        """The JSON and binary formats hold the matrix built from the locations."""
+        input_data = generate('cvrp', 30)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            matrices = []
+            for output_format in ('json', 'binary', 'locations'):
+                path = Path(tmp_dir) / '{0}.json'.format(output_format)
+                write_instance(input_data, path, output_format)
+                matrices.append(np.asarray(load_instance(path)['distance_matrix']))
+        self.assertTrue(all(np.array_equal(matrix, matrices[0]) for matrix in matrices))
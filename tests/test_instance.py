@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+
+"""Tests for `ort_optimization.instance` module."""
+
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from ort_optimization.instance import binary_to_json, detect_problem, json_to_binary, load_instance, read_json
+
+DATA_FOLDER = Path(__file__).parent.parent / 'data_input_files'
+
+
+class TestInstance(unittest.TestCase):
+    """Tests for the binary instance format."""
+
+    def setUp(self):
+        """Create a temporary folder for the converted instances."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.folder = Path(self.tmp_dir.name)
+
+    def tearDown(self):
+        """Remove the temporary folder."""
+        self.tmp_dir.cleanup()
+
+    def test_binary_is_memory_mapped(self):
+        """Matrices of a binary instance are memory mapped int32 arrays."""
+        header_path = self.folder / 'twcp.json'
+        json_to_binary(DATA_FOLDER / 'twcp.json', header_path)
+        input_data = load_instance(header_path)
+        self.assertIsInstance(input_data['time_matrix'], np.memmap)
+        self.assertEqual(input_data['time_matrix'].dtype, np.int32)
+        self.assertNotIn('matrix_files', input_data)
+
+    def test_round_trip(self):
+        """Converting to binary and back gives the original instance."""
+        for name in ('cvrp', 'pdp', 'tsp', 'twcp', 'twdcp'):
+            header_path = self.folder / '{0}.json'.format(name)
+            json_path = self.folder / '{0}_back.json'.format(name)
+            json_to_binary(DATA_FOLDER / header_path.name, header_path)
+            binary_to_json(header_path, json_path)
+            with open(DATA_FOLDER / header_path.name) as original, open(json_path) as converted:
+                self.assertEqual(json.load(original), json.load(converted))
+
+    def test_detect_problem(self):
+        """The problem type is detected from the keys of the bundled instances."""
+        expected = {
+            'cvrp': 'cvrp',
+            'my_vrp_OLD1': 'vrp',
+            'pdp': 'pdp',
+            'tsp': 'tsp',
+            'twcp': 'twcp',
+            'twdcp': 'twdcp',
+        }
+        for name, problem in expected.items():
+            self.assertEqual(detect_problem(read_json(DATA_FOLDER / '{0}.json'.format(name))), problem)
@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+
+"""Tests for `ort_optimization.localsearch` module."""
+
+
+import contextlib
+import io
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from ort_optimization.generator import generate, write_instance
+from ort_optimization.localsearch import Tour, is_symmetric
+from ort_optimization.search import SearchOptions
+from ort_optimization.tsp import TSP
+
+
+class TestLocalSearch(unittest.TestCase):
+    """Tests for the local search engine of large TSP instances."""
+
+    def test_moves(self):
+        """2-opt reverses a path, Or-opt moves one, and stale moves are skipped."""
+        tour = Tour([0, 1, 2, 3, 4, 5, 6, 7])
+        self.assertTrue(tour.two_opt([1, 2, 5, 6]))
+        self.assertEqual(tour.nodes.tolist(), [0, 1, 5, 4, 3, 2, 6, 7])
+        self.assertFalse(tour.two_opt([1, 2, 5, 6]))
+        self.assertTrue(tour.or_opt([4, 3, 6, 7, 5, 2], 2))
+        self.assertEqual(tour.nodes.tolist(), [0, 1, 5, 2, 6, 4, 3, 7])
+        self.assertEqual(tour.positions[tour.nodes].tolist(), list(range(8)))
+        self.assertFalse(tour.or_opt([4, 3, 6, 7, 5, 2], 2))
+
+    def test_local_engine(self):
+        """The local engine gives a valid tour close to the lower bound, within the time limit."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / 'tsp.json'
+            write_instance(generate('tsp', 300, seed=4), path)
+            objectives = []
+            options = SearchOptions(engine='local', on_solution=lambda objective, _: objectives.append(objective))
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = TSP.solve(str(path), options)
+                limited = TSP.solve(str(path), SearchOptions(engine='local', time_limit=0))
+        route = result.routes[0]
+        self.assertEqual((route[0], route[-1], sorted(route[:-1])), (0, 0, list(range(300))))
+        self.assertEqual(objectives[-1], result.objective)
+        self.assertEqual(objectives, sorted(objectives, reverse=True))
+        self.assertLess(result.gap, 0.1)
+        self.assertGreaterEqual(limited.objective, result.objective)
+
+    def test_is_symmetric(self):
+        """Asymmetric matrices are detected by blocks of rows."""
+        matrix = np.arange(16).reshape(4, 4)
+        self.assertTrue(is_symmetric(matrix + matrix.T, chunk_bytes=8))
+        self.assertFalse(is_symmetric(matrix, chunk_bytes=8))
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+
+"""Tests for `ort_optimization.matrix` module."""
+
+
+import json
+import tempfile
+import tracemalloc
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from ort_optimization.instance import detect_problem, load_instance
+from ort_optimization.matrix import build_matrix
+
+CHUNK_BYTES = 16 * 1024 * 1024
+
+
+class TestMatrix(unittest.TestCase):
+    """Tests for the matrix builder."""
+
+    def test_metrics(self):
+        """Every metric matches its scalar definition."""
+        locations = [[0, 0], [3, 4], [-1, 2]]
+        np.testing.assert_array_equal(build_matrix(locations), [[0, 5, 2], [5, 0, 4], [2, 4, 0]])
+        np.testing.assert_array_equal(build_matrix(locations, 'manhattan', scale=10), [[0, 70, 30], [70, 0, 60], [30, 60, 0]])
+        rome_milan = build_matrix([[41.9028, 12.4964], [45.4642, 9.19]], 'haversine')
+        self.assertAlmostEqual(rome_milan[0, 1] / 1000, 477, delta=1)
+        with self.assertRaises(ValueError):
+            build_matrix(locations, 'chebyshev')
+
+    def test_chunks_match_single_block(self):
+        """Building by small blocks of rows gives the same matrix."""
+        locations = np.random.default_rng(0).uniform(-60, 60, (300, 2))
+        for metric in ('euclidean', 'manhattan', 'haversine'):
+            np.testing.assert_array_equal(
+                build_matrix(locations, metric, chunk_bytes=1000),
+                build_matrix(locations, metric),
+            )
+
+    def test_instance_with_locations(self):
+        """Instances giving locations get the matrix their problem expects."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / 'twcp.json'
+            with open(path, 'w') as json_file:
+                json.dump({'locations': [[0, 0], [0, 2]], 'time_windows': [[0, 5], [0, 5]]}, json_file)
+            input_data = load_instance(path)
+        self.assertEqual(detect_problem(input_data), 'twcp')
+        np.testing.assert_array_equal(input_data['time_matrix'], [[0, 2], [2, 0]])
+
+    def test_peak_memory(self):
+        """At 1k, 5k and 10k nodes the work area stays within the block budget."""
+        rng = np.random.default_rng(0)
+        build_matrix([[0, 0], [1, 1]])  # import scipy before tracing
+        for size in (1000, 5000, 10000):
+            locations = rng.uniform(0, 100000, (size, 2))
+            tracemalloc.start()
+            matrix = build_matrix(locations, chunk_bytes=CHUNK_BYTES)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            self.assertEqual(matrix.dtype, np.int32)
+            self.assertLess(peak - matrix.nbytes, 3 * CHUNK_BYTES)
+            del matrix  # noqa: WPS420
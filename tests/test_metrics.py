@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+
+"""Tests for `ort_optimization.metrics` module."""
+
+
+import contextlib
+import io
+import pstats
+import tempfile
+import unittest
+from pathlib import Path
+
+from ort_optimization.metrics import SEARCH_STATISTICS, Metrics, profiled
+from ort_optimization.pdp import PDP
+from ort_optimization.search import SearchOptions
+
+DATA_FOLDER = Path(__file__).parent.parent / 'data_input_files'
+
+
+class TestMetrics(unittest.TestCase):
+    """Tests for the phase metrics."""
+
+    def test_phases(self):
+        """Every phase of a solve is timed, with a growing peak memory."""
+        metrics = Metrics()
+        with contextlib.redirect_stdout(io.StringIO()):
+            PDP.solve(str(DATA_FOLDER / 'pdp.json'), SearchOptions(metrics=metrics))
+        phases = metrics.to_dict()['phases']
+        self.assertEqual([lap['phase'] for lap in phases], ['load', 'model', 'constraints', 'build', 'solve', 'extract'])
+        self.assertTrue(all(lap['elapsed'] >= 0 for lap in phases))
+        peaks = [lap['peak_rss'] for lap in phases]
+        self.assertEqual(peaks, sorted(peaks))
+
+    def test_search_statistics(self):
+        """The statistics of the search and the at solution callbacks are recorded."""
+        metrics = Metrics()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = PDP.solve(str(DATA_FOLDER / 'pdp.json'), SearchOptions(metrics=metrics))
+        search = metrics.to_dict()['search']
+        self.assertEqual(sorted(search), sorted(SEARCH_STATISTICS))
+        self.assertGreater(search['branches'], 0)
+        self.assertGreater(search['solutions'], 0)
+        self.assertEqual(metrics.counters['at_solution_callbacks'], search['solutions'])
+        self.assertIsNotNone(result)
+
+    def test_profiled(self):
+        """The profiled block is dumped as a pstats file."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = str(Path(tmp_dir) / 'solve.pstats')
+            with profiled(path), contextlib.redirect_stdout(io.StringIO()):
+                PDP.solve(str(DATA_FOLDER / 'pdp.json'))
+            functions = pstats.Stats(path).stats
+        self.assertTrue(any(name == 'solve' for _, _, name in functions))
@@ -3,19 +3,68 @@
 """Tests for `ort_optimization` package."""
 
 
+import json
+import subprocess
+import sys
+import tempfile
 import unittest
+from pathlib import Path
 
-from ort_optimization import ort_optimization
+from click.testing import CliRunner
+
+from ort_optimization import cli, decompose, generator, rolling, server, tsp, twdcp
+
+DATA_FOLDER = Path(__file__).parent.parent / 'data_input_files'
 
 
 class TestOrt_optimization(unittest.TestCase):
     """Tests for `ort_optimization` package."""
 
-    def setUp(self):
-        """Set up test fixtures, if any."""
+    def test_command_line_interface(self):
+        """Every solver is a command of the CLI."""
+        runner = CliRunner()
+        help_result = runner.invoke(cli.main, ['--help'])
+        self.assertEqual(help_result.exit_code, 0)
+        for command in ('cvrp', 'pdp', 'tsp', 'twcp', 'twdcp', 'vrp'):
+            self.assertIn(command, help_result.output)
+
+    def test_solve_json(self):
+        """A solver command prints its result as JSON."""
+        result = CliRunner().invoke(cli.main, ['tsp', str(DATA_FOLDER / 'tsp.json'), '--json'])
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(json.loads(result.output)['objective'], 7293)
+
+    def test_validate(self):
+        """The validate command scores a printed result, and fails on an infeasible plan."""
+        runner = CliRunner()
+        solved = runner.invoke(cli.main, ['tsp', str(DATA_FOLDER / 'tsp.json'), '--json'])
+        routes = json.loads(solved.output)['routes']
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            plans_path = Path(tmp_dir) / 'plans.json'
+            plans_path.write_text('{0}\n{1}\n'.format(solved.output.strip(), json.dumps([routes[0][:-2] + [0]])))
+            result = runner.invoke(cli.main, ['validate', str(DATA_FOLDER / 'tsp.json'), str(plans_path)])
+        evaluations = [json.loads(line) for line in result.output.splitlines()]
+        self.assertEqual(result.exit_code, 1)
+        self.assertEqual([evaluation['feasible'] for evaluation in evaluations], [True, False])
+        self.assertEqual(evaluations[0]['objective'], 7293)
+        self.assertEqual(evaluations[1]['violations'], [{'constraint': 'visits', 'node': routes[0][-2], 'value': 0, 'limit': 1}])
 
-    def tearDown(self):
-        """Tear down test fixtures, if any."""
+    def test_decompose_too_many_clusters(self):
+        """More clusters than vehicles is reported without a traceback."""
+        result = CliRunner().invoke(cli.main, ['decompose', str(DATA_FOLDER / 'vrp.json'), '--clusters', '50'])
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn('50 clusters need at least as many vehicles, got 16', result.output)
 
-    def test_000_something(self):
-        """Test something."""
+    def test_lazy_imports(self):
+        """The CLI starts without the solver dependencies, and its choices match the modules."""
+        script = 'import json, sys, ort_optimization.cli; print(json.dumps(sorted(sys.modules)))'
+        modules = json.loads(subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True).stdout)
+        for heavy in ('numpy', 'ortools', 'scipy'):
+            self.assertNotIn(heavy, modules)
+        self.assertEqual(cli.DECOMPOSED_PROBLEMS, decompose.PROBLEMS)
+        self.assertEqual(cli.OUTPUT_FORMATS, generator.OUTPUT_FORMATS)
+        self.assertEqual(cli.MAX_TIME_LIMIT, server.MAX_TIME_LIMIT)
+        self.assertEqual(cli.SERVER_TIME_LIMIT, server.DEFAULT_TIME_LIMIT)
+        self.assertEqual(cli.DOCK_SCHEDULING, twdcp.DOCK_SCHEDULING)
+        self.assertEqual(cli.STREAM_INTERVAL, rolling.DEFAULT_INTERVAL)
+        self.assertEqual(cli.TSP_ENGINES, tsp.ENGINES)
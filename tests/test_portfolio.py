@@ -0,0 +1,30 @@
+#!/usr/bin/env python
+
+"""Tests for `ort_optimization.portfolio` module."""
+
+
+import unittest
+from pathlib import Path
+
+from ort_optimization.portfolio import solve_portfolio
+
+DATA_FOLDER = Path(__file__).parent.parent / 'data_input_files'
+
+
+class TestPortfolio(unittest.TestCase):
+    """Tests for the strategy portfolio."""
+
+    def test_best_configuration_wins(self):
+        """The best objective is returned and its configuration flagged."""
+        best, outcomes = solve_portfolio('tsp', str(DATA_FOLDER / 'tsp.json'), time_limit=1, workers=2)
+        objectives = [outcome['objective'] for outcome in outcomes]
+        self.assertEqual(best.objective, min(objectives))
+        self.assertEqual(len(outcomes), 2)
+        self.assertEqual(sum(outcome.get('winner', False) for outcome in outcomes), 1)
+        self.assertEqual(best.routes[0][0], 0)
+        self.assertEqual(sorted(best.routes[0][:-1]), list(range(13)))
+
+    def test_target_objective_stops_early(self):
+        """Reaching the target objective ends the race before the deadline."""
+        best, _ = solve_portfolio('tsp', str(DATA_FOLDER / 'tsp.json'), time_limit=30, workers=2, target_objective=10 ** 6)
+        self.assertLessEqual(best.objective, 10 ** 6)
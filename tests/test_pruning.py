@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+
+"""Tests for `ort_optimization.pruning` module."""
+
+
+import contextlib
+import io
+import unittest
+from pathlib import Path
+
+from ort_optimization.metrics import Metrics
+from ort_optimization.pruning import allowed_successors, pruned_arc_ratio, widen_neighbors
+from ort_optimization.search import SearchOptions
+from ort_optimization.tsp import TSP
+from ort_optimization.vrp import VRP
+
+DATA_FOLDER = Path(__file__).parent.parent / 'data_input_files'
+
+MATRIX = (
+    (0, 1, 5, 9),
+    (1, 0, 2, 8),
+    (5, 2, 0, 3),
+    (9, 8, 3, 0),
+)
+
+
+class TestPruning(unittest.TestCase):
+    """Tests for the nearest-neighbor arc pruning."""
+
+    def test_allowed_successors(self):
+        """An arc is kept when either end is a nearest neighbor of the other."""
+        allowed = allowed_successors(MATRIX, 1)
+        self.assertEqual(allowed.tolist(), [
+            [False, True, False, False],
+            [True, False, True, False],
+            [False, True, False, True],
+            [False, False, True, False],
+        ])
+        self.assertAlmostEqual(pruned_arc_ratio(MATRIX, 1), 0.5)
+        self.assertEqual(pruned_arc_ratio(MATRIX, 3), 0)
+
+    def test_solve_pruned(self):
+        """The pruned models are solved and visit every stop."""
+        with contextlib.redirect_stdout(io.StringIO()):
+            tsp_options = SearchOptions(neighbors=2, metrics=Metrics())
+            tsp = TSP.solve(str(DATA_FOLDER / 'tsp.json'), tsp_options)
+            vrp = VRP.solve(str(DATA_FOLDER / 'vrp.json'), SearchOptions(neighbors=10, time_limit=5))
+        self.assertIsNotNone(tsp)
+        self.assertGreater(tsp_options.metrics.search['solutions'], 0)  # the routing model, not the exact engine
+        self.assertEqual(sorted(tsp.routes[0][:-1]), list(range(len(tsp.routes[0]) - 1)))
+        self.assertEqual(sum(len(route) - 2 for route in vrp.routes), 199)
+
+    def test_widen_neighbors(self):
+        """The neighbors always grow, the time limit shrinks, and no neighbors are rejected."""
+        widened = widen_neighbors(SearchOptions(neighbors=1, time_limit=5), 2)
+        self.assertEqual((widened.neighbors, widened.time_limit), (2, 3))
+        self.assertIsNone(widen_neighbors(SearchOptions(neighbors=4, time_limit=5), 6))
+        self.assertEqual(widen_neighbors(SearchOptions(neighbors=4), 6).neighbors, 8)
+        with self.assertRaises(ValueError), contextlib.redirect_stdout(io.StringIO()):
+            VRP.solve(str(DATA_FOLDER / 'vrp.json'), SearchOptions(neighbors=0, time_limit=1))
@@ -0,0 +1,46 @@
+#!/usr/bin/env python
+
+"""Tests for `ort_optimization.result` module."""
+
+
+import contextlib
+import io
+import json
+import unittest
+from pathlib import Path
+
+from ort_optimization.instance import load_instance
+from ort_optimization.result import SolveResult, write_ndjson
+from ort_optimization.twcp import TWCP
+from ort_optimization.vrp import VRP
+
+DATA_FOLDER = Path(__file__).parent.parent / 'data_input_files'
+
+
+class TestResult(unittest.TestCase):
+    """Tests for the structured results."""
+
+    def test_extract_solution(self):
+        """The route totals match the matrix and the time cumuls follow the routes."""
+        with contextlib.redirect_stdout(io.StringIO()):
+            vrp = VRP.solve(str(DATA_FOLDER / 'vrp.json'))
+            twcp = TWCP.solve(str(DATA_FOLDER / 'twcp.json'))
+        matrix = load_instance(DATA_FOLDER / 'vrp.json')['distance_matrix']
+        self.assertEqual(vrp.costs, [
+            sum(matrix[from_node][to_node] for from_node, to_node in zip(route, route[1:]))
+            for route in vrp.routes
+        ])
+        self.assertEqual(vrp.objective, sum(vrp.costs) + 100 * max(vrp.costs))
+        self.assertIsNone(vrp.loads)
+        self.assertEqual([len(route_times) for route_times in twcp.times], [len(route) for route in twcp.routes])
+        self.assertEqual(twcp.objective, sum(twcp.costs))
+
+    def test_serializers(self):
+        """Results go through JSON and NDJSON unchanged."""
+        result = SolveResult('cvrp', 10, [[0, 1, 0], [0, 0]], [10, 0], [3, 0], lower_bound=8)
+        self.assertEqual(SolveResult.from_dict(json.loads(result.to_json())).to_dict(), result.to_dict())
+        self.assertNotIn('times', result.to_dict())
+        self.assertAlmostEqual(result.to_dict()['gap'], 0.2)
+        stream = io.StringIO()
+        write_ndjson([result, SolveResult('tsp', 5, [[0, 0]])], stream)
+        self.assertEqual([json.loads(line)['objective'] for line in stream.getvalue().splitlines()], [10, 5])
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+
+"""Tests for `ort_optimization.rolling` module."""
+
+
+import json
+import random
+import socket
+import threading
+import unittest
+
+from ort_optimization.rolling import RollingPlanner, make_event_server, run_stream
+from ort_optimization.search import SearchOptions
+
+CONFIG = {'depot': [0, 0], 'num_vehicles': 3, 'vehicle_capacities': [4, 4, 4], 'horizon': 300, 'service_time': 2}
+
+
+def order_lines(count, seed=0):
+    """Return the JSON lines of random order events.
+
+    Args:
+        count: Number of orders.
+        seed: Seed of the random orders.
+
+    Returns:
+        The lines, in the order of their times.
+    """
+    rand = random.Random(seed)
+    lines = []
+    for order in range(count):
+        event_time = order * 5
+        open_time = event_time + rand.randint(0, 30)
+        lines.append(json.dumps({
+            'type': 'order',
+            'id': 'o{0}'.format(order),
+            'time': event_time,
+            'location': [rand.randint(-20, 20), rand.randint(-20, 20)],
+            'demand': rand.randint(1, 2),
+            'time_window': [open_time, open_time + rand.randint(20, 60)],
+        }))
+    return lines
+
+
+class TestRolling(unittest.TestCase):
+    """Tests for the rolling horizon planner."""
+
+    def run_planner(self, lines):
+        """Run a planner over some lines.
+
+        Args:
+            lines: JSON lines of the events.
+
+        Returns:
+            The records written by the planner.
+        """
+        records = []
+        planner = RollingPlanner(CONFIG, interval=5, options=SearchOptions(time_limit=0.2), emit=records.append)
+        run_stream(planner, lines)
+        return records
+
+    def test_stream(self):
+        """Every order is committed or rejected once, the commits within the windows and capacities."""
+        lines = order_lines(20)
+        lines.insert(10, 'not json')
+        lines.insert(12, json.dumps({'type': 'cancel', 'id': 'o10', 'time': 50}))
+        lines.insert(13, '[1, 2]')
+        records = self.run_planner(lines)
+        orders = {json.loads(line)['id']: json.loads(line) for line in lines if line.startswith('{"type": "order"')}
+        outcomes = {}
+        for record in records:
+            if record['event'] == 'commit':
+                for order_id in record['orders']:
+                    outcomes.setdefault(order_id, []).append('commit')
+                self.assertLessEqual(record['time'], record['departure'])
+                for order_id, arrival in zip(record['orders'], record['arrivals']):
+                    open_time, close_time = orders[order_id]['time_window']
+                    self.assertTrue(open_time <= arrival <= close_time)
+                self.assertLessEqual(sum(orders[order_id]['demand'] for order_id in record['orders']), 4)
+                self.assertLessEqual(record['return'], CONFIG['horizon'])
+            elif record['event'] == 'reject':
+                outcomes.setdefault(record['order'], []).append('reject')
+        summary = records[-1]
+        self.assertEqual(summary['event'], 'summary')
+        self.assertEqual(summary['errors'], 2)
+        self.assertEqual(summary['cancelled'], 1)
+        self.assertEqual(sorted(outcomes), sorted(set(orders) - {'o10'}))
+        self.assertTrue(all(len(outcome) == 1 for outcome in outcomes.values()))
+        self.assertEqual(summary['committed'] + summary['rejected'], 19)
+        self.assertGreater(summary['committed'], 0)
+        self.assertIn({'event': 'error', 'line': 11, 'error': 'Expecting value: line 1 column 1 (char 0)'}, records)
+        self.assertIn({'event': 'error', 'line': 14, 'error': 'Event [1, 2] is not a JSON object'}, records)
+
+    def test_window_after_horizon(self):
+        """An order opening after the end of the day is rejected, the others still planned."""
+        lines = order_lines(3)
+        lines.insert(1, json.dumps({'type': 'order', 'id': 'late', 'time': 2, 'location': [1, 1], 'time_window': [500, 600]}))
+        records = self.run_planner(lines)
+        self.assertIn({'event': 'reject', 'time': 2, 'order': 'late', 'reason': 'after horizon'}, records)
+        summary = records[-1]
+        self.assertEqual((summary['orders'], summary['errors']), (4, 0))
+        self.assertEqual(summary['committed'] + summary['rejected'], 4)
+        self.assertGreater(summary['committed'], 0)
+
+    def test_event_server(self):
+        """The lines of a socket client are queued for the planner."""
+        server = make_event_server(port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        with socket.create_connection(server.server_address) as client:
+            client.sendall(''.join('{0}\n'.format(line) for line in order_lines(3)).encode())
+        lines = [server.lines.get(timeout=5) for _ in range(3)]
+        server.shutdown()
+        server.server_close()
+        self.assertEqual([json.loads(line)['id'] for line in lines], ['o0', 'o1', 'o2'])
@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+
+"""Tests for `ort_optimization.search` module."""
+
+
+import contextlib
+import io
+import tempfile
+import unittest
+from pathlib import Path
+
+from ortools.constraint_solver import routing_enums_pb2
+
+from ort_optimization.generator import generate, write_instance
+from ort_optimization.result import optimality_gap
+from ort_optimization.search import SearchOptions, build_search_parameters
+from ort_optimization.tsp import TSP
+from ort_optimization.vrp import VRP
+
+DATA_FOLDER = Path(__file__).parent.parent / 'data_input_files'
+
+
+class TestSearch(unittest.TestCase):
+    """Tests for the shared search parameters."""
+
+    def test_options_override_defaults(self):
+        """Options given by the caller take precedence over the solver defaults."""
+        options = SearchOptions(first_solution_strategy='SAVINGS', solution_limit=7, lns_time_limit=0.5)
+        search_parameters = build_search_parameters(options, time_limit=2)
+        self.assertEqual(search_parameters.first_solution_strategy, routing_enums_pb2.FirstSolutionStrategy.SAVINGS)
+        self.assertEqual(search_parameters.time_limit.ToMilliseconds(), 2000)
+        self.assertEqual(search_parameters.solution_limit, 7)
+        self.assertEqual(search_parameters.lns_time_limit.ToMilliseconds(), 500)
+
+    def test_on_solution_streams_improvements(self):
+        """Every reported solution improves on the previous one."""
+        solutions = []
+
+        def on_solution(objective, elapsed):
+            solutions.append((objective, elapsed))
+            return len(solutions) == 3
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = VRP.solve(str(DATA_FOLDER / 'my_vrp_OLD1.json'), SearchOptions(on_solution=on_solution))
+        self.assertEqual(len(solutions), 3)
+        objectives = [objective for objective, _ in solutions]
+        self.assertEqual(objectives, sorted(objectives, reverse=True))
+        self.assertEqual(result.objective, objectives[-1])
+
+    def test_target_gap_stops_search(self):
+        """The search stops at the first solution within the target gap of the lower bound."""
+        objectives = []
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / 'tsp.json'
+            write_instance(generate('tsp', 60, seed=2), path)
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = TSP.solve(str(path), SearchOptions(target_gap=0.1, on_solution=lambda objective, _: objectives.append(objective)))
+        self.assertLessEqual(result.gap, 0.1)
+        self.assertEqual(objectives[-1], result.objective)
+        self.assertTrue(all(optimality_gap(objective, result.lower_bound) > 0.1 for objective in objectives[:-1]))
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+
+"""Tests for `ort_optimization.server` module."""
+
+
+import json
+import threading
+import time
+import unittest
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import numpy as np
+
+from ort_optimization.instance import load_instance
+from ort_optimization.server import BINARY_CONTENT_TYPE, SolveService, make_server, pack_binary, unpack_binary
+
+DATA_FOLDER = Path(__file__).parent.parent / 'data_input_files'
+
+
+class TestServer(unittest.TestCase):
+    """Tests for the HTTP solve service."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Serve with one warm worker and no queue on a free port."""
+        cls.service = SolveService(workers=1, queue_size=0)
+        cls.server = make_server(cls.service, port=0)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.url = 'http://127.0.0.1:{0}'.format(cls.server.server_address[1])
+
+    @classmethod
+    def tearDownClass(cls):
+        """Stop the server and the workers."""
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.service.shutdown()
+
+    def request(self, path, body=None, content_type='application/json'):
+        """Send a request to the service.
+
+        Args:
+            path: Path and query of the request.
+            body: Bytes posted, or None for a GET request.
+            content_type: Content type of the body.
+
+        Returns:
+            The HTTP status and the decoded JSON answer.
+        """
+        request = urllib.request.Request(self.url + path, data=body, headers={'Content-Type': content_type})
+        try:
+            with urllib.request.urlopen(request) as response:
+                return response.status, json.loads(response.read())
+        except urllib.error.HTTPError as er:
+            return er.code, json.loads(er.read())
+
+    def test_binary_body(self):
+        """A binary body holds the same instance as its JSON file."""
+        input_data = load_instance(DATA_FOLDER / 'twcp.json')
+        unpacked = unpack_binary(pack_binary(input_data))
+        self.assertTrue(np.array_equal(unpacked.pop('time_matrix'), input_data.pop('time_matrix')))
+        self.assertEqual(unpacked, input_data)
+        status, record = self.request('/solve/twcp', pack_binary(load_instance(DATA_FOLDER / 'twcp.json')), BINARY_CONTENT_TYPE)
+        self.assertEqual(status, 200)
+        self.assertEqual(record['status'], 'ok')
+
+    def test_solve(self):
+        """A JSON instance is solved synchronously, its problem being detected."""
+        status, record = self.request('/solve', (DATA_FOLDER / 'tsp.json').read_bytes())
+        self.assertEqual(status, 200)
+        self.assertEqual(record['problem'], 'tsp')
+        self.assertEqual(record['result']['objective'], 7293)
+        status, record = self.request('/solve', b'{')
+        self.assertEqual(record['status'], 'error')
+
+    def test_jobs(self):
+        """Jobs are polled by id, and refused beyond the workers and the queue."""
+        status, job = self.request('/jobs/vrp?time_limit=1', (DATA_FOLDER / 'vrp.json').read_bytes())
+        self.assertEqual(status, 202)
+        status, _ = self.request('/jobs/tsp', (DATA_FOLDER / 'tsp.json').read_bytes())
+        self.assertEqual(status, 503)
+        deadline = time.monotonic() + 30
+        record = {'status': 'queued'}
+        while record['status'] in {'queued', 'running'} and time.monotonic() < deadline:
+            time.sleep(0.1)
+            status, record = self.request('/jobs/{0}'.format(job['id']))
+        self.assertEqual(record['status'], 'ok')
+        self.assertEqual(record['time_limit'], 1)
+        self.assertEqual(self.request('/jobs/unknown')[0], 404)
+
+    def test_job_time_limit(self):
+        """Every job gets a time limit capped by the largest one, even when it gives none."""
+        self.assertEqual(self.service.job_time_limit(), 10)
+        self.assertEqual(self.service.job_time_limit(600), 60)
+        self.service.default_time_limit = None
+        try:
+            self.assertEqual(self.service.job_time_limit(), 60)
+        finally:
+            self.service.default_time_limit = 10
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+
+"""Tests for `ort_optimization.session` module."""
+
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from ort_optimization.generator import generate, write_instance
+from ort_optimization.search import SearchOptions
+from ort_optimization.session import RoutingSession
+
+
+class TestSession(unittest.TestCase):
+    """Tests for the order events of a routing session."""
+
+    def setUp(self):
+        """Create a temporary folder for the generated instances."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.folder = Path(self.tmp_dir.name)
+
+    def tearDown(self):
+        """Remove the temporary folder."""
+        self.tmp_dir.cleanup()
+
+    def session(self, problem, orders):
+        """Start a session on a generated instance.
+
+        Args:
+            problem: cvrp or pdp.
+            orders: Orders of the initial plan, or a function of the instance data returning them.
+
+        Returns:
+            The session and the instance data.
+        """
+        input_data = generate(problem, 40, seed=4)
+        path = self.folder / '{0}.json'.format(problem)
+        write_instance(input_data, path)
+        options = SearchOptions(time_limit=0.5)
+        return RoutingSession(problem, str(path), orders(input_data), options), input_data
+
+    def test_cvrp_events(self):
+        """Inserted orders are planned within the capacities, behind the visited stops."""
+        session, input_data = self.session('cvrp', lambda _: range(1, 35))
+        visited = [route[:2] if len(route) >= 2 else [] for route in session.routes]
+        for route in visited:
+            if route:
+                session.lock(route[1])
+        for order in range(35, 40):
+            self.assertTrue(session.insert(order))
+        session.cancel(next(node for route in session.routes for node in route[2:]))
+        with self.assertRaises(ValueError):
+            session.cancel(next(route[0] for route in visited if route))
+        result = session.result()
+        stops = sorted(node for route in result.routes for node in route[1:-1])
+        self.assertEqual(stops, sorted(session.orders))
+        self.assertEqual(len(stops), 38)
+        for route, previous_route in zip(session.routes, visited):
+            self.assertEqual(route[:len(previous_route)], previous_route)
+        for load, capacity in zip(result.loads, input_data['vehicle_capacities']):
+            self.assertLessEqual(load, capacity)
+
+    def test_pdp_events(self):
+        """Inserted pairs are picked up before being delivered by the same vehicle."""
+        session, input_data = self.session('pdp', lambda input_data: input_data['pickups_deliveries'][2:])
+        for order in input_data['pickups_deliveries'][:2]:
+            self.assertTrue(session.insert(order))
+        with self.assertRaises(ValueError):
+            session.insert(input_data['pickups_deliveries'][0])
+        for pickup, delivery in input_data['pickups_deliveries']:
+            pickup_vehicle, pickup_position = session.locate(pickup)
+            delivery_vehicle, delivery_position = session.locate(delivery)
+            self.assertEqual(pickup_vehicle, delivery_vehicle)
+            self.assertLess(pickup_position, delivery_position)
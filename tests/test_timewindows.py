@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+
+"""Tests for `ort_optimization.timewindows` module."""
+
+
+import contextlib
+import io
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from ort_optimization.generator import generate, write_instance
+from ort_optimization.instance import load_instance
+from ort_optimization.search import SearchOptions
+from ort_optimization.timewindows import tighten_windows
+from ort_optimization.twcp import TWCP
+
+DATA_FOLDER = Path(__file__).parent.parent / 'data_input_files'
+
+
+class TestTimeWindows(unittest.TestCase):
+    """Tests for the time window preprocessing."""
+
+    def test_tighten_windows(self):
+        """Windows are tightened from the depot and impossible arcs are removed."""
+        time_matrix = [
+            [0, 5, 5],
+            [5, 0, 2],
+            [5, 2, 0],
+        ]
+        earliest, latest, possible = tighten_windows(time_matrix, [[0, 20], [0, 6], [0, 20]], 0, 20)
+        self.assertEqual(earliest.tolist(), [0, 5, 5])
+        self.assertEqual(latest.tolist(), [20, 6, 15])
+        self.assertFalse(possible[2, 1])  # 2 is reached at 5 at the earliest, 1 closes at 6
+        self.assertTrue(possible[1, 2])
+
+    def test_no_solution_lost(self):
+        """The routes found without preprocessing use kept arcs within the tightened windows."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = str(Path(tmp_dir) / 'twcp.json')
+            write_instance(generate('twcp', 40, seed=2), path)
+            input_data = load_instance(path)
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = TWCP.solve(path, SearchOptions(time_limit=5, window_pruning=False))
+        earliest, latest, possible = tighten_windows(
+            input_data['time_matrix'], input_data['time_windows'], input_data['depot'], input_data['maximum_time'],
+        )
+        self.assertLess(possible.sum(), len(possible) * (len(possible) - 1))
+        for route, times in zip(result.routes, result.times):
+            stops = np.array(route[1:-1], dtype=int)
+            self.assertTrue(possible[stops[:-1], stops[1:]].all())
+            arrivals = np.array([time_window[0] for time_window in times[1:-1]])
+            self.assertTrue(((earliest[stops] <= arrivals) & (arrivals <= latest[stops])).all())
+
+    def test_same_objective(self):
+        """The preprocessing keeps the objective of the sample instance."""
+        with contextlib.redirect_stdout(io.StringIO()):
+            plain = TWCP.solve(str(DATA_FOLDER / 'twcp.json'), SearchOptions(window_pruning=False))
+            preprocessed = TWCP.solve(str(DATA_FOLDER / 'twcp.json'))
+        self.assertEqual(preprocessed.objective, plain.objective)
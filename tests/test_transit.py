@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+
+"""Tests for `ort_optimization.transit` module."""
+
+
+import unittest
+
+import numpy as np
+from ortools.constraint_solver import pywrapcp
+
+from ort_optimization.transit import register_transit_matrix, register_unary_transit_vector
+
+
+class TestTransit(unittest.TestCase):
+    """Tests for the native transit callbacks."""
+
+    def setUp(self):
+        """Create a small routing model."""
+        self.matrix = [[0, 3, 5], [4, 0, 7], [6, 8, 0]]
+        self.manager = pywrapcp.RoutingIndexManager(3, 1, 0)
+        self.routing = pywrapcp.RoutingModel(self.manager)
+
+    def test_transit_matrix(self):
+        """The registered matrix is evaluated by node."""
+        callback_index = register_transit_matrix(self.routing, np.array(self.matrix))
+        self.routing.SetArcCostEvaluatorOfAllVehicles(callback_index)
+        self.routing.CloseModel()
+        for from_node in range(3):
+            for to_node in range(1, 3):
+                if from_node == to_node:
+                    continue
+                cost = self.routing.GetArcCostForVehicle(
+                    self.manager.NodeToIndex(from_node), self.manager.NodeToIndex(to_node), 0,
+                )
+                self.assertEqual(cost, self.matrix[from_node][to_node])
+
+    def test_unary_transit_vector(self):
+        """The registered vector is evaluated by node."""
+        demands = [0, 2, 9]
+        callback_index = register_unary_transit_vector(self.routing, demands)
+        self.routing.AddDimension(callback_index, 0, 100, True, 'Load')  # noqa: WPS425
+        self.routing.CloseModel()
+        solution = self.routing.ReadAssignmentFromRoutes([[2, 1]], True)  # noqa: WPS425
+        load = self.routing.GetDimensionOrDie('Load')
+        self.assertEqual(solution.Value(load.CumulVar(self.routing.End(0))), sum(demands))
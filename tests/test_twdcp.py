@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+
+"""Tests for `ort_optimization.twdcp` module."""
+
+
+import contextlib
+import io
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from ort_optimization.generator import generate, write_instance
+from ort_optimization.search import SearchOptions
+from ort_optimization.twdcp import TWDCP
+
+DATA_FOLDER = Path(__file__).parent.parent / 'data_input_files'
+
+
+def solve(path, **options):
+    """Solve a TWDCP instance quietly.
+
+    Args:
+        path: Path of the instance.
+        options: Search options.
+
+    Returns:
+        The solution found, or None.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        return TWDCP.solve(str(path), SearchOptions(**options))
+
+
+class TestTWDCP(unittest.TestCase):
+    """Tests for the dock constraints of TWDCP."""
+
+    def test_dock_pools(self):
+        """With a single load dock the routes leave the depot one load time apart, past the default horizon."""
+        input_data = dict(generate('twdcp', 30, seed=1), load_docks=1, unload_docks=2)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / 'twdcp.json'
+            write_instance(input_data, path)
+            result = solve(path, time_limit=5)
+        starts = sorted(times[0][0] for times in result.times if len(times) > 2)
+        self.assertGreater(len(starts), 1)
+        for previous, following in zip(starts, starts[1:]):
+            self.assertGreaterEqual(following - previous, input_data['vehicle_load_time'])
+        self.assertGreater(max(times[-1][0] for times in result.times), 60)
+
+    def test_two_stage(self):
+        """The two stage dock scheduling finds the objective of the joint one on the sample instance."""
+        joint = solve(DATA_FOLDER / 'twdcp.json')
+        two_stage = solve(DATA_FOLDER / 'twdcp.json', dock_scheduling='two_stage')
+        self.assertEqual(two_stage.objective, joint.objective)
+
+    def test_two_stage_time_limit(self):
+        """The two stages share the time limit of the solve."""
+        start = time.perf_counter()
+        result = solve(DATA_FOLDER / 'twdcp.json', dock_scheduling='two_stage', time_limit=2, local_search_metaheuristic='GUIDED_LOCAL_SEARCH')
+        self.assertIsNotNone(result)
+        self.assertLess(time.perf_counter() - start, 2.5)
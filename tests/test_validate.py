@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+
+"""Tests for `ort_optimization.validate` module."""
+
+
+import contextlib
+import io
+import json
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from ort_optimization import pdp, twdcp, validate, vrp
+from ort_optimization.generator import generate, write_instance
+from ort_optimization.instance import load_instance
+from ort_optimization.search import SearchOptions
+from ort_optimization.solvers import get_solver
+from ort_optimization.validate import evaluate, evaluate_plans
+
+DATA_FOLDER = Path(__file__).parent.parent / 'data_input_files'
+MATRIX = np.array([
+    [0, 2, 3, 4],
+    [2, 0, 1, 3],
+    [3, 1, 0, 2],
+    [4, 3, 2, 0],
+])
+
+
+class TestValidate(unittest.TestCase):
+    """Tests for the evaluation of route plans."""
+
+    def test_solver_results(self):
+        """The solutions of the solvers are feasible, with their own objective and totals."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cvrp_path = Path(tmp_dir) / 'cvrp.json'
+            write_instance(generate('cvrp', 20, seed=3), cvrp_path)
+            for problem, path in (('cvrp', cvrp_path), ('pdp', DATA_FOLDER / 'pdp.json'), ('twdcp', DATA_FOLDER / 'twdcp.json')):
+                with contextlib.redirect_stdout(io.StringIO()):
+                    result = get_solver(problem).solve(str(path), SearchOptions(time_limit=1))
+                evaluation = evaluate(problem, load_instance(path), result.routes, result.times)
+                self.assertEqual(evaluation.violations, [])
+                self.assertEqual(evaluation.objective, result.objective)
+                self.assertEqual(evaluation.costs, result.costs)
+                self.assertEqual(evaluation.loads, result.loads)
+
+    def test_pdp_violations(self):
+        """Misplaced pairs, missing nodes and long routes are reported plan by plan."""
+        input_data = {'distance_matrix': MATRIX, 'num_vehicles': 2, 'depot': 0, 'travel distance': 9, 'pickups_deliveries': [[1, 2]]}
+        plans = [
+            [[0, 3, 1, 2, 0], [0, 0]],
+            [[0, 2, 1, 0], [0, 3, 0]],
+            [[0, 1, 0], [0, 2, 3, 0]],
+            [[0, 1, 2, 0]],
+        ]
+        evaluations = evaluate_plans('pdp', input_data, plans)
+        self.assertEqual(evaluations[0].costs, [11, 0])
+        self.assertEqual(evaluations[0].objective, 11 + 100 * 11)
+        self.assertEqual(evaluations[0].violations, [{'constraint': 'distance', 'vehicle': 0, 'value': 11, 'limit': 9}])
+        self.assertEqual(evaluations[1].violations, [{'constraint': 'pickup_delivery', 'pickup': 1, 'delivery': 2}])
+        self.assertEqual(evaluations[2].violations, [{'constraint': 'pickup_delivery', 'pickup': 1, 'delivery': 2}])
+        self.assertEqual(evaluations[3].violations, [
+            {'constraint': 'vehicles', 'value': 1, 'limit': 2},
+            {'constraint': 'visits', 'node': 3, 'value': 0, 'limit': 1},
+        ])
+        empty = evaluate_plans('pdp', input_data, [[[], []], []])
+        self.assertEqual(empty[0].violations[:2], [{'constraint': 'route', 'vehicle': 0}, {'constraint': 'route', 'vehicle': 1}])
+        self.assertEqual(empty[1].violations[0], {'constraint': 'vehicles', 'value': 0, 'limit': 2})
+
+    def test_time_violations(self):
+        """Late arrivals, short travel times and overlapping docks are reported."""
+        input_data = {
+            'time_matrix': MATRIX,
+            'time_windows': [[0, 10], [0, 3], [0, 10], [6, 8]],
+            'num_vehicles': 2,
+            'depot': 0,
+            'vehicle_load_time': 2,
+            'vehicle_unload_time': 2,
+            'depot_capacity': 1,
+        }
+        routes = [[0, 1, 3, 0], [0, 2, 0]]
+        self.assertEqual(evaluate('twdcp', input_data, routes).violations, [])
+        self.assertEqual(evaluate('twdcp', input_data, [[0, 3, 1, 0], [0, 2, 0]]).violations, [
+            {'constraint': 'time_window', 'vehicle': 0, 'node': 1, 'value': 9, 'limit': [0, 3]},
+        ])
+        self.assertEqual(evaluate('twdcp', input_data, routes, [[1, 3, 6, 10], [0, 3, 6]]).violations, [
+            {'constraint': 'docks', 'pool': 'depot', 'value': 2, 'limit': 1},
+        ])
+        self.assertEqual(evaluate('twdcp', input_data, routes, [[13, 15, 17, 21], [0, 3, 6]]).violations, [
+            {'constraint': 'schedule', 'vehicle': 0, 'node': 3, 'value': -1, 'limit': [0, 60]},
+            {'constraint': 'time_window', 'vehicle': 0, 'node': 0, 'value': 13, 'limit': [0, 10]},
+            {'constraint': 'time_window', 'vehicle': 0, 'node': 1, 'value': 15, 'limit': [0, 3]},
+            {'constraint': 'time_window', 'vehicle': 0, 'node': 3, 'value': 17, 'limit': [6, 8]},
+        ])
+
+    def test_without_ortools(self):
+        """The validator does not import OR-Tools, and its constants match the solvers."""
+        script = 'import json, sys, ort_optimization.validate; print(json.dumps(sorted(sys.modules)))'
+        modules = json.loads(subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True).stdout)
+        self.assertNotIn('ortools', modules)
+        self.assertEqual(validate.DEFAULT_HORIZON, twdcp.DEFAULT_HORIZON)
+        self.assertEqual(validate.SPAN_COST_COEFFICIENTS, {'pdp': pdp.SPAN_COST_COEFFICIENT, 'vrp': vrp.SPAN_COST_COEFFICIENT})
@@ -0,0 +1,39 @@
+#!/usr/bin/env python
+
+"""Tests for `ort_optimization.warmstart` module."""
+
+
+import contextlib
+import io
+import unittest
+from pathlib import Path
+
+from ort_optimization.search import SearchOptions
+from ort_optimization.vrp import VRP
+from ort_optimization.warmstart import repair_routes
+
+DATA_FOLDER = Path(__file__).parent.parent / 'data_input_files'
+
+
+class TestWarmStart(unittest.TestCase):
+    """Tests for the warm start from a previous plan."""
+
+    def test_repair_routes(self):
+        """Depots, duplicates and unknown stops are dropped and new stops inserted."""
+        matrix = [
+            [0, 1, 2, 9, 3],
+            [1, 0, 1, 9, 9],
+            [2, 1, 0, 9, 1],
+            [9, 9, 9, 0, 9],
+            [3, 9, 1, 9, 0],
+        ]
+        routes = [[0, 1, 2, 1, 0], [0, 3, 7, 0], [0, 0]]
+        self.assertEqual(repair_routes(routes, matrix, 0, 2), [[1, 2, 4], [3]])
+
+    def test_solve_from_previous_plan(self):
+        """A previous solution seeds the search and is not worsened."""
+        path = str(DATA_FOLDER / 'my_vrp_OLD1.json')
+        with contextlib.redirect_stdout(io.StringIO()):
+            previous = VRP.solve(path)
+            result = VRP.solve(path, SearchOptions(initial_routes=previous.routes))
+        self.assertLessEqual(result.objective, previous.objective)